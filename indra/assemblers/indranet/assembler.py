@@ -9,6 +9,9 @@ from collections import OrderedDict, defaultdict
 logger = logging.getLogger(__name__)
 NS_PRIORITY_LIST = (
     'FPLX', 'HGNC', 'UP', 'CHEBI', 'GO', 'MESH', 'HMDB', 'PUBCHEM')
+DF_COLUMNS = ['agA_name', 'agB_name', 'agA_ns', 'agA_id', 'agB_ns', 'agB_id',
+              'stmt_type', 'evidence_count', 'stmt_hash', 'belief',
+              'source_counts', 'initial_sign']
 
 
 def get_ag_ns_id(ag):
@@ -174,7 +177,7 @@ class IndraNetAssembler():
                 To facilitate weighted path finding, the sign is represented
                 as 0 for positive polarity and 1 for negative polarity.
         """
-        rows = []
+        columns = OrderedDict((key, []) for key in DF_COLUMNS)
         if exclude_stmts:
             exclude_types = tuple(
                 get_statement_by_name(st_type) for st_type in exclude_stmts)
@@ -232,25 +235,32 @@ class IndraNetAssembler():
                 continue
             else:
                 edges = [(not_none_agents[0], not_none_agents[1], None)]
+            if not edges:
+                continue
+            # The statement's data is the same for each of its edges
+            stmt_type = type(stmt).__name__
+            evidence_count = len(stmt.evidence)
+            stmt_hash = stmt.get_hash(refresh=True)
+            source_counts = _get_source_counts(stmt)
             for (agA, agB, sign) in edges:
                 agA_ns, agA_id = get_ag_ns_id(agA)
                 agB_ns, agB_id = get_ag_ns_id(agB)
-                stmt_type = type(stmt).__name__
-                row = OrderedDict([
-                    ('agA_name', agA.name),
-                    ('agB_name', agB.name),
-                    ('agA_ns', agA_ns),
-                    ('agA_id', agA_id),
-                    ('agB_ns', agB_ns),
-                    ('agB_id', agB_id),
-                    ('stmt_type', stmt_type),
-                    ('evidence_count', len(stmt.evidence)),
-                    ('stmt_hash', stmt.get_hash(refresh=True)),
-                    ('belief', stmt.belief),
-                    ('source_counts', _get_source_counts(stmt)),
-                    ('initial_sign', sign)])
-                rows.append(row)
-        df = pd.DataFrame.from_dict(rows)
+                columns['agA_name'].append(agA.name)
+                columns['agB_name'].append(agB.name)
+                columns['agA_ns'].append(agA_ns)
+                columns['agA_id'].append(agA_id)
+                columns['agB_ns'].append(agB_ns)
+                columns['agB_id'].append(agB_id)
+                columns['stmt_type'].append(stmt_type)
+                columns['evidence_count'].append(evidence_count)
+                columns['stmt_hash'].append(stmt_hash)
+                columns['belief'].append(stmt.belief)
+                columns['source_counts'].append(dict(source_counts))
+                columns['initial_sign'].append(sign)
+        if not columns['agA_name']:
+            # An empty data frame has no columns
+            return pd.DataFrame()
+        df = pd.DataFrame(columns)
         df = df.where((pd.notnull(df)), None)
         return df
 
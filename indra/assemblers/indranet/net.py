@@ -8,7 +8,7 @@ import networkx as nx
 from decimal import Decimal
 
 import indra
-from indra.belief import SimpleScorer
+from indra.belief import SimpleScorer, evidence_random_noise_prior
 from indra.statements import Evidence
 from indra.statements import Statement
 
@@ -69,56 +69,60 @@ class IndraNet(nx.MultiDiGraph):
         if not set(mandatory_columns).issubset(set(df.columns)):
             raise ValueError('Missing one or more columns of %s in data '
                              'frame' % mandatory_columns)
-        node_keys = {'agA': set(), 'agB': set()}
-        edge_keys = set()
+        node_keys = {'agA': [], 'agB': []}
+        edge_keys = []
         for key in df.columns:
             if key not in mandatory_columns:
                 if key.startswith('agA_'):
-                    node_keys['agA'].add(key)
+                    node_keys['agA'].append(key)
                 if key.startswith('agB_'):
-                    node_keys['agB'].add(key)
+                    node_keys['agB'].append(key)
                 if not key.startswith('ag'):
-                    edge_keys.add(key)
-        index = 0
-        skipped = 0
-        for index, row in df.iterrows():
-            if row['agA_name'] is None or row['agB_name'] is None:
-                skipped += 1
-                logger.warning('None found as node (index %d)' % index)
-                continue
-            # Check and get node/edge attributes
-            nodeA_attr = {}
-            nodeB_attr = {}
-            edge_attr = {}
-            if node_keys['agA']:
-                for key in node_keys['agA']:
-                    nodeA_attr[key] = row[key]
-            if node_keys['agB']:
-                for key in node_keys['agB']:
-                    nodeB_attr[key] = row[key]
-            if edge_keys:
-                for key in edge_keys:
-                    edge_attr[key] = row[key]
-
-            # Add non-existing nodes
-            if row['agA_name'] not in graph.nodes:
-                graph.add_node(row['agA_name'], ns=row['agA_ns'],
-                               id=row['agA_id'], **nodeA_attr)
-            if row['agB_name'] not in graph.nodes:
-                graph.add_node(row['agB_name'], ns=row['agB_ns'],
-                               id=row['agB_id'], **nodeB_attr)
-            # Add edges
-            ed = {'u_for_edge': row['agA_name'],
-                  'v_for_edge': row['agB_name'],
-                  'stmt_hash': row['stmt_hash'],
-                  'stmt_type': row['stmt_type'],
-                  'evidence_count': row['evidence_count'],
-                  'belief': row['belief'],
-                  'source_counts': row['source_counts'],
-                  **edge_attr}
-            graph.add_edge(**ed)
-        if skipped:
-            logger.warning('Skipped %d edges with None as node' % skipped)
+                    edge_keys.append(key)
+        # The graph is built from the columns of the values of the data
+        # frame, which contain the same values as its rows would
+        values = df.values
+        column_idx = {key: idx for idx, key in enumerate(df.columns)}
+
+        def get_columns(keys):
+            return values[:, [column_idx[key] for key in keys]]
+
+        agA_names = values[:, column_idx['agA_name']]
+        agB_names = values[:, column_idx['agB_name']]
+        skip = np.array([agA_name is None or agB_name is None
+                         for agA_name, agB_name in zip(agA_names, agB_names)],
+                        dtype=bool)
+        for index in df.index[skip]:
+            logger.warning('None found as node (index %d)' % index)
+        rows = np.flatnonzero(~skip)
+
+        # Nodes are added with the attributes of the row in which they
+        # first appear, with agA before agB in each row
+        node_names = np.column_stack((agA_names[rows],
+                                      agB_names[rows])).ravel()
+        first_idx = np.flatnonzero(~pd.Series(node_names).duplicated().values)
+        nodes = []
+        for ag, offset in (('agA', 0), ('agB', 1)):
+            attr_keys = ['ns', 'id'] + node_keys[ag]
+            ag_idx = first_idx[first_idx % 2 == offset]
+            attr_values = get_columns(
+                ['%s_ns' % ag, '%s_id' % ag] + node_keys[ag])[
+                rows[ag_idx // 2]]
+            nodes += zip(ag_idx, node_names[ag_idx],
+                         (dict(zip(attr_keys, vals)) for vals in attr_values))
+        nodes.sort(key=lambda node: node[0])
+        graph.add_nodes_from((name, attr) for _, name, attr in nodes)
+
+        # Add edges
+        edge_attr_keys = ['stmt_hash', 'stmt_type', 'evidence_count',
+                          'belief', 'source_counts'] + edge_keys
+        edge_values = get_columns(edge_attr_keys)[rows]
+        graph.add_edges_from(
+            (agA_name, agB_name, dict(zip(edge_attr_keys, vals)))
+            for agA_name, agB_name, vals in
+            zip(agA_names[rows], agB_names[rows], edge_values))
+        if skip.any():
+            logger.warning('Skipped %d edges with None as node' % skip.sum())
         return graph
 
     def to_digraph(self, flattening_method=None, weight_mapping=None):
@@ -139,17 +143,17 @@ class IndraNet(nx.MultiDiGraph):
             An IndraNet graph flattened to a DiGraph
         """
         G = nx.DiGraph()
+        # The edge data of the statements are grouped by node pair
+        edge_statements = {}
         for u, v, data in self.edges(data=True):
-            # Add nodes and their attributes
-            if u not in G.nodes:
-                G.add_node(u, **self.nodes[u])
-            if v not in G.nodes:
-                G.add_node(v, **self.nodes[v])
-            # Add edges and their attributes
-            if G.has_edge(u, v):
-                G[u][v]['statements'].append(data)
+            statements = edge_statements.get((u, v))
+            if statements is None:
+                edge_statements[(u, v)] = [data]
             else:
-                G.add_edge(u, v, statements=[data])
+                statements.append(data)
+        G.add_nodes_from(self._get_flattened_nodes(edge_statements))
+        G.add_edges_from((u, v, {'statements': statements})
+                         for (u, v), statements in edge_statements.items())
         G = self._update_edge_belief(G, flattening_method)
         if weight_mapping:
             G = weight_mapping(G)
@@ -207,12 +211,13 @@ class IndraNet(nx.MultiDiGraph):
         sign_dict = default_sign_dict if not sign_dict else sign_dict
 
         SG = nx.MultiDiGraph()
+        # The edge data of the statements are grouped by node pair and sign.
+        # The nodes of all edges are added, including those of the edges
+        # that have no sign.
+        node_pairs = {}
+        edge_statements = {}
         for u, v, data in self.edges(data=True):
-            # Add nodes and their attributes
-            if u not in SG.nodes:
-                SG.add_node(u, **self.nodes[u])
-            if v not in SG.nodes:
-                SG.add_node(v, **self.nodes[v])
+            node_pairs[(u, v)] = None
             # Explicit 'is not None' needed to accept 0
             if data.get('initial_sign') is not None:
                 sign = data['initial_sign']
@@ -220,10 +225,14 @@ class IndraNet(nx.MultiDiGraph):
                 continue
             else:
                 sign = sign_dict[data['stmt_type']]
-            if SG.has_edge(u, v, sign):
-                SG[u][v][sign]['statements'].append(data)
+            statements = edge_statements.get((u, v, sign))
+            if statements is None:
+                edge_statements[(u, v, sign)] = [data]
             else:
-                SG.add_edge(u, v, sign, statements=[data], sign=sign)
+                statements.append(data)
+        SG.add_nodes_from(self._get_flattened_nodes(node_pairs))
+        for (u, v, sign), statements in edge_statements.items():
+            SG.add_edge(u, v, sign, statements=statements, sign=sign)
         SG = self._update_edge_belief(SG, flattening_method)
         if weight_mapping:
             SG = weight_mapping(SG)
@@ -284,6 +293,12 @@ class IndraNet(nx.MultiDiGraph):
                                    flattening_method=flattening_method,
                                    weight_mapping=weight_mapping)
 
+    def _get_flattened_nodes(self, edges):
+        """Return the nodes of the given edges with their attributes, in the
+        order in which they first appear in the edges."""
+        nodes = dict.fromkeys(node for edge in edges for node in edge[:2])
+        return [(node, self.nodes[node]) for node in nodes]
+
     @staticmethod
     def _update_edge_belief(G, flattening_method):
         """G must be or be a child of an nx.Graph object. If
@@ -295,17 +310,23 @@ class IndraNet(nx.MultiDiGraph):
         edge attribute called 'statements' containing a list of dictionaries
         representing the edge data of all the edges in the un-flattened graph
         that were mapped to the corresponding flattened edge in G.
-        """
 
+        The predefined flattening methods are computed for all the edges at
+        once and give the same beliefs as `_simple_scorer_update` and
+        `_complementary_belief` would for each edge.
+        """
         if not flattening_method or flattening_method == 'simple_scorer':
-            for e in G.edges:
-                G.edges[e]['belief'] = _simple_scorer_update(G, edge=e)
+            get_beliefs = _get_simple_scorer_beliefs
         elif flattening_method == 'complementary_belief':
-            for e in G.edges:
-                G.edges[e]['belief'] = _complementary_belief(G, edge=e)
+            get_beliefs = _get_complementary_beliefs
         else:
             for e in G.edges:
                 G.edges[e]['belief'] = flattening_method(G, edge=e)
+            return G
+        edge_data = [edge[-1] for edge in G.edges(data=True)]
+        beliefs = get_beliefs([data['statements'] for data in edge_data])
+        for data, belief in zip(edge_data, beliefs):
+            data['belief'] = belief
         return G
 
 
@@ -323,16 +344,87 @@ def _simple_scorer_update(G, edge):
 
 
 def _complementary_belief(G, edge):
+    belief_list = [s['belief'] for s in G.edges[edge]['statements']]
+    return _get_complementary_belief(belief_list)
+
+
+def _get_complementary_belief(belief_list):
     # Aggregate belief score: 1-prod(1-belief_i)
     np.seterr(all='raise')
-    NP_PRECISION = 10 ** -np.finfo(np.longfloat).precision  # Numpy precision
-    belief_list = [s['belief'] for s in G.edges[edge]['statements']]
+    NP_PRECISION = 10 ** -np.finfo(np.longdouble).precision  # Numpy precision
     try:
-        ag_belief = np.longfloat(1.0) - np.prod(np.fromiter(
-            map(lambda belief: np.longfloat(1.0) - belief, belief_list),
-            dtype=np.longfloat))
+        ag_belief = np.longdouble(1.0) - np.prod(np.fromiter(
+            map(lambda belief: np.longdouble(1.0) - belief, belief_list),
+            dtype=np.longdouble))
     except FloatingPointError as err:
-        logger.warning('%s: Resetting ag_belief to 10*np.longfloat precision '
+        logger.warning('%s: Resetting ag_belief to 10*np.longdouble precision '
                        '(%.0e)' % (err, Decimal(NP_PRECISION * 10)))
         ag_belief = NP_PRECISION * 10
     return ag_belief
+
+
+def _get_simple_scorer_beliefs(statement_lists):
+    # The evidence of each flattened edge is counted by source, and the
+    # product of the random error probabilities of the evidences of each
+    # source and then the product of the source factors are taken for all
+    # the edges at once, in the same order as in SimpleScorer
+    edge_idxs = []
+    sources = []
+    counts = []
+    for edge_idx, statements in enumerate(statement_lists):
+        source_counts = {}
+        for stmt_data in statements:
+            for k, v in stmt_data['source_counts'].items():
+                if v > 0:
+                    s = db_source_mapping.get(k, k)
+                    source_counts[s] = source_counts.get(s, 0) + v
+        for s in sorted(source_counts):
+            edge_idxs.append(edge_idx)
+            sources.append(s)
+            counts.append(source_counts[s])
+    beliefs = [0] * len(statement_lists)
+    if not sources:
+        return beliefs
+    rand_probs = {}
+    syst_probs = {}
+    for s in set(sources):
+        rand_probs[s] = evidence_random_noise_prior(
+            Evidence(source_api=s), simple_scorer.prior_probs['rand'],
+            simple_scorer.subtype_probs)
+        syst_probs[s] = simple_scorer.prior_probs['syst'][s]
+    counts = np.array(counts)
+    rand_prods = np.multiply.reduceat(
+        np.repeat(np.array([rand_probs[s] for s in sources], dtype=float),
+                  counts),
+        np.cumsum(counts) - counts)
+    source_factors = \
+        np.array([syst_probs[s] for s in sources], dtype=float) + rand_prods
+    edge_idxs = np.array(edge_idxs)
+    edge_starts = np.flatnonzero(
+        np.concatenate(([True], edge_idxs[1:] != edge_idxs[:-1])))
+    edge_beliefs = 1 - np.multiply.reduceat(source_factors, edge_starts)
+    for edge_idx, belief in zip(edge_idxs[edge_starts], edge_beliefs):
+        beliefs[edge_idx] = belief
+    return beliefs
+
+
+def _get_complementary_beliefs(statement_lists):
+    # Aggregate belief score: 1-prod(1-belief_i), with the products taken for
+    # all the edges at once
+    if not statement_lists:
+        return []
+    belief_list = [s['belief'] for statements in statement_lists
+                   for s in statements]
+    lengths = np.array([len(statements) for statements in statement_lists],
+                       dtype=np.int64)
+    try:
+        with np.errstate(all='raise'):
+            neg_beliefs = np.longdouble(1.0) - \
+                np.array(belief_list, dtype=np.longdouble)
+            ag_beliefs = np.longdouble(1.0) - np.multiply.reduceat(
+                neg_beliefs, np.cumsum(lengths) - lengths)
+    except FloatingPointError:
+        # The beliefs of the edges are reset one by one as needed
+        return [_get_complementary_belief([s['belief'] for s in statements])
+                for statements in statement_lists]
+    return list(ag_beliefs)
@@ -99,7 +99,7 @@ class PysbPreassembler(object):
             # statements as needed
             agent_combs = itertools.product(*agent_forms)
             for agent_comb in agent_combs:
-                new_stmt = fast_deepcopy(stmt)
+                new_stmt = stmt.copy()
                 new_stmt.set_agent_list(agent_comb)
                 new_stmts.append(new_stmt)
         self.statements = new_stmts
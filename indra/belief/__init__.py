@@ -8,6 +8,7 @@ import logging
 import networkx
 from os import path, pardir
 from collections import namedtuple
+from indra.statements import matches_key_cache
 
 
 logger = logging.getLogger(__name__)
@@ -56,6 +57,32 @@ class BeliefScorer(object):
         raise NotImplementedError('Need to subclass BeliefScorer and '
                                   'implement methods.')
 
+    def score_statements(self, statements, extra_evidence=None):
+        """Computes the prior belief probabilities for a list of Statements.
+
+        By default, this calls `score_statement` for each Statement, but
+        subclasses can override it to score Statements in batch.
+
+        Parameters
+        ----------
+        statements : list[indra.statements.Statement]
+            A list of INDRA Statements whose belief scores are to
+            be calculated.
+        extra_evidence : Optional[list[list[indra.statements.Evidence]]]
+            A list, parallel to the list of Statements, of lists of Evidences
+            that are supporting each Statement (that aren't already included
+            in the Statement's own evidence list).
+
+        Returns
+        -------
+        list[float]
+            The computed prior probabilities for the statements.
+        """
+        if extra_evidence is None:
+            extra_evidence = [None] * len(statements)
+        return [self.score_statement(st, extra_ev) for st, extra_ev
+                in zip(statements, extra_evidence)]
+
     def check_prior_probs(self, statements):
         """Make sure the scorer has all the information needed to compute
         belief scores of each statement in the provided list, and raises an
@@ -181,6 +208,98 @@ class SimpleScorer(BeliefScorer):
         all_evidence = st.evidence + extra_evidence
         return self.score_evidence_list(all_evidence)
 
+    def score_statements(self, statements, extra_evidence=None):
+        """Computes the prior belief probabilities for a list of Statements.
+
+        The evidences of all the Statements are first encoded into arrays
+        of Statement indices, random error probabilities, source indices and
+        negation flags, and the beliefs of all the Statements are then
+        computed at once with grouped products in numpy. The results are
+        the same as those of `score_statement`, which is used instead if a
+        subclass overrides the scoring of individual Statements.
+
+        Parameters
+        ----------
+        statements : list[indra.statements.Statement]
+            A list of INDRA Statements whose belief scores are to
+            be calculated.
+        extra_evidence : Optional[list[list[indra.statements.Evidence]]]
+            A list, parallel to the list of Statements, of lists of Evidences
+            that are supporting each Statement (that aren't already included
+            in the Statement's own evidence list).
+
+        Returns
+        -------
+        list[float]
+            The computed prior probabilities for the statements.
+        """
+        if type(self).score_statement is not SimpleScorer.score_statement \
+                or type(self).score_evidence_list is not \
+                SimpleScorer.score_evidence_list:
+            return super(SimpleScorer, self).score_statements(statements,
+                                                              extra_evidence)
+        num_stmts = len(statements)
+        if not num_stmts:
+            return []
+        # Encode all the evidences as arrays. We cache the random error
+        # probabilities by source and subtype.
+        rand_probs_by_type = {}
+        source_names = []
+        stmt_idxs = []
+        rand_probs = []
+        negs = []
+        for stmt_idx, stmt in enumerate(statements):
+            evidences = stmt.evidence
+            if extra_evidence is not None and extra_evidence[stmt_idx]:
+                evidences = evidences + extra_evidence[stmt_idx]
+            for ev in evidences:
+                ev_type = tag_evidence_subtype(ev)
+                rand_prob = rand_probs_by_type.get(ev_type)
+                if rand_prob is None:
+                    rand_prob = evidence_random_noise_prior(
+                        ev, self.prior_probs['rand'], self.subtype_probs)
+                    rand_probs_by_type[ev_type] = rand_prob
+                stmt_idxs.append(stmt_idx)
+                source_names.append(ev_type[0])
+                rand_probs.append(rand_prob)
+                negs.append(1 if ev.epistemics.get('negated') else 0)
+        if not stmt_idxs:
+            return [0] * num_stmts
+        # Sources are indexed in sorted order so that the source-specific
+        # factors are multiplied in the same order as in score_evidence_list
+        uniq_sources, source_idxs = numpy.unique(source_names,
+                                                 return_inverse=True)
+        syst_probs = numpy.array([self.prior_probs['syst'][s]
+                                  for s in uniq_sources])
+        # Evidences are grouped by statement, negation and source with a
+        # stable sort to keep their order within each group
+        part_keys = numpy.array(stmt_idxs, dtype=numpy.int64) * 2 + \
+            numpy.array(negs, dtype=numpy.int64)
+        group_keys = part_keys * len(uniq_sources) + source_idxs
+        order = numpy.argsort(group_keys, kind='stable')
+        group_keys = group_keys[order]
+        group_starts = numpy.flatnonzero(
+            numpy.concatenate(([True], group_keys[1:] != group_keys[:-1])))
+        # The random error probabilities are multiplied within each source
+        # group and combined with the source's systematic error probability
+        rand_prods = numpy.multiply.reduceat(
+            numpy.array(rand_probs, dtype=float)[order], group_starts)
+        group_keys = group_keys[group_starts]
+        source_factors = syst_probs[group_keys % len(uniq_sources)] + \
+            rand_prods
+        # The source factors are then multiplied for the positive and the
+        # negative evidences of each statement
+        part_keys = group_keys // len(uniq_sources)
+        part_starts = numpy.flatnonzero(
+            numpy.concatenate(([True], part_keys[1:] != part_keys[:-1])))
+        priors = numpy.zeros(2 * num_stmts)
+        priors[part_keys[part_starts]] = \
+            1 - numpy.multiply.reduceat(source_factors, part_starts)
+        # See score_evidence_list for the combination of positive and negative
+        # evidence
+        scores = priors[0::2] * (1 - priors[1::2])
+        return scores.tolist()
+
     def check_prior_probs(self, statements):
         """Throw Exception if BeliefEngine parameter is missing.
 
@@ -301,8 +420,13 @@ class BeliefEngine(object):
         `check_prior_probs` method which takes a list of INDRA Statements and
         verifies that the scorer has all the information it needs to score
         every statement in the list, and raises an exception if not.
+    incremental : bool
+        If True, the hierarchy graph and the evidences supporting each
+        Statement are kept after `set_hierarchy_probs` is called so that the
+        beliefs of changed Statements can later be updated with
+        `update_hierarchy_probs` without recomputing all beliefs.
     """
-    def __init__(self, scorer=None, matches_fun=None):
+    def __init__(self, scorer=None, matches_fun=None, incremental=False):
         if scorer is None:
             scorer = default_scorer
         assert(isinstance(scorer, BeliefScorer))
@@ -310,6 +434,8 @@ class BeliefEngine(object):
 
         self.matches_fun = matches_fun if matches_fun else \
             lambda stmt: stmt.matches_key()
+        self.incremental = incremental
+        self._hierarchy = None
 
     def set_prior_probs(self, statements):
         """Sets the prior belief probabilities for a list of INDRA Statements.
@@ -328,9 +454,11 @@ class BeliefEngine(object):
             by this function.
         """
         self.scorer.check_prior_probs(statements)
-        for st in statements:
-            st.belief = self.scorer.score_statement(st)
+        beliefs = self.scorer.score_statements(statements)
+        for st, belief in zip(statements, beliefs):
+            st.belief = belief
 
+    @matches_key_cache()
     def set_hierarchy_probs(self, statements):
         """Sets hierarchical belief probabilities for INDRA Statements.
 
@@ -384,21 +512,110 @@ class BeliefEngine(object):
         assert_no_cycle(g)
         ranked_stmts = get_ranked_stmts(g)
         logger.debug('Start belief propagation over ranked statements')
+        # Statements that are supported are assigned integer IDs by matches
+        # key, and we collect the non-negated evidences of each ID
+        support_ids = {}
+        support_evidences = []
+        # The closures of supported statement IDs, by matches key
+        closures = {}
+
+        def get_support_closure(stmt):
+            """Return the IDs of all statements supported by a statement."""
+            stmt_key = self.matches_fun(stmt)
+            closure = closures.get(stmt_key)
+            if closure is not None:
+                return closure
+            closure = set()
+            for st in stmt.supports:
+                st_key = self.matches_fun(st)
+                st_id = support_ids.get(st_key)
+                if st_id is None:
+                    st_id = len(support_evidences)
+                    support_ids[st_key] = st_id
+                    support_evidences.append(
+                        [ev for ev in st.evidence
+                         if not ev.epistemics.get('negated')])
+                closure.add(st_id)
+                closure |= get_support_closure(st)
+            closure = frozenset(closure)
+            closures[stmt_key] = closure
+            return closure
+
+        # Since the statements are ranked such that each statement comes
+        # after the ones it supports, each closure is built from the
+        # memoized closures of the supported statements
+        extra_evidence = []
         for st in ranked_stmts:
-            bps = _get_belief_package(st, self.matches_fun)
-            supporting_evidences = []
-            # NOTE: the last belief package in the list is this statement's own
-            for bp in bps[:-1]:
-                # Iterate over all the parent evidences and add only
-                # non-negated ones
-                for ev in bp.evidences:
-                    if not ev.epistemics.get('negated'):
-                        supporting_evidences.append(ev)
-            # Now add the Statement's own evidence
-            # Now score all the evidences
-            belief = self.scorer.score_statement(st, supporting_evidences)
+            extra_evidence.append(
+                _get_supporting_evidences(get_support_closure(st),
+                                          support_evidences))
+        beliefs = self.scorer.score_statements(ranked_stmts, extra_evidence)
+        for st, belief in zip(ranked_stmts, beliefs):
             st.belief = belief
         logger.debug('Finished belief propagation over ranked statements')
+        if self.incremental:
+            keys_by_hash = {st.get_hash(matches_fun=self.matches_fun):
+                            self.matches_fun(st) for st in ranked_stmts}
+            self._hierarchy = _BeliefHierarchy(g, keys_by_hash, support_ids,
+                                               support_evidences, closures)
+
+    def update_hierarchy_probs(self, stmt_hashes):
+        """Update the hierarchical beliefs of Statements that have changed.
+
+        This requires an incremental BeliefEngine on which
+        `set_hierarchy_probs` was called before. Given the hashes of
+        Statements whose evidences have changed since then (e.g., due to
+        new evidence or curations), only the beliefs of these Statements and
+        the Statements that support them (directly or indirectly) in the
+        hierarchy are recomputed. The hierarchy itself is assumed not to
+        have changed.
+
+        Parameters
+        ----------
+        stmt_hashes : iterable[int]
+            The hashes of the Statements that have changed.
+
+        Returns
+        -------
+        list[indra.statements.Statement]
+            The Statements whose belief attribute was updated.
+        """
+        if self._hierarchy is None:
+            raise ValueError('update_hierarchy_probs requires an incremental '
+                             'BeliefEngine on which set_hierarchy_probs was '
+                             'called first.')
+        hierarchy = self._hierarchy
+        graph = hierarchy.graph
+        affected_keys = {}
+        for stmt_hash in stmt_hashes:
+            key = hierarchy.keys_by_hash.get(stmt_hash)
+            if key is None:
+                logger.warning('No statement with hash %s in the belief '
+                               'hierarchy' % stmt_hash)
+                continue
+            # The evidences of the statement are updated in case it
+            # supports other statements
+            st_id = hierarchy.support_ids.get(key)
+            if st_id is not None:
+                hierarchy.support_evidences[st_id] = \
+                    [ev for ev in graph.nodes[key]['stmt'].evidence
+                     if not ev.epistemics.get('negated')]
+            affected_keys[key] = True
+            # The statements supporting this one in the hierarchy are
+            # the ones whose beliefs depend on its evidence
+            for supporting_key in networkx.ancestors(graph, key):
+                affected_keys[supporting_key] = True
+        stmts = [graph.nodes[key]['stmt'] for key in affected_keys]
+        self.scorer.check_prior_probs(stmts)
+        extra_evidence = [
+            _get_supporting_evidences(hierarchy.closures[key],
+                                      hierarchy.support_evidences)
+            for key in affected_keys]
+        beliefs = self.scorer.score_statements(stmts, extra_evidence)
+        for st, belief in zip(stmts, beliefs):
+            st.belief = belief
+        logger.debug('Updated the beliefs of %d statements' % len(stmts))
+        return stmts
 
     def set_linked_probs(self, linked_statements):
         """Sets the belief probabilities for a list of linked INDRA Statements.
@@ -419,26 +636,16 @@ class BeliefEngine(object):
             st.inferred_stmt.belief = numpy.prod(source_probs)
 
 
-BeliefPackage = namedtuple('BeliefPackage', 'statement_key evidences')
-
-
-def _get_belief_package(stmt, matches_fun):
-    """Return the belief packages of a given statement recursively."""
-    # This list will contain the belief packages for the given statement
-    belief_packages = []
-    # Iterate over all the support parents
-    for st in stmt.supports:
-        # Recursively get all the belief packages of the parent
-        parent_packages = _get_belief_package(st, matches_fun)
-        package_stmt_keys = [pkg.statement_key for pkg in belief_packages]
-        for package in parent_packages:
-            # Only add this belief package if it hasn't already been added
-            if package.statement_key not in package_stmt_keys:
-                belief_packages.append(package)
-    # Now make the Statement's own belief package and append it to the list
-    belief_package = BeliefPackage(matches_fun(stmt), stmt.evidence)
-    belief_packages.append(belief_package)
-    return belief_packages
+# The state kept by an incremental BeliefEngine between calls
+_BeliefHierarchy = namedtuple('_BeliefHierarchy',
+                              'graph keys_by_hash support_ids '
+                              'support_evidences closures')
+
+
+def _get_supporting_evidences(support_closure, support_evidences):
+    """Return the evidences of the statements in a support closure."""
+    return [ev for st_id in sorted(support_closure)
+            for ev in support_evidences[st_id]]
 
 
 def sample_statements(stmts, seed=None):
@@ -1,11 +1,19 @@
+import os
+import json
+import pickle
+import hashlib
 import logging
+import tempfile
 import textwrap
+import itertools
+import multiprocessing as mp
 from copy import deepcopy
 
 import numpy as np
 import networkx as nx
 
-from indra.explanation.pathfinding import get_path_iter, find_sources
+from indra.explanation.pathfinding import get_path_iter, find_sources, \
+    find_all_sources, get_sources_from_index
 
 try:
     import paths_graph as pg
@@ -145,14 +153,26 @@ class ModelChecker(object):
     nodes_to_agents : dict
         A dictionary mapping nodes of intermediate signed edges graph to INDRA
         agents.
+    cache_dir : Optional[str]
+        A directory in which the graph prepared from the model (and other
+        data needed to check the model, e.g., the nodes_to_agents mapping)
+        is cached. The cache is keyed by a fingerprint of the model and the
+        options used to prepare the graph, so a ModelChecker of the same
+        model loads the graph from the cache instead of preparing it again.
+        By default, no cache is used.
 
     Attributes
     ----------
     graph : nx.Digraph
         A DiGraph with signed nodes to find paths in.
     """
+    # The version is part of the path of the cached graphs. It should be
+    # incremented when the way graphs are prepared from models changes, so
+    # that graphs cached by previous versions are not used.
+    cache_version = '1'
+
     def __init__(self, model, statements=None, do_sampling=False, seed=None,
-                 nodes_to_agents=None):
+                 nodes_to_agents=None, cache_dir=None):
         self.model = model
         if statements:
             self.statements = statements
@@ -161,8 +181,11 @@ class ModelChecker(object):
         if seed is not None:
             np.random.seed(seed)
         self.nodes_to_agents = nodes_to_agents if nodes_to_agents else {}
+        # Graphs prepared with a given mapping are cached separately
+        self._nodes_to_agents_given = bool(nodes_to_agents)
         # Whether to do sampling
         self.do_sampling = do_sampling
+        self.cache_dir = cache_dir
         self.graph = None
 
     def add_statements(self, stmts):
@@ -176,9 +199,15 @@ class ModelChecker(object):
         self.statements += stmts
 
     def check_model(self, max_paths=1, max_path_length=5,
-                    agent_filter_func=None):
+                    agent_filter_func=None, n_jobs=None):
         """Check all the statements added to the ModelChecker.
 
+        Statements are grouped by their target in the model and the
+        Statements of each group are checked together: the search upstream
+        of the target, which finds the sources with paths to the target, is
+        done once and shared by all Statements of the group. The results are
+        the same as those of checking each Statement with check_statement.
+
         Parameters
         ----------
         max_paths : Optional[int]
@@ -190,6 +219,11 @@ class ModelChecker(object):
             A function to constrain the intermediate nodes in the path. A
             function should take an agent as a parameter and return True if the
             agent is allowed to be in a path and False otherwise.
+        n_jobs : Optional[int]
+            If given, the groups of Statements with the same target are
+            checked in a pool of this many processes. This requires processes
+            to be started by forking, otherwise, the Statements are checked
+            in the current process. Default: None
 
         Returns
         -------
@@ -197,17 +231,44 @@ class ModelChecker(object):
             Each tuple contains the Statement checked against the model and
             a PathResult object describing the results of model checking.
         """
-        results = []
         # Convert agent filter function to node filter function once here
         node_filter_func = self.update_filter_func(agent_filter_func)
+        results = [None] * len(self.statements)
+        targets = {}
         for idx, stmt in enumerate(self.statements):
             logger.info('---')
-            logger.info('Checking statement (%d/%d): %s' %
+            logger.info('Processing statement (%d/%d): %s' %
                         (idx + 1, len(self.statements), stmt))
-            result = self.check_statement(stmt, max_paths, max_path_length,
-                                          node_filter_func=node_filter_func)
-            results.append((stmt, result))
-        return results
+            input_set, obj_list, result_code = \
+                self.get_all_subjects_objects(stmt)
+            if result_code:
+                results[idx] = self.make_false_result(result_code, max_paths,
+                                                      max_path_length)
+                continue
+            loop, target_key = self._get_target_key(input_set, obj_list)
+            targets.setdefault(target_key, []).append(
+                (idx, stmt, input_set, loop))
+        logger.info('Checking %d statements with %d distinct targets' %
+                    (len(self.statements), len(targets)))
+        target_queries = list(targets.items())
+        if n_jobs is not None and n_jobs > 1 and len(target_queries) > 1 \
+                and 'fork' not in mp.get_all_start_methods():
+            logger.info('Checking statements in parallel requires forking '
+                        'processes, checking them in a single process.')
+            n_jobs = None
+        if n_jobs is not None and n_jobs > 1 and len(target_queries) > 1:
+            target_results = self._check_targets_parallel(
+                target_queries, max_paths, max_path_length, node_filter_func,
+                n_jobs)
+        else:
+            target_results = (
+                self._check_target(target_key, queries, max_paths,
+                                   max_path_length, node_filter_func)
+                for target_key, queries in target_queries)
+        for idx_results in target_results:
+            for idx, result in idx_results:
+                results[idx] = result
+        return list(zip(self.statements, results))
 
     def check_statement(self, stmt, max_paths=1, max_path_length=5,
                         agent_filter_func=None, node_filter_func=None):
@@ -240,38 +301,55 @@ class ModelChecker(object):
         if result_code:
             return self.make_false_result(result_code, max_paths,
                                           max_path_length)
+        loop, target_key = self._get_target_key(input_set, obj_list)
+
+        # Convert agent filter function to node filter function
+        if agent_filter_func and not node_filter_func:
+            node_filter_func = self.update_filter_func(agent_filter_func)
+        target, dummy_target = self._add_target(target_key)
+        result = self.find_paths(input_set, target, max_paths,
+                                 max_path_length, loop,
+                                 dummy_target=dummy_target,
+                                 filter_func=node_filter_func)
+        if dummy_target:
+            self.graph.remove_node(target)
+        return self._get_statement_result(stmt, result, max_paths,
+                                          max_path_length)
+
+    def _get_target_key(self, input_set, obj_list):
+        """Return whether a loop is checked and a key for the path target."""
         # If source and target are the same, we need to handle a loop
         loop = False
         if (input_set and (len(input_set) == len(obj_list) == 1) and
                 (list(input_set)[0] == list(obj_list)[0])):
             loop = True
-
-        # Convert agent filter function to node filter function
-        if agent_filter_func and not node_filter_func:
-            node_filter_func = self.update_filter_func(agent_filter_func)
+        if loop:
+            return loop, ('loop', list(obj_list)[0])
+        elif len(obj_list) > 1:
+            return loop, ('common', tuple(obj_list))
+        return loop, ('single', list(obj_list)[0])
+
+    def _add_target(self, target_key):
+        """Return the target node for a target key, adding it if needed."""
+        kind, obj = target_key
+        if kind == 'single':
+            return obj, False
         # If we have several objects in obj_list or we have a loop, we add a
         # dummy target node as a child to all nodes in obj_list
-        if len(obj_list) > 1 or loop:
-            common_target = ('common_target', 0)
-            self.graph.add_node(common_target)
-            # This is the case when source and target are the same. NetworkX
-            # does not allow loops in the paths, so we work around it by using
-            # target predecessors as new targets
-            if loop:
-                for obj in self.graph.predecessors(list(obj_list)[0]):
-                    self.graph.add_edge(obj, common_target)
-            else:
-                for obj in obj_list:
-                    self.graph.add_edge(obj, common_target)
-            result = self.find_paths(input_set, common_target, max_paths,
-                                     max_path_length, loop, dummy_target=True,
-                                     filter_func=node_filter_func)
-
-            self.graph.remove_node(common_target)
+        common_target = ('common_target', 0)
+        self.graph.add_node(common_target)
+        # This is the case when source and target are the same. NetworkX
+        # does not allow loops in the paths, so we work around it by using
+        # target predecessors as new targets
+        if kind == 'loop':
+            for pred in self.graph.predecessors(obj):
+                self.graph.add_edge(pred, common_target)
         else:
-            result = self.find_paths(input_set, list(obj_list)[0], max_paths,
-                                     max_path_length, loop, dummy_target=False,
-                                     filter_func=node_filter_func)
+            for o in obj:
+                self.graph.add_edge(o, common_target)
+        return common_target, True
+
+    def _get_statement_result(self, stmt, result, max_paths, max_path_length):
         if result.path_found:
             logger.info('Found paths for %s' % stmt)
             return result
@@ -281,6 +359,57 @@ class ModelChecker(object):
         return self.make_false_result('NO_PATHS_FOUND',
                                       max_paths, max_path_length)
 
+    def _check_target(self, target_key, queries, max_paths, max_path_length,
+                      node_filter_func):
+        """Check the Statements with a given target.
+
+        Returns a list of (idx, PathResult) tuples for the (idx, stmt,
+        input_set, loop) tuples given as queries.
+        """
+        target, dummy_target = self._add_target(target_key)
+        source_index = None
+        idx_results = []
+        for idx, stmt, input_set, loop in queries:
+            logger.info('Checking statement (%d/%d): %s' %
+                        (idx + 1, len(self.statements), stmt))
+            # The sources of a statement are not filtered, so if the
+            # filter function would exclude any of them, the search is not
+            # the same as for other statements and has to be redone
+            if node_filter_func and input_set is not None and \
+                    not all(node_filter_func(node) for node in input_set):
+                source_lengths = find_sources(self.graph, target, input_set,
+                                              node_filter_func)
+            else:
+                if source_index is None:
+                    source_index = find_all_sources(self.graph, target,
+                                                    node_filter_func)
+                source_lengths = get_sources_from_index(source_index,
+                                                        input_set)
+            result = self._find_paths(source_lengths, target, max_paths,
+                                      max_path_length, loop, dummy_target,
+                                      node_filter_func)
+            idx_results.append((idx, self._get_statement_result(
+                stmt, result, max_paths, max_path_length)))
+        if dummy_target:
+            self.graph.remove_node(target)
+        return idx_results
+
+    def _check_targets_parallel(self, target_queries, max_paths,
+                                max_path_length, node_filter_func, n_jobs):
+        global _check_state
+        # Worker processes inherit the model checker and the queries by
+        # forking, only the results are pickled. We start with the largest
+        # groups of Statements to balance the load.
+        _check_state = (self, target_queries, max_paths, max_path_length,
+                        node_filter_func)
+        order = sorted(range(len(target_queries)),
+                       key=lambda i: len(target_queries[i][1]), reverse=True)
+        try:
+            with mp.get_context('fork').Pool(n_jobs) as pool:
+                return list(pool.imap_unordered(_check_target_worker, order))
+        finally:
+            _check_state = None
+
     def get_all_subjects_objects(self, stmt):
         # Make sure graph is created
         self.get_graph()
@@ -359,11 +488,19 @@ class ModelChecker(object):
 
         # -- Do Breadth-First Enumeration --
         # Generate the predecessors to our observable and count the paths
+        source_lengths = find_sources(self.graph, target, input_set,
+                                      filter_func)
+        return self._find_paths(source_lengths, target, max_paths,
+                                max_path_length, loop, dummy_target,
+                                filter_func)
+
+    def _find_paths(self, source_lengths, target, max_paths, max_path_length,
+                    loop, dummy_target, filter_func):
+        """Find paths to a target from sources found upstream of it."""
         path_lengths = []
         path_metrics = []
         sources = []
-        for source, path_length in find_sources(self.graph, target, input_set,
-                                                filter_func):
+        for source, path_length in source_lengths:
             # If a dummy target is used, we need to subtract one edge.
             # In case of loops, we are already missing one edge, there's no
             # need to subtract one more.
@@ -378,8 +515,8 @@ class ModelChecker(object):
                 path_metrics.append(pm)
                 path_lengths.append(path_length)
                 # Keep unique sources but use a list, not set to preserve order
-                if source not in sources:
-                    sources.append(source)
+                sources.append(source)
+        sources = list(dict.fromkeys(sources))
         # Now, look for paths
         if path_metrics and max_paths == 0:
             pr = PathResult(True, 'MAX_PATHS_ZERO',
@@ -469,6 +606,78 @@ class ModelChecker(object):
         """Return a graph  with signed nodes to find the path."""
         raise NotImplementedError("Method must be implemented in child class.")
 
+    def get_fingerprint(self, **kwargs):
+        """Return a fingerprint of the model and the options of get_graph.
+
+        The fingerprint is used as the key of the graph in the cache.
+        """
+        raise NotImplementedError("Method must be implemented in child class.")
+
+    def get_cache_path(self, fingerprint):
+        """Return the path of the cached graph with a given fingerprint."""
+        return os.path.join(self.cache_dir, self.cache_version,
+                            '%s.pkl' % fingerprint)
+
+    def load_cached_graph(self, fingerprint):
+        """Load the graph with a given fingerprint from the cache.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the model and the options of get_graph.
+
+        Returns
+        -------
+        bool
+            True if the graph was loaded, False if it was not in the cache.
+        """
+        cache_path = self.get_cache_path(fingerprint)
+        if not os.path.exists(cache_path):
+            return False
+        logger.info('Loading graph from cache at %s' % cache_path)
+        try:
+            with open(cache_path, 'rb') as fh:
+                cached_data = pickle.load(fh)
+        except Exception:
+            logger.warning('Failed to load graph from cache at %s.'
+                           % cache_path)
+            return False
+        self._set_cached_data(cached_data)
+        return True
+
+    def save_cached_graph(self, fingerprint):
+        """Save the graph with a given fingerprint into the cache.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the model and the options of get_graph.
+        """
+        cache_path = self.get_cache_path(fingerprint)
+        logger.info('Caching graph at %s' % cache_path)
+        # The graph is written into a temporary file that is then renamed so
+        # that processes loading the graph at the same time never read a
+        # partially written file
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(cache_path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(self._get_cached_data(), fh,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            logger.warning('Failed to cache graph at %s.' % cache_path)
+
+    def _get_cached_data(self):
+        return {'graph': self.graph, 'nodes_to_agents': self.nodes_to_agents}
+
+    def _set_cached_data(self, cached_data):
+        self.graph = cached_data['graph']
+        # A mapping given to the ModelChecker takes precedence
+        if not self.nodes_to_agents:
+            self.nodes_to_agents = cached_data['nodes_to_agents']
+
     def process_statement(self, stmt):
         """
         This method processes the test statement to get the data about subject
@@ -551,13 +760,18 @@ def signed_edges_to_signed_nodes(graph, prune_nodes=True,
     signed_nodes_graph.add_nodes_from(nodes)
     edges = []
     for u, v, edge_data in graph.edges(data=True):
-        copy_dict = deepcopy(edge_data)
-        edge_sign = copy_dict.pop('sign', None)
+        edge_sign = edge_data.get('sign')
         if edge_sign is None:
             continue
-        edge_dict = copy_dict if copy_edge_data == True else \
-            ({k: v for k, v in copy_dict.items() if k in copy_edge_data} if
-             isinstance(copy_edge_data, set) else {})
+        # Only the edge data that is kept is copied
+        if copy_edge_data == True:
+            edge_dict = {k: deepcopy(val) for k, val in edge_data.items()
+                         if k != 'sign'}
+        elif isinstance(copy_edge_data, set):
+            edge_dict = {k: deepcopy(val) for k, val in edge_data.items()
+                         if k in copy_edge_data and k != 'sign'}
+        else:
+            edge_dict = {}
         if edge_sign == edge_signs['pos']:
             edges.append(((u, 0), (v, 0), edge_dict))
             edges.append(((u, 1), (v, 1), edge_dict))
@@ -571,14 +785,83 @@ def signed_edges_to_signed_nodes(graph, prune_nodes=True,
 
 
 def prune_signed_nodes(graph):
-    """Prune nodes with sign (1) if they do not have predecessors."""
-    nodes_to_prune = [node for node, in_deg
-                      in graph.in_degree()
+    """Prune nodes with sign (1) if they do not have predecessors.
+
+    Pruning is repeated on nodes that lose all their predecessors until no
+    more nodes can be pruned.
+    """
+    in_degrees = dict(graph.in_degree())
+    nodes_to_prune = [node for node, in_deg in in_degrees.items()
                       if in_deg == 0 and node[1] == 1]
+    pruned = set(nodes_to_prune)
     while nodes_to_prune:
-        graph.remove_nodes_from(nodes_to_prune)
-        # Make a list of nodes whose in degree is now 0
-        nodes_to_prune = [node for node, in_deg
-                          in graph.in_degree()
-                          if in_deg == 0 and node[1] == 1]
-    return graph
\ No newline at end of file
+        node = nodes_to_prune.pop()
+        for _, succ in graph.out_edges(node):
+            in_degrees[succ] -= 1
+            # Make a list of nodes whose in degree is now 0
+            if in_degrees[succ] == 0 and succ[1] == 1 and \
+                    succ not in pruned:
+                pruned.add(succ)
+                nodes_to_prune.append(succ)
+    graph.remove_nodes_from(pruned)
+    return graph
+
+
+def get_graph_fingerprint(graph, edge_keys=None, options=None):
+    """Return a fingerprint of the nodes and edges of a graph.
+
+    Parameters
+    ----------
+    graph : networkx.DiGraph or networkx.MultiDiGraph
+        The graph to return the fingerprint of.
+    edge_keys : Optional[list[str]]
+        The keys of the edge data that are part of the fingerprint. By
+        default, all edge data is part of the fingerprint.
+    options : Optional[dict]
+        Other data that is part of the fingerprint, e.g., the options used
+        to prepare a graph from the model.
+
+    Returns
+    -------
+    str
+        A SHA-256 hex digest of the nodes and their data, and the edges and
+        their data, in the order of the graph.
+    """
+    if edge_keys is None:
+        edges = graph.edges(data=True)
+    else:
+        edges = ((u, v, [data.get(key) for key in edge_keys])
+                 for u, v, data in graph.edges(data=True))
+    return _get_fingerprint(itertools.chain([options],
+                                            graph.nodes(data=True), edges))
+
+
+def _get_fingerprint(items):
+    fingerprint = hashlib.sha256()
+    for item in items:
+        try:
+            item_str = json.dumps(item, sort_keys=True, default=_json_default)
+        except TypeError:
+            # E.g., dicts with keys of different types can't be sorted
+            item_str = repr(item)
+        fingerprint.update(item_str.encode('utf-8'))
+        fingerprint.update(b'\n')
+    return fingerprint.hexdigest()
+
+
+def _json_default(obj):
+    # The order of sets can differ between processes, so they are sorted
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    return str(obj)
+
+
+_check_state = None
+
+
+def _check_target_worker(target_idx):
+    model_checker, target_queries, max_paths, max_path_length, \
+        node_filter_func = _check_state
+    target_key, queries = target_queries[target_idx]
+    return model_checker._check_target(target_key, queries, max_paths,
+                                       max_path_length, node_filter_func)
@@ -3,7 +3,8 @@ from copy import deepcopy
 from . import ModelChecker
 from indra.statements import *
 from indra.ontology.bio import bio_ontology
-from .model_checker import signed_edges_to_signed_nodes
+from .model_checker import signed_edges_to_signed_nodes, \
+    get_graph_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,9 @@ class PybelModelChecker(ModelChecker):
     nodes_to_agents : dict
         A dictionary mapping nodes of intermediate signed edges graph to INDRA
         agents.
+    cache_dir : Optional[str]
+        A directory in which the graph prepared from the model is cached.
+        By default, no cache is used.
 
     Attributes
     ----------
@@ -32,8 +36,9 @@ class PybelModelChecker(ModelChecker):
         A DiGraph with signed nodes to find paths in.
     """
     def __init__(self, model, statements=None, do_sampling=False, seed=None,
-                 nodes_to_agents=None):
-        super().__init__(model, statements, do_sampling, seed, nodes_to_agents)
+                 nodes_to_agents=None, cache_dir=None):
+        super().__init__(model, statements, do_sampling, seed, nodes_to_agents,
+                         cache_dir)
 
     def get_graph(self, include_variants=False, symmetric_variant_links=False,
                   include_components=True, symmetric_component_links=True):
@@ -43,6 +48,14 @@ class PybelModelChecker(ModelChecker):
         from indra.assemblers.pybel.assembler import belgraph_to_signed_graph
         if self.graph:
             return self.graph
+        fingerprint = self.get_fingerprint(
+            include_variants=include_variants,
+            symmetric_variant_links=symmetric_variant_links,
+            include_components=include_components,
+            symmetric_component_links=symmetric_component_links) \
+            if self.cache_dir else None
+        if fingerprint and self.load_cached_graph(fingerprint):
+            return self.graph
         signed_edges = belgraph_to_signed_graph(
             self.model,
             include_variants=include_variants,
@@ -53,8 +66,16 @@ class PybelModelChecker(ModelChecker):
         self.graph = signed_edges_to_signed_nodes(
             signed_edges, copy_edge_data={'belief'})
         self.get_nodes_to_agents()
+        if fingerprint:
+            self.save_cached_graph(fingerprint)
         return self.graph
 
+    def get_fingerprint(self, **kwargs):
+        """Return a fingerprint of the model and the options of get_graph."""
+        options = dict(kwargs, model_checker=self.__class__.__name__,
+                       nodes_to_agents=self._nodes_to_agents_given)
+        return get_graph_fingerprint(self.model, options=options)
+
     def process_statement(self, stmt):
         # Check if this is one of the statement types that we can check
         if not isinstance(stmt, (Modification, RegulateAmount,
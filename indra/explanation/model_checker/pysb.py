@@ -17,7 +17,7 @@ from indra.assemblers.pysb.kappa_util import im_json_to_graph
 from indra.statements.agent import default_ns_order
 
 from . import ModelChecker, PathResult
-from .model_checker import signed_edges_to_signed_nodes
+from .model_checker import signed_edges_to_signed_nodes, _get_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +51,10 @@ class PysbModelChecker(ModelChecker):
     nodes_to_agents : dict
         A dictionary mapping nodes of intermediate signed edges graph to INDRA
         agents.
+    cache_dir : Optional[str]
+        A directory in which the graph prepared from the model is cached,
+        together with the pruned influence map it is prepared from. By
+        default, no cache is used.
 
     Attributes
     ----------
@@ -60,8 +64,9 @@ class PysbModelChecker(ModelChecker):
 
     def __init__(self, model, statements=None, agent_obs=None,
                  do_sampling=False, seed=None, model_stmts=None,
-                 nodes_to_agents=None):
-        super().__init__(model, statements, do_sampling, seed, nodes_to_agents)
+                 nodes_to_agents=None, cache_dir=None):
+        super().__init__(model, statements, do_sampling, seed, nodes_to_agents,
+                         cache_dir)
         if agent_obs:
             self.agent_obs = agent_obs
         else:
@@ -132,6 +137,12 @@ class PysbModelChecker(ModelChecker):
         """
         if self._im and not force_update:
             return self._im
+        self._add_observables()
+        return self._generate_im()
+
+    def _add_observables(self):
+        """Add observables for the statements to check and agents to
+        observe to the model."""
         if not self.model:
             raise Exception("Cannot get influence map if there is no model.")
 
@@ -203,6 +214,8 @@ class PysbModelChecker(ModelChecker):
             obs_list = add_obs_for_agent(ag)
             self.agent_to_obs[ag] = obs_list
 
+    def _generate_im(self):
+        """Generate the influence map of the model with its observables."""
         logger.info("Generating influence map")
         self._im = self.generate_im(self.model)
         # self._im.is_multigraph = lambda: False
@@ -229,7 +242,20 @@ class PysbModelChecker(ModelChecker):
         """Get influence map and convert it to a graph with signed nodes."""
         if self.graph:
             return self.graph
-        im = self.get_im(force_update=True)
+        if self.cache_dir:
+            # The observables are part of the model whose influence map is
+            # cached, so they are added first
+            self._add_observables()
+            fingerprint = self.get_fingerprint(
+                prune_im=prune_im, prune_im_degrade=prune_im_degrade,
+                prune_im_subj_obj=prune_im_subj_obj,
+                add_namespaces=add_namespaces)
+            if self.load_cached_graph(fingerprint):
+                return self.graph
+            im = self._generate_im()
+        else:
+            fingerprint = None
+            im = self.get_im(force_update=True)
         if prune_im:
             self.prune_influence_map()
         if prune_im_degrade:
@@ -239,8 +265,36 @@ class PysbModelChecker(ModelChecker):
         self.get_nodes_to_agents(self.model_stmts, add_namespaces)
         self.graph = signed_edges_to_signed_nodes(
             im, prune_nodes=False, edge_signs={'pos': 1, 'neg': -1})
+        if fingerprint:
+            self.save_cached_graph(fingerprint)
         return self.graph
 
+    def get_fingerprint(self, **kwargs):
+        """Return a fingerprint of the model and the options of get_graph.
+
+        The fingerprint is based on the Kappa export of the model, which
+        includes the observables added for the statements to check, the
+        annotations of the model and the statements the model was assembled
+        from.
+        """
+        options = dict(kwargs, model_checker=self.__class__.__name__,
+                       nodes_to_agents=self._nodes_to_agents_given)
+        return _get_fingerprint(itertools.chain(
+            [options, export.export(self.model, 'kappa')],
+            [repr(ann) for ann in self.model.annotations],
+            [(stmt.uuid, stmt.get_hash()) for stmt in self.model_stmts]))
+
+    def _get_cached_data(self):
+        cached_data = super()._get_cached_data()
+        cached_data['im'] = self._im
+        cached_data['rule_obs_dict'] = self.rule_obs_dict
+        return cached_data
+
+    def _set_cached_data(self, cached_data):
+        super()._set_cached_data(cached_data)
+        self._im = cached_data['im']
+        self.rule_obs_dict = cached_data['rule_obs_dict']
+
     def get_nodes_to_agents(self, model_stmts, add_namespaces=False):
         """Return a dictionary mapping influence map nodes to INDRA agents.
 
@@ -596,20 +650,20 @@ class PysbModelChecker(ModelChecker):
         succ_dict = {}
         for node in im.nodes():
             succ_dict[node] = set(im.successors(node))
-        # Sort and then group nodes by number of successors
-        logger.info('Compare combinations of successors')
-        group_key_fun = lambda x: len(succ_dict[x])
-        nodes_sorted = sorted(im.nodes(), key=group_key_fun)
-        groups = itertools.groupby(nodes_sorted, key=group_key_fun)
-        # Now iterate over each group and then construct combinations
-        # within the group to check for shared sucessors
+        # Only nodes which are each other's successors can share all
+        # children except for each other, so we only compare the two nodes
+        # of edges which have a reverse edge, once per pair of nodes
+        logger.info('Compare successors of mutually linked nodes')
+        node_order = {node: idx for idx, node in enumerate(im.nodes())}
         edges_to_remove = []
-        for gix, group in groups:
-            combos = itertools.combinations(group, 2)
-            for ix, (p1, p2) in enumerate(combos):
+        for p1, p1_succs in succ_dict.items():
+            for p2 in p1_succs:
+                if node_order[p2] <= node_order[p1] or \
+                        p1 not in succ_dict[p2]:
+                    continue
                 # Children are identical except for mutual relationship
-                if succ_dict[p1].difference(succ_dict[p2]) == set([p2]) and \
-                   succ_dict[p2].difference(succ_dict[p1]) == set([p1]):
+                if succ_dict[p1].difference(succ_dict[p2]) == {p2} and \
+                        succ_dict[p2].difference(succ_dict[p1]) == {p1}:
                     for u, v in ((p1, p2), (p2, p1)):
                         edges_to_remove.append((u, v))
                         logger.debug('Will remove edge (%s, %s)', u, v)
@@ -621,23 +675,23 @@ class PysbModelChecker(ModelChecker):
     def prune_influence_map_subj_obj(self):
         """Prune influence map to include only edges where the object of the
         upstream rule matches the subject of the downstream rule."""
-        def get_rule_info(r):
-            result = {}
-            for ann in self.model.annotations:
-                if ann.subject == r:
-                    if ann.predicate == 'rule_has_subject':
-                        result['subject'] = ann.object
-                    elif ann.predicate == 'rule_has_object':
-                        result['object'] = ann.object
-            return result
+        # Collect the subject and object of each rule in a single pass over
+        # the annotations
+        rule_info = {}
+        for ann in self.model.annotations:
+            if ann.predicate == 'rule_has_subject':
+                rule_info.setdefault(ann.subject, {})['subject'] = ann.object
+            elif ann.predicate == 'rule_has_object':
+                rule_info.setdefault(ann.subject, {})['object'] = ann.object
         im = self.get_im()
-        rules = im.nodes()
         edges_to_prune = []
-        for r1, r2 in itertools.permutations(rules, 2):
-            if (r1, r2) not in im.edges():
+        # Each pair of linked rules is checked once, even if there are
+        # multiple edges between them
+        for r1, r2 in dict.fromkeys(im.edges()):
+            if r1 == r2:
                 continue
-            r1_info = get_rule_info(r1)
-            r2_info = get_rule_info(r2)
+            r1_info = rule_info.get(r1, {})
+            r2_info = rule_info.get(r2, {})
             if 'object' not in r1_info or 'subject' not in r2_info:
                 continue
             if r1_info['object'] != r2_info['subject']:
@@ -651,10 +705,18 @@ class PysbModelChecker(ModelChecker):
         """Prune positive edges between X degrading and X forming a
         complex with Y."""
         im = self.get_im()
+        rule_stmts = {}
+
+        def get_rule_stmt(rule):
+            if rule not in rule_stmts:
+                rule_stmts[rule] = stmt_from_rule(rule, self.model,
+                                                  model_stmts)
+            return rule_stmts[rule]
+
         edges_to_prune = []
         for r1, r2, data in im.edges(data=True):
-            s1 = stmt_from_rule(r1, self.model, model_stmts)
-            s2 = stmt_from_rule(r2, self.model, model_stmts)
+            s1 = get_rule_stmt(r1)
+            s2 = get_rule_stmt(r2)
             # Make sure this is a degradation/binding combo
             s1_is_degrad = (s1 and isinstance(s1, DecreaseAmount))
             s2_is_bind = (s2 and isinstance(s2, Complex) and 'bind' in r2)
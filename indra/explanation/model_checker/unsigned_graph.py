@@ -1,6 +1,7 @@
 import logging
 import networkx as nx
 from . import ModelChecker
+from .model_checker import get_graph_fingerprint
 from indra.statements import *
 
 
@@ -24,6 +25,9 @@ class UnsignedGraphModelChecker(ModelChecker):
     nodes_to_agents : dict
         A dictionary mapping nodes of intermediate signed edges graph to INDRA
         agents.
+    cache_dir : Optional[str]
+        A directory in which the graph prepared from the model is cached.
+        By default, no cache is used.
 
     Attributes
     ----------
@@ -31,12 +35,16 @@ class UnsignedGraphModelChecker(ModelChecker):
         A DiGraph with signed nodes to find paths in.
     """
     def __init__(self, model, statements=None, do_sampling=False, seed=None,
-                 nodes_to_agents=None):
-        super().__init__(model, statements, do_sampling, seed, nodes_to_agents)
+                 nodes_to_agents=None, cache_dir=None):
+        super().__init__(model, statements, do_sampling, seed, nodes_to_agents,
+                         cache_dir)
 
     def get_graph(self):
         if self.graph:
             return self.graph
+        fingerprint = self.get_fingerprint() if self.cache_dir else None
+        if fingerprint and self.load_cached_graph(fingerprint):
+            return self.graph
         self.graph = nx.DiGraph()
         nodes = []
         for node, node_data in self.model.nodes(data=True):
@@ -45,8 +53,17 @@ class UnsignedGraphModelChecker(ModelChecker):
         for (u, v, data) in self.model.edges(data=True):
             self.graph.add_edge((u, 0), (v, 0), belief=data['belief'])
         self.get_nodes_to_agents()
+        if fingerprint:
+            self.save_cached_graph(fingerprint)
         return self.graph
 
+    def get_fingerprint(self):
+        """Return a fingerprint of the model."""
+        return get_graph_fingerprint(
+            self.model, edge_keys=['belief'],
+            options={'model_checker': self.__class__.__name__,
+                     'nodes_to_agents': self._nodes_to_agents_given})
+
     def process_statement(self, stmt):
         # Check if this is one of the statement types that we can check
         if not isinstance(stmt, (Modification, RegulateAmount,
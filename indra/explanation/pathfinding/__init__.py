@@ -1,2 +1,3 @@
 from .pathfinding import *
-from .util import *
\ No newline at end of file
+from .util import *
+from .compiled_graph import *
@@ -0,0 +1,707 @@
+"""A compact snapshot of a graph for repeated path finding.
+
+A :py:class:`CompiledGraph` is built once from a networkx DiGraph (e.g., an
+IndraNet graph or a signed node graph derived from it) and can be passed
+instead of the DiGraph to the search functions in
+:py:mod:`indra.explanation.pathfinding.pathfinding` (`bfs_search`,
+`bfs_search_multiple_nodes`, `open_dijkstra_search` and
+`shortest_simple_paths`), which then run on integer node IDs. Nodes are
+numbered in the order of the DiGraph, and successors and predecessors are
+stored in CSR format, both in the order of the DiGraph's adjacency and
+sorted by descending belief. The namespace and sign of each node are
+stored in parallel arrays. The searches yield the same paths as on the
+DiGraph.
+
+Note that the snapshot is not updated if the DiGraph changes, except for
+the weights computed from the statement hashes of edges, which are taken
+from the DiGraph every time they are used.
+"""
+__all__ = ['CompiledGraph']
+
+import sys
+import logging
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+
+import numpy as np
+import networkx as nx
+import networkx.algorithms.simple_paths as simple_paths
+from numpy import log as ln
+
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGraph(object):
+    """An integer indexed CSR snapshot of a DiGraph for path finding.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        The graph to compile. Node data may contain 'ns' (namespace) and
+        edge data 'belief'. Signed node graphs have (name, sign) tuples as
+        nodes.
+
+    Attributes
+    ----------
+    graph : nx.DiGraph
+        The compiled graph.
+    nodes : list
+        The nodes of the graph, the ID of a node is its position in the list.
+    node_ids : dict
+        A dict mapping nodes to their IDs.
+    ns : list[str]
+        The lowercase namespace of each node, None if it has no namespace.
+    names : numpy.ndarray
+        For each node, the ID of the first node with the same name, where
+        the name of a signed node is its first element.
+    signs : numpy.ndarray
+        The sign of each signed node, -1 for nodes which are not signed.
+    succ_indptr, succ_indices : numpy.ndarray
+        The successors of each node in CSR format, in adjacency order. The
+        position of a successor in succ_indices is the ID of the edge.
+    pred_indptr, pred_indices, pred_edges : numpy.ndarray
+        The predecessors of each node in CSR format, in adjacency order,
+        and the IDs of the corresponding edges.
+    belief : numpy.ndarray
+        The belief of each edge, 0 if not available.
+    sorted_succ_indices, sorted_pred_indices : numpy.ndarray
+        The successors and predecessors of each node sorted by descending
+        belief, in CSR format with the same indptr as the unsorted ones.
+    """
+    def __init__(self, graph):
+        if not graph.is_directed() or graph.is_multigraph():
+            raise ValueError('Only DiGraphs can be compiled.')
+        self.graph = graph
+        self.nodes = list(graph.nodes)
+        self.node_ids = {node: idx for idx, node in enumerate(self.nodes)}
+        self.ns = []
+        name_ids = {}
+        names = np.empty(len(self.nodes), dtype=np.int64)
+        self.signs = np.full(len(self.nodes), -1, dtype=np.int8)
+        for idx, (node, data) in enumerate(graph.nodes(data=True)):
+            ns = data.get('ns')
+            self.ns.append(ns.lower() if isinstance(ns, str) else None)
+            if isinstance(node, tuple) and len(node) == 2 and \
+                    node[1] in (0, 1):
+                name = node[0]
+                self.signs[idx] = node[1]
+            else:
+                name = node
+            names[idx] = name_ids.setdefault(name, idx)
+        self.names = names
+
+        succ_counts = np.zeros(len(self.nodes), dtype=np.int64)
+        succ_indices = []
+        belief = []
+        edge_ids = {}
+        for idx, (node, nbrs) in enumerate(graph.adjacency()):
+            succ_counts[idx] = len(nbrs)
+            for nbr, data in nbrs.items():
+                nbr_id = self.node_ids[nbr]
+                edge_ids[(idx, nbr_id)] = len(succ_indices)
+                succ_indices.append(nbr_id)
+                belief.append(data.get('belief', 0))
+        self.succ_indptr = _get_indptr(succ_counts)
+        self.succ_indices = np.array(succ_indices, dtype=np.int64)
+        self.belief = np.array(belief, dtype=float)
+
+        pred_counts = np.zeros(len(self.nodes), dtype=np.int64)
+        pred_indices = []
+        pred_edges = []
+        for idx, node in enumerate(self.nodes):
+            preds = graph.pred[node]
+            pred_counts[idx] = len(preds)
+            for pred in preds:
+                pred_id = self.node_ids[pred]
+                pred_indices.append(pred_id)
+                pred_edges.append(edge_ids[(pred_id, idx)])
+        self.pred_indptr = _get_indptr(pred_counts)
+        self.pred_indices = np.array(pred_indices, dtype=np.int64)
+        self.pred_edges = np.array(pred_edges, dtype=np.int64)
+
+        self.sorted_succ_indices = self.succ_indices[_sort_rows(
+            self.succ_indptr, self.belief)]
+        self.sorted_pred_indices = self.pred_indices[_sort_rows(
+            self.pred_indptr, self.belief[self.pred_edges])]
+        self._init_lists()
+
+    def _init_lists(self):
+        # The searches run in Python, for which lists are faster to access
+        # than numpy arrays
+        self._succ_ptr = self.succ_indptr.tolist()
+        self._succ = self.succ_indices.tolist()
+        self._pred_ptr = self.pred_indptr.tolist()
+        self._pred = self.pred_indices.tolist()
+        self._pred_edges = self.pred_edges.tolist()
+        self._sorted_succ = self.sorted_succ_indices.tolist()
+        self._sorted_pred = self.sorted_pred_indices.tolist()
+        self._names = self.names.tolist()
+        self._signs = self.signs.tolist()
+        self._edge_ids = None
+        self._weights = {}
+        self._weighted_adj = {}
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items()
+                if not k.startswith('_')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_lists()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.node_ids
+
+    def get_node_id(self, node):
+        """Return the ID of a node.
+
+        Parameters
+        ----------
+        node : node
+            A node of the graph.
+
+        Returns
+        -------
+        int
+            The ID of the node.
+        """
+        try:
+            return self.node_ids[node]
+        except KeyError:
+            raise nx.NodeNotFound('Node %s not in graph' % str(node))
+
+    def get_weights(self, weight, refresh=False):
+        """Return the weight of each edge from an edge attribute.
+
+        Parameters
+        ----------
+        weight : str or None
+            The name of the edge attribute containing the weight. Edges
+            without the attribute have a weight of 1. If None, all edges have
+            a weight of 1.
+        refresh : Optional[bool]
+            If True, the weights are read from the graph again, even if they
+            were read before. Default: False
+
+        Returns
+        -------
+        list[float]
+            The weight of each edge, indexed by edge ID.
+        """
+        if refresh or weight not in self._weights:
+            self._weights[weight] = [data.get(weight, 1) for _, _, data
+                                     in self.graph.edges(data=True)]
+            self._weighted_adj.pop((weight, False), None)
+            self._weighted_adj.pop((weight, True), None)
+        return self._weights[weight]
+
+    def get_edge_id(self, u, v):
+        """Return the ID of the edge between two node IDs."""
+        if self._edge_ids is None:
+            self._edge_ids = {}
+            for u_id in range(len(self.nodes)):
+                for pos in range(self._succ_ptr[u_id],
+                                 self._succ_ptr[u_id + 1]):
+                    self._edge_ids[(u_id, self._succ[pos])] = pos
+        return self._edge_ids[(u, v)]
+
+    def successors(self, node_id, sort_by_belief=False):
+        """Return the IDs of the successors of a node ID."""
+        nbrs = self._sorted_succ if sort_by_belief else self._succ
+        return nbrs[self._succ_ptr[node_id]:self._succ_ptr[node_id + 1]]
+
+    def predecessors(self, node_id, sort_by_belief=False):
+        """Return the IDs of the predecessors of a node ID."""
+        nbrs = self._sorted_pred if sort_by_belief else self._pred
+        return nbrs[self._pred_ptr[node_id]:self._pred_ptr[node_id + 1]]
+
+    def _get_weighted_adjacency(self, weight, reverse=False):
+        """Return the (neighbor ID, weight) tuples of each node ID.
+
+        The weights have to be read with get_weights before. The neighbors
+        are in adjacency order, as in the graph.
+        """
+        key = (weight, reverse)
+        if key not in self._weighted_adj:
+            weights = self._weights[weight]
+            if reverse:
+                ptr, nbrs = self._pred_ptr, self._pred
+                nbr_weights = [weights[pos] for pos in self._pred_edges]
+            else:
+                ptr, nbrs = self._succ_ptr, self._succ
+                nbr_weights = weights
+            pairs = list(zip(nbrs, nbr_weights))
+            self._weighted_adj[key] = [pairs[ptr[idx]:ptr[idx + 1]]
+                                       for idx in range(len(self.nodes))]
+        return self._weighted_adj[key]
+
+    def _get_ids(self, nodes):
+        return {self.node_ids[node] for node in nodes
+                if node in self.node_ids}
+
+    def _get_edge_ids(self, edges):
+        return {(self.node_ids[u], self.node_ids[v]) for u, v in edges
+                if u in self.node_ids and v in self.node_ids}
+
+    def _to_nodes(self, path):
+        return [self.nodes[node_id] for node_id in path]
+
+
+def _get_indptr(counts):
+    indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr
+
+
+def _sort_rows(indptr, belief):
+    """Return the order of each row's entries by descending belief.
+
+    Entries with the same belief keep their order, as with sorted.
+    """
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    return np.lexsort((np.arange(len(belief)), -belief, rows))
+
+
+def _set_context_weights(graph, weight, ref_counts_function, const_c,
+                         const_tk):
+    for u, v, data in graph.edges(data=True):
+        ref_counts, total = ref_counts_function(graph, u, v)
+        if not ref_counts:
+            ref_counts = 1e-15
+        data[weight] = -const_c * ln(ref_counts / (total + const_tk))
+
+
+def _bfs_search(cg, source_node, reverse=False, depth_limit=2,
+                path_limit=None, max_per_node=5, node_filter=None,
+                node_blacklist=None, terminal_ns=None, sign=None,
+                max_memory=int(2**29), hashes=None, allow_edge=None,
+                strict_mesh_id_filtering=False):
+    """Run bfs_search on a CompiledGraph."""
+    int_plus = 0
+    int_minus = 1
+
+    if strict_mesh_id_filtering:
+        if hashes:
+            allowed_edges = {(cg.node_ids[u], cg.node_ids[v])
+                             for u, v in cg.graph.edges() if allow_edge(u, v)}
+            if not allowed_edges:
+                logger.warning('No edges were allowed in strict mesh id '
+                               'filtering')
+                return
+        else:
+            return
+    else:
+        allowed_edges = None
+
+    source = cg.get_node_id(source_node)
+    neighbors_func = cg.predecessors if reverse else cg.successors
+    names = cg._names
+    signs = cg._signs
+    node_ns = cg.ns
+    queue = deque([(source,)])
+    visited = {source} | cg._get_ids(node_blacklist) \
+        if node_blacklist else {source}
+    yielded_paths = 0
+    appended = 0
+    while queue:
+        cur_path = queue.popleft()
+        last_node = cur_path[-1]
+
+        # if last node is in terminal_ns, continue to next path
+        if terminal_ns and node_ns[last_node] in terminal_ns \
+                and source != last_node:
+            continue
+
+        sorted_neighbors = neighbors_func(last_node, sort_by_belief=True)
+        if allowed_edges is not None:
+            sorted_neighbors = [
+                n for n in sorted_neighbors
+                if ((n, last_node) if reverse else (last_node, n))
+                in allowed_edges]
+        if sign is not None:
+            cur_names = {names[n] for n in cur_path}
+        yielded_neighbors = 0
+        for neighb in sorted_neighbors:
+            # Check cycles
+            if sign is not None:
+                # Avoid signed paths ending up on the opposite sign of the
+                # same node
+                if names[neighb] in cur_names:
+                    continue
+            elif neighb in visited:
+                continue
+
+            # Check namespace
+            if node_filter and len(node_filter) > 0:
+                if node_ns[neighb] not in node_filter:
+                    continue
+
+            # Add to visited nodes and create new path
+            visited.add(neighb)
+            new_path = cur_path + (neighb,)
+
+            # Check yield and break conditions
+            ign_vals = None
+            if len(new_path) > depth_limit + 1:
+                continue
+            elif not terminal_ns:
+                # Upstream signed search should not end in negative node,
+                # downstream signed search has to end on node with requested
+                # sign
+                if sign is None or \
+                        (reverse and signs[neighb] != int_minus) or \
+                        (not reverse and signs[neighb] == sign):
+                    ign_vals = yield tuple(cg.nodes[n] for n in new_path)
+                    yielded_paths += 1
+                    yielded_neighbors += 1
+            # terminal_ns is not None: only yield if last node is in
+            # teminal_ns
+            elif node_ns[neighb] in terminal_ns:
+                if not (sign is not None and reverse and
+                        signs[neighb] == int_minus
+                        or sign is not None and not reverse and
+                        signs[neighb] != sign):
+                    ign_vals = yield tuple(cg.nodes[n] for n in new_path)
+                    yielded_paths += 1
+                    yielded_neighbors += 1
+
+            # If new ignore nodes are received, update set
+            if ign_vals is not None:
+                ign_nodes, ign_edges = ign_vals
+                visited.update(cg._get_ids(ign_nodes))
+
+            # Check max paths reached, no need to add to queue
+            if path_limit and yielded_paths >= path_limit:
+                break
+
+            # Append yielded path
+            queue.append(new_path)
+
+            # Check for memory, the sizes only grow by one entry per path
+            # so we only check them on every 100th path
+            appended += 1
+            if appended % 100 == 1 and \
+                    sys.getsizeof(queue) + sys.getsizeof(visited) > \
+                    max_memory:
+                logger.warning('Memory overflow reached: %d' %
+                               (sys.getsizeof(queue) + sys.getsizeof(visited)))
+                raise StopIteration('Reached maximum allowed memory usage')
+
+            # Check if we've visited enough neighbors
+            if max_per_node and yielded_neighbors >= max_per_node:
+                break
+
+        # Check path limit again to catch the inner break for path_limit
+        if path_limit and yielded_paths >= path_limit:
+            break
+
+
+def _open_dijkstra_search(cg, start, reverse=False, path_limit=None,
+                          hashes=None, ignore_nodes=None, ignore_edges=None,
+                          terminal_ns=None, weight=None,
+                          ref_counts_function=None, const_c=1, const_tk=10):
+    """Run open_dijkstra_search on a CompiledGraph."""
+    if hashes:
+        _set_context_weights(cg.graph, weight, ref_counts_function, const_c,
+                             const_tk)
+        cg.get_weights(weight, refresh=True)
+    else:
+        cg.get_weights(weight)
+    adj = cg._get_weighted_adjacency(weight, reverse)
+
+    ignore_nodes = cg._get_ids(ignore_nodes) if ignore_nodes else None
+    ignore_edges = cg._get_edge_ids(ignore_edges) if ignore_edges else None
+    node_ns = cg.ns
+
+    def proper_path(path):
+        if ignore_nodes and not ignore_nodes.isdisjoint(path):
+            return False
+        if ignore_edges and any((u, v) in ignore_edges
+                                for u, v in zip(path[:-1], path[1:])):
+            return False
+        if terminal_ns:
+            if node_ns[path[-1]] not in terminal_ns:
+                return False
+            for u in path[:-1]:
+                if node_ns[u] in terminal_ns:
+                    return False
+        return True
+
+    # This is the same search as in nx.single_source_dijkstra_path so that
+    # the paths (and their order in case of ties) are the same
+    source = cg.get_node_id(start)
+    dist = {}
+    seen = {source: 0}
+    pred = {}
+    c = count()
+    fringe = [(0, next(c), source)]
+    while fringe:
+        (d, _, v) = heappop(fringe)
+        if v in dist:
+            continue
+        dist[v] = d
+        for u, cost in adj[v]:
+            vu_dist = d + cost
+            if u in dist:
+                if vu_dist < dist[u]:
+                    raise ValueError('Contradictory paths found:',
+                                     'negative weights?')
+            elif u not in seen or vu_dist < seen[u]:
+                seen[u] = vu_dist
+                heappush(fringe, (vu_dist, next(c), u))
+                pred[u] = v
+    # The total weight of each path is the distance of its last node
+    nodes = list(dist)[1:]
+    nodes.sort(key=lambda node: dist[node])
+    for node in nodes:
+        path = [node]
+        while path[-1] != source:
+            path.append(pred[path[-1]])
+        path.reverse()
+        if path_limit is not None:
+            path_limit -= 1
+        if proper_path(path):
+            yield cg._to_nodes(path)
+        if path_limit is not None and not path_limit:
+            break
+
+
+def _shortest_simple_paths(cg, source, target, weight=None,
+                           ignore_nodes=None, ignore_edges=None, hashes=None,
+                           ref_counts_function=None,
+                           strict_mesh_id_filtering=False, const_c=1,
+                           const_tk=10):
+    """Run shortest_simple_paths on a CompiledGraph."""
+    if source not in cg:
+        s = source[0] if isinstance(source, tuple) else source
+        raise nx.NodeNotFound('source node %s not in graph' % s)
+
+    if target not in cg:
+        t = target[0] if isinstance(target, tuple) else target
+        raise nx.NodeNotFound('target node %s not in graph' % t)
+
+    allowed_edges = set()
+    weights = None
+    if hashes:
+        if strict_mesh_id_filtering:
+            allowed_edges = {(cg.node_ids[u], cg.node_ids[v])
+                             for u, v in cg.graph.edges()
+                             if ref_counts_function(cg.graph, u, v)[0]}
+        else:
+            weight = 'context_weight'
+            _set_context_weights(cg.graph, weight, ref_counts_function,
+                                 const_c, const_tk)
+            weights = cg.get_weights(weight, refresh=True)
+    else:
+        if strict_mesh_id_filtering:
+            return
+        if weight is not None:
+            weights = cg.get_weights(weight)
+
+    if weights is None:
+        length_func = len
+
+        def shortest_path_func(source, target, ignore_nodes, ignore_edges):
+            return _bidirectional_shortest_path(cg, source, target,
+                                                ignore_nodes, ignore_edges,
+                                                allowed_edges)
+    else:
+        def length_func(path):
+            return sum(weights[cg.get_edge_id(u, v)]
+                       for (u, v) in zip(path, path[1:]))
+
+        def shortest_path_func(source, target, ignore_nodes, ignore_edges):
+            return _bidirectional_dijkstra(cg, source, target, weight,
+                                           ignore_nodes, ignore_edges)
+
+    source = cg.node_ids[source]
+    target = cg.node_ids[target]
+    culled_ignored_nodes = cg._get_ids(ignore_nodes) if ignore_nodes \
+        else set()
+    culled_ignored_edges = cg._get_edge_ids(ignore_edges) if ignore_edges \
+        else set()
+    listA = list()
+    listB = simple_paths.PathBuffer()
+    prev_path = None
+    while True:
+        cur_ignore_nodes = culled_ignored_nodes.copy()
+        cur_ignore_edges = culled_ignored_edges.copy()
+        if not prev_path:
+            length, path = shortest_path_func(source, target,
+                                              cur_ignore_nodes,
+                                              cur_ignore_edges)
+            listB.push(length, path)
+        else:
+            for i in range(1, len(prev_path)):
+                root = prev_path[:i]
+                root_length = length_func(root)
+                for path in listA:
+                    if path[:i] == root:
+                        cur_ignore_edges.add((path[i - 1], path[i]))
+                try:
+                    length, spur = shortest_path_func(root[-1], target,
+                                                      cur_ignore_nodes,
+                                                      cur_ignore_edges)
+                    path = root[:-1] + spur
+                    listB.push(root_length + length, path)
+                except nx.NetworkXNoPath:
+                    pass
+                cur_ignore_nodes.add(root[-1])
+        if listB:
+            path = listB.pop()
+            rcvd_ignore_values = yield cg._to_nodes(path)
+            if rcvd_ignore_values is not None:
+                culled_ignored_nodes = culled_ignored_nodes.union(
+                    cg._get_ids(rcvd_ignore_values[0]))
+                culled_ignored_edges = culled_ignored_edges.union(
+                    cg._get_edge_ids(rcvd_ignore_values[1]))
+            listA.append(path)
+            prev_path = path
+        else:
+            break
+
+
+def _get_neighbor_funcs(cg, ignore_nodes, ignore_edges, allowed_edges=None):
+    """Return functions of the allowed predecessors and successors of IDs."""
+    def pred_func(v):
+        return [w for w in cg.predecessors(v)
+                if not (ignore_nodes and w in ignore_nodes) and
+                not (ignore_edges and (w, v) in ignore_edges) and
+                not (allowed_edges and (w, v) not in allowed_edges)]
+
+    def succ_func(v):
+        return [w for w in cg.successors(v)
+                if not (ignore_nodes and w in ignore_nodes) and
+                not (ignore_edges and (v, w) in ignore_edges) and
+                not (allowed_edges and (v, w) not in allowed_edges)]
+    return pred_func, succ_func
+
+
+def _bidirectional_shortest_path(cg, source, target, ignore_nodes=None,
+                                 ignore_edges=None, allowed_edges=None):
+    """Return the length and the shortest path between two node IDs.
+
+    This is the same search as the one in
+    pathfinding._bidirectional_pred_succ.
+    """
+    if ignore_nodes and (source in ignore_nodes or target in ignore_nodes):
+        raise nx.NetworkXNoPath('No path between %s and %s.'
+                                % (cg.nodes[source], cg.nodes[target]))
+    if target == source:
+        return 1, [source]
+    pred_func, succ_func = _get_neighbor_funcs(cg, ignore_nodes, ignore_edges,
+                                               allowed_edges)
+    pred = {source: None}
+    succ = {target: None}
+    forward_fringe = [source]
+    reverse_fringe = [target]
+    w = None
+    while w is None and forward_fringe and reverse_fringe:
+        if len(forward_fringe) <= len(reverse_fringe):
+            this_level = forward_fringe
+            forward_fringe = []
+            for v in this_level:
+                for x in succ_func(v):
+                    if x not in pred:
+                        forward_fringe.append(x)
+                        pred[x] = v
+                    if x in succ:
+                        w = x
+                        break
+                if w is not None:
+                    break
+        else:
+            this_level = reverse_fringe
+            reverse_fringe = []
+            for v in this_level:
+                for x in pred_func(v):
+                    if x not in succ:
+                        succ[x] = v
+                        reverse_fringe.append(x)
+                    if x in pred:
+                        w = x
+                        break
+                if w is not None:
+                    break
+    if w is None:
+        raise nx.NetworkXNoPath('No path between %s and %s.'
+                                % (cg.nodes[source], cg.nodes[target]))
+    path = []
+    while w is not None:
+        path.append(w)
+        w = succ[w]
+    w = pred[path[0]]
+    while w is not None:
+        path.insert(0, w)
+        w = pred[w]
+    return len(path), path
+
+
+def _bidirectional_dijkstra(cg, source, target, weight, ignore_nodes=None,
+                            ignore_edges=None):
+    """Return the length and the shortest weighted path between two node IDs.
+
+    This is the same search as the one in
+    networkx.algorithms.simple_paths._bidirectional_dijkstra.
+    """
+    if ignore_nodes and (source in ignore_nodes or target in ignore_nodes):
+        raise nx.NetworkXNoPath('No path between %s and %s.'
+                                % (cg.nodes[source], cg.nodes[target]))
+    if source == target:
+        return 0, [source]
+
+    adjs = [cg._get_weighted_adjacency(weight),
+            cg._get_weighted_adjacency(weight, reverse=True)]
+
+    def neighbors(v, direction):
+        nbrs = adjs[direction][v]
+        if not ignore_nodes and not ignore_edges:
+            return nbrs
+        return [(w, wt) for w, wt in nbrs
+                if not (ignore_nodes and w in ignore_nodes) and
+                not (ignore_edges and
+                     ((v, w) if direction == 0 else (w, v)) in ignore_edges)]
+
+    dists = [{}, {}]
+    paths = [{source: [source]}, {target: [target]}]
+    fringe = [[], []]
+    seen = [{source: 0}, {target: 0}]
+    c = count()
+    heappush(fringe[0], (0, next(c), source))
+    heappush(fringe[1], (0, next(c), target))
+    finalpath = []
+    finaldist = None
+    direction = 1
+    while fringe[0] and fringe[1]:
+        direction = 1 - direction
+        (dist, _, v) = heappop(fringe[direction])
+        if v in dists[direction]:
+            continue
+        dists[direction][v] = dist
+        if v in dists[1 - direction]:
+            return finaldist, finalpath
+        for w, minweight in neighbors(v, direction):
+            vw_length = dists[direction][v] + minweight
+            if w in dists[direction]:
+                if vw_length < dists[direction][w]:
+                    raise ValueError('Contradictory paths found: '
+                                     'negative weights?')
+            elif w not in seen[direction] or \
+                    vw_length < seen[direction][w]:
+                seen[direction][w] = vw_length
+                heappush(fringe[direction], (vw_length, next(c), w))
+                paths[direction][w] = paths[direction][v] + [w]
+                if w in seen[0] and w in seen[1]:
+                    totaldist = seen[0][w] + seen[1][w]
+                    if finalpath == [] or finaldist > totaldist:
+                        finaldist = totaldist
+                        revpath = paths[1][w][:]
+                        revpath.reverse()
+                        finalpath = paths[0][w] + revpath[1:]
+    raise nx.NetworkXNoPath('No path between %s and %s.'
+                            % (cg.nodes[source], cg.nodes[target]))
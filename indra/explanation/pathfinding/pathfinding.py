@@ -1,4 +1,5 @@
 __all__ = ['shortest_simple_paths', 'bfs_search', 'find_sources',
+           'find_all_sources', 'get_sources_from_index',
            'get_path_iter', 'bfs_search_multiple_nodes',
            '_bidirectional_shortest_path', '_bidirectional_pred_succ',
            'open_dijkstra_search']
@@ -13,6 +14,8 @@ import networkx.algorithms.simple_paths as simple_paths
 from numpy import log as ln
 
 from .util import get_sorted_neighbors
+from .compiled_graph import CompiledGraph, _bfs_search, \
+    _open_dijkstra_search, _shortest_simple_paths
 
 
 logger = logging.getLogger(__name__)
@@ -35,7 +38,7 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
 
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph or CompiledGraph
     source : node
        Starting node for path
     target : node
@@ -112,6 +115,14 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
        (Jul., 1971), pp. 712-716.
 
     """
+    if isinstance(G, CompiledGraph):
+        return (yield from _shortest_simple_paths(
+            G, source, target, weight=weight, ignore_nodes=ignore_nodes,
+            ignore_edges=ignore_edges, hashes=hashes,
+            ref_counts_function=ref_counts_function,
+            strict_mesh_id_filtering=strict_mesh_id_filtering,
+            const_c=const_c, const_tk=const_tk))
+
     if source not in G:
         s = source[0] if isinstance(source, tuple) else source
         raise nx.NodeNotFound('source node %s not in graph' % s)
@@ -220,10 +231,11 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
 
     Parameters
     ----------
-    g : nx.Digraph
+    g : nx.Digraph or CompiledGraph
         An nx.DiGraph to search in. Can also be a signed node graph. It is
         required that node data contains 'ns' (namespace) and edge data
-        contains 'belief'.
+        contains 'belief'. A CompiledGraph of the DiGraph can be used
+        to speed up repeated searches.
     source_node : node
         Node in the graph to start from.
     reverse : bool
@@ -263,6 +275,15 @@ def bfs_search(g, source_node, reverse=False, depth_limit=2, path_limit=None,
     path : tuple(node)
         Paths in the bfs search starting from `source`.
     """
+    if isinstance(g, CompiledGraph):
+        return (yield from _bfs_search(
+            g, source_node, reverse=reverse, depth_limit=depth_limit,
+            path_limit=path_limit, max_per_node=max_per_node,
+            node_filter=node_filter, node_blacklist=node_blacklist,
+            terminal_ns=terminal_ns, sign=sign, max_memory=max_memory,
+            hashes=hashes, allow_edge=allow_edge,
+            strict_mesh_id_filtering=strict_mesh_id_filtering))
+
     int_plus = 0
     int_minus = 1
 
@@ -415,7 +436,7 @@ def bfs_search_multiple_nodes(g, source_nodes, path_limit=None, **kwargs):
 
     Parameters
     ----------
-    g : nx.Digraph
+    g : nx.Digraph or CompiledGraph
         An nx.DiGraph to search in. Can also be a signed node graph. It is
         required that node data contains 'ns' (namespace) and edge data
         contains 'belief'.
@@ -523,6 +544,86 @@ def find_sources(graph, target, sources, filter_func=None):
     # Update filter function to not filter the sources
     if sources is not None:
         filter_func = filter_except(filter_func, sources)
+    for child, path_length in _bfs_upstream(graph, target, filter_func):
+        # Is this child one of the source nodes we're looking for? If
+        # so, yield it along with path length.
+        # Also make sure that found source is positive
+        if (sources is None or child in sources) and child[1] == 0:
+            logger.debug("Found path to %s from %s with length %d"
+                         % (target, child, path_length))
+            yield (child, path_length)
+
+
+def find_all_sources(graph, target, filter_func=None):
+    """Return an index of all positive source nodes with paths to the target.
+
+    The index is built with a single breadth-first search upstream from the
+    target and can be used with get_sources_from_index to get the sources
+    that find_sources would return for any list of sources, without
+    searching again. This is useful when many statements with the same
+    target are checked. Note that the index is only valid for lists of
+    sources which are all allowed by filter_func, since find_sources
+    doesn't filter the sources themselves.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        A DiGraph with signed nodes to find paths in.
+    target : node
+        The signed node (usually common target node) in the graph to start
+        looking upstream for sources.
+    filter_func : Optional[function]
+        A function to constrain the intermediate nodes in the path. A
+        function should take a node as a parameter and return True if the node
+        is allowed to be in a path and False otherwise.
+
+    Returns
+    -------
+    dict
+        A dict mapping each positive node upstream of the target to a list of
+        (order, path_length) tuples, one for each time the node was reached
+        in the search, where order is the position at which it was reached.
+    """
+    source_index = {}
+    for order, (child, path_length) in \
+            enumerate(_bfs_upstream(graph, target, filter_func)):
+        if child[1] == 0:
+            source_index.setdefault(child, []).append((order, path_length))
+    return source_index
+
+
+def get_sources_from_index(source_index, sources):
+    """Return the sources with paths to a target from an index of sources.
+
+    Parameters
+    ----------
+    source_index : dict
+        An index of sources as returned by find_all_sources.
+    sources : list[node] or None
+        Signed nodes corresponding to the subject or upstream influence
+        being checked, or None if any source is accepted.
+
+    Returns
+    -------
+    list of (source, path_length)
+        The sources and path lengths in the same order as they are yielded by
+        find_sources.
+    """
+    if sources is None:
+        nodes = source_index.keys()
+    else:
+        nodes = (node for node in set(sources) if node in source_index)
+    found = [(order, node, path_length) for node in nodes
+             for order, path_length in source_index[node]]
+    return [(node, path_length) for _, node, path_length in sorted(found)]
+
+
+def _bfs_upstream(graph, target, filter_func=None):
+    """Yield each node reached upstream of the target and its path length.
+
+    A node is yielded every time it is reached from one of its successors,
+    even if it was already visited.
+    """
     # First, create a list of visited nodes
     # Adapted from
     # networkx.algorithms.traversal.breadth_first_search.bfs_edges
@@ -542,13 +643,7 @@ def find_sources(graph, target, sources, filter_func=None):
         try:
             # Get the next child in the list
             child = next(children)
-            # Is this child one of the source nodes we're looking for? If
-            # so, yield it along with path length.
-            # Also make sure that found source is positive
-            if (sources is None or child in sources) and child[1] == 0:
-                logger.debug("Found path to %s from %s with length %d"
-                             % (target, child, path_length+1))
-                yield (child, path_length+1)
+            yield (child, path_length + 1)
             # Check this child against the visited list. If we haven't
             # visited it already (accounting for the path to the node),
             # then add it to the queue.
@@ -563,8 +658,6 @@ def find_sources(graph, target, sources, filter_func=None):
         # node, pop the node off and go to the next one in the queue
         except StopIteration:
             queue.popleft()
-    # There was no path; this will produce an empty generator
-    return
 
 
 def _bidirectional_shortest_path(G, source, target,
@@ -762,7 +855,7 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
 
     Parameters
     ----------
-    g : nx.Digraph
+    g : nx.Digraph or CompiledGraph
         An nx.DiGraph to search in.
     start : node
         Node in the graph to start from.
@@ -800,6 +893,14 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
     path : tuple(node)
         Paths in the bfs search starting from `source`.
     """
+    if isinstance(g, CompiledGraph):
+        return (yield from _open_dijkstra_search(
+            g, start, reverse=reverse, path_limit=path_limit, hashes=hashes,
+            ignore_nodes=ignore_nodes, ignore_edges=ignore_edges,
+            terminal_ns=terminal_ns, weight=weight,
+            ref_counts_function=ref_counts_function, const_c=const_c,
+            const_tk=const_tk))
+
     def weights_sum(path):
         return sum(g[u][v][weight]
                    for u, v in zip(path[:-1], path[1:]))
@@ -2,7 +2,6 @@ import uuid
 import logging
 import networkx
 import itertools
-from indra.util import fast_deepcopy
 from indra.statements import *
 from indra.ontology.bio import bio_ontology
 
@@ -191,7 +190,7 @@ class MechLinker(object):
                     new_stmts.append(stmt)
                 else:
                     for af in active_forms:
-                        new_stmt = fast_deepcopy(stmt)
+                        new_stmt = stmt.copy()
                         new_stmt.uuid = str(uuid.uuid4())
                         evs = af.apply_to(new_stmt.enz)
                         new_stmt.partial_evidence = evs
@@ -207,7 +206,7 @@ class MechLinker(object):
                     new_stmts.append(stmt)
                 else:
                     for af in active_forms:
-                        new_stmt = fast_deepcopy(stmt)
+                        new_stmt = stmt.copy()
                         new_stmt.uuid = str(uuid.uuid4())
                         evs = af.apply_to(new_stmt.subj)
                         new_stmt.partial_evidence = evs
@@ -0,0 +1,314 @@
+"""A compact, memory-mapped index of transitive ontology relations.
+
+The index assigns an integer ID to each node of an ontology (in the order
+of their sorted labels), and for a set of relation types (e.g., isa and
+partof), stores the sorted IDs of all the nodes that are reachable from each
+node via edges of the given types in a CSR-style pair of arrays. The arrays
+are saved as numpy files and memory-mapped when loaded, so the index doesn't
+need to be copied into the memory of each process using it, and lookups
+don't require traversing the ontology graph.
+
+The fingerprint of the ontology (see
+:py:meth:`indra.ontology.IndraOntology.get_fingerprint`) is saved along with
+the arrays, and an index is only loaded if it was built for an ontology with
+the same fingerprint.
+"""
+__all__ = ['AncestorIndex']
+
+import os
+import json
+import uuid
+import bisect
+import logging
+from collections import deque
+from contextlib import contextmanager
+import numpy
+
+
+logger = logging.getLogger(__name__)
+
+
+class AncestorIndex(object):
+    """A memory-mapped index of the transitive relations of an ontology.
+
+    Instances are typically obtained using the :py:meth:`build` and
+    :py:meth:`load` class methods.
+
+    Parameters
+    ----------
+    path : str
+        The path to the folder in which the index files are stored.
+
+    Attributes
+    ----------
+    relations : dict[frozenset, tuple]
+        A dict keyed by sets of relation types whose values are pairs of
+        indptr and indices arrays for the given relation types.
+    """
+    # Sets of relation types that are indexed, and the file prefix used
+    # for each
+    indexed_relations = {
+        frozenset({'isa'}): 'isa',
+        frozenset({'partof'}): 'partof',
+        frozenset({'isa', 'partof'}): 'isa_or_partof',
+    }
+
+    def __init__(self, path):
+        self.path = path
+        self._labels = None
+        self._label_offsets = None
+        self.relations = {}
+        self._load_arrays()
+
+    def _load_arrays(self):
+        self._labels = _load_array(self.path, 'labels')
+        self._label_offsets = _load_array(self.path, 'label_offsets')
+        self.relations = {
+            rel_types: (_load_array(self.path, '%s_indptr' % prefix),
+                        _load_array(self.path, '%s_indices' % prefix))
+            for rel_types, prefix in self.indexed_relations.items()
+        }
+
+    def __getstate__(self):
+        # We only pickle the path and memory-map the arrays again when
+        # unpickling rather than copying them.
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._load_arrays()
+
+    def __len__(self):
+        return len(self._label_offsets) - 1
+
+    @classmethod
+    def build(cls, ontology, path):
+        """Build the index for a given ontology and save it in a folder.
+
+        Parameters
+        ----------
+        ontology : indra.ontology.IndraOntology
+            An initialized IndraOntology instance.
+        path : str
+            The path to a folder in which the index files are saved.
+
+        Returns
+        -------
+        AncestorIndex
+            The memory-mapped index that was built.
+        """
+        logger.info('Building ancestor index for %d nodes' %
+                    len(ontology.nodes))
+        labels = sorted(ontology.nodes, key=lambda x: x.encode('utf-8'))
+        label_to_idx = {label: idx for idx, label in enumerate(labels)}
+        encoded = [label.encode('utf-8') for label in labels]
+        label_offsets = numpy.zeros(len(labels) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(enc) for enc in encoded], out=label_offsets[1:])
+        arrays = {
+            'labels': numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8),
+            'label_offsets': label_offsets,
+        }
+        for rel_types, prefix in cls.indexed_relations.items():
+            successors = [[] for _ in labels]
+            for source, target, edge_type in ontology.edges(data='type'):
+                if edge_type in rel_types:
+                    successors[label_to_idx[source]].append(
+                        label_to_idx[target])
+            indptr, indices = _get_closure_arrays(successors)
+            arrays['%s_indptr' % prefix] = indptr
+            arrays['%s_indices' % prefix] = indices
+        os.makedirs(path, exist_ok=True)
+        # The fingerprint is removed first and saved last so that an index
+        # that is only partially replaced is not loaded
+        fingerprint_path = os.path.join(path, FINGERPRINT_FILE)
+        if os.path.exists(fingerprint_path):
+            os.remove(fingerprint_path)
+        for name, array in arrays.items():
+            _save_array(path, name, array)
+        _save_json(path, FINGERPRINT_FILE, ontology.get_fingerprint())
+        logger.info('Saved ancestor index at %s' % path)
+        return cls(path)
+
+    @classmethod
+    def load(cls, path, fingerprint=None):
+        """Return the index saved in a given folder or None if not available.
+
+        Parameters
+        ----------
+        path : str
+            The path to the folder in which the index files are stored.
+        fingerprint : Optional[dict]
+            The fingerprint of the ontology the index is loaded for. If
+            given, the index is only loaded if it was built for an ontology
+            with the same fingerprint.
+
+        Returns
+        -------
+        AncestorIndex or None
+            The memory-mapped index or None if it could not be loaded.
+        """
+        try:
+            if fingerprint is not None:
+                with open(os.path.join(path, FINGERPRINT_FILE), 'r') as fh:
+                    saved_fingerprint = json.load(fh)
+                if saved_fingerprint != fingerprint:
+                    logger.info('The ancestor index at %s was built for a '
+                                'different version of the ontology.' % path)
+                    return None
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logger.debug('Could not load ancestor index from %s: %s' %
+                         (path, e))
+            return None
+
+    def get_label(self, idx):
+        """Return the node label corresponding to a given integer ID."""
+        return self._labels[self._label_offsets[idx]:
+                            self._label_offsets[idx + 1]].tobytes().\
+            decode('utf-8')
+
+    def get_idx(self, label):
+        """Return the integer ID of a given node label or None if missing."""
+        encoded = label.encode('utf-8')
+        idx = bisect.bisect_left(_EncodedLabels(self), encoded)
+        if idx < len(self) and self._get_encoded(idx) == encoded:
+            return idx
+        return None
+
+    def _get_encoded(self, idx):
+        return self._labels[self._label_offsets[idx]:
+                            self._label_offsets[idx + 1]].tobytes()
+
+    def supports(self, rel_types):
+        """Return True if the given set of relation types is indexed."""
+        return frozenset(rel_types) in self.relations
+
+    def isrel(self, label1, label2, rel_types):
+        """Return True if the first node reaches the second via rel_types.
+
+        Parameters
+        ----------
+        label1 : str
+            The label of the first node.
+        label2 : str
+            The label of the second node.
+        rel_types : set of str
+            A set of relation types that is indexed.
+
+        Returns
+        -------
+        bool
+            True if there is a directed path from the first node to the
+            second consisting of edges with types in rel_types.
+        """
+        idx1 = self.get_idx(label1)
+        if idx1 is None:
+            return False
+        idx2 = self.get_idx(label2)
+        if idx2 is None:
+            return False
+        indptr, indices = self.relations[frozenset(rel_types)]
+        start, end = indptr[idx1], indptr[idx1 + 1]
+        if start == end:
+            return False
+        pos = start + numpy.searchsorted(indices[start:end], idx2)
+        return bool(pos < end and indices[pos] == idx2)
+
+    def get_ancestors(self, label, rel_types):
+        """Return the labels of all nodes reachable from a given node.
+
+        Parameters
+        ----------
+        label : str
+            The label of a node.
+        rel_types : set of str
+            A set of relation types that is indexed.
+
+        Returns
+        -------
+        list of str
+            The labels of all the nodes reachable from the given node via
+            edges with types in rel_types.
+        """
+        idx = self.get_idx(label)
+        if idx is None:
+            return []
+        indptr, indices = self.relations[frozenset(rel_types)]
+        return [self.get_label(ancestor_idx) for ancestor_idx
+                in indices[indptr[idx]:indptr[idx + 1]]
+                if ancestor_idx != idx]
+
+
+class _EncodedLabels(object):
+    """A lazy sequence view of the encoded labels for binary search."""
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, idx):
+        return self.index._get_encoded(idx)
+
+
+def _load_array(path, name):
+    return numpy.load(os.path.join(path, '%s.npy' % name), mmap_mode='r')
+
+
+def _save_array(path, name, array):
+    with _atomic_open(path, '%s.npy' % name, 'wb') as fh:
+        numpy.save(fh, array)
+
+
+def _save_json(path, file_name, obj):
+    with _atomic_open(path, file_name, 'w') as fh:
+        json.dump(obj, fh)
+
+
+@contextmanager
+def _atomic_open(path, file_name, mode):
+    """Open a file in a folder that is only put in place once closed.
+
+    The content is written to a temporary file in the same folder which
+    then replaces the given file, so other processes never see a partially
+    written file. Memory-mapped arrays of a replaced file remain valid.
+    """
+    file_path = os.path.join(path, file_name)
+    tmp_path = '%s.%s.tmp' % (file_path, uuid.uuid4().hex)
+    try:
+        with open(tmp_path, mode) as fh:
+            yield fh
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _get_closure_arrays(successors):
+    """Return CSR arrays of the sorted transitive closure of successors."""
+    indptr = numpy.zeros(len(successors) + 1, dtype=numpy.int64)
+    closures = []
+    for idx, succ in enumerate(successors):
+        if not succ:
+            indptr[idx + 1] = indptr[idx]
+            continue
+        visited = set()
+        queue = deque(succ)
+        while queue:
+            node = queue.popleft()
+            if node in visited:
+                continue
+            visited.add(node)
+            queue.extend(successors[node])
+        # Note that the node itself is only included if it is part of
+        # a cycle
+        closure = sorted(visited)
+        closures.append(closure)
+        indptr[idx + 1] = indptr[idx] + len(closure)
+    indices = numpy.fromiter((node for closure in closures
+                              for node in closure), dtype=numpy.int32,
+                             count=int(indptr[-1]))
+    return indptr, indices
+
+
+FINGERPRINT_FILE = 'fingerprint.json'
@@ -3,9 +3,16 @@
 __all__ = ['bio_ontology', 'BioOntology']
 
 from indra.config import get_config
-from .ontology import BioOntology
+from .ontology import BioOntology, COMPACT_DIR, get_cached_fingerprint
 from ..virtual import VirtualOntology
+from ..compact import CompactOntology
 
 indra_ontology_url = get_config('INDRA_ONTOLOGY_URL')
-bio_ontology = BioOntology() if not indra_ontology_url else \
-    VirtualOntology(url=indra_ontology_url)
\ No newline at end of file
+indra_ontology_format = get_config('INDRA_ONTOLOGY_FORMAT')
+if indra_ontology_url:
+    bio_ontology = VirtualOntology(url=indra_ontology_url)
+elif indra_ontology_format == 'compact':
+    bio_ontology = CompactOntology(COMPACT_DIR, source=BioOntology,
+                                   source_fingerprint=get_cached_fingerprint)
+else:
+    bio_ontology = BioOntology()
@@ -11,7 +11,10 @@ To control the build and clean up caches if necessary, one can call
 to build or clean up the INDRA bio ontology. The script takes
 a single operation argument which can be as follows:
 
-* `build`: build the ontology and cache it
+* `build`: build the ontology and cache it, along with the compact version
+  of the ontology if it was built before
+* `build-compact`: build the compact, memory-mapped version of the ontology
+  (used if INDRA_ONTOLOGY_FORMAT is set to compact)
 * `clean`: delete the current version of the ontology from the cache
 * `clean-old`: delete all versions of the ontology except the current one
 * `clean-all`: delete all versions of the bio ontology from the cache
@@ -21,18 +24,28 @@ import sys
 import glob
 import shutil
 import logging
-from .ontology import BioOntology, CACHE_DIR
+from .ontology import BioOntology, CACHE_DIR, COMPACT_DIR
+from ..compact import CompactOntology
+from ..compact.ontology import META_FILE
 
 logger = logging.getLogger('indra.ontology.bio')
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         logger.info('Operation missing. Supported operations: '
-                    'build, clean, clean-old, clean-all.')
+                    'build, build-compact, clean, clean-old, clean-all.')
         sys.exit(1)
     operation = sys.argv[1]
     if operation == 'build':
-        BioOntology().initialize(rebuild=True)
+        bio_ontology = BioOntology()
+        bio_ontology.initialize(rebuild=True)
+        # The compact ontology is rebuilt so that it isn't out of date
+        if os.path.exists(os.path.join(COMPACT_DIR, META_FILE)):
+            CompactOntology.build(bio_ontology, COMPACT_DIR)
+    elif operation == 'build-compact':
+        bio_ontology = BioOntology()
+        bio_ontology.initialize()
+        CompactOntology.build(bio_ontology, COMPACT_DIR)
     elif operation.startswith('clean'):
         parent_dir = os.path.normpath(os.path.join(CACHE_DIR, os.pardir))
         version_paths = glob.glob(os.path.join(parent_dir, '*', ''))
@@ -1,8 +1,10 @@
 import os
+import json
 import pickle
 import logging
 from indra.config import get_config
 from ..ontology_graph import IndraOntology
+from ..ancestor_index import _save_json
 from indra.util import read_unicode_csv
 from indra.statements import modtype_conditions
 from indra.resources import get_resource_path
@@ -40,13 +42,40 @@ class BioOntology(IndraOntology):
                 logger.info('Caching INDRA bio ontology at %s' % CACHE_FILE)
                 with open(CACHE_FILE, 'wb') as fh:
                     pickle.dump(self, fh, pickle.HIGHEST_PROTOCOL)
+                self._cache_fingerprint()
             except Exception:
                 logger.warning('Failed to cache ontology at %s.' % CACHE_FILE)
+            self._cache_ancestor_index()
         else:
             logger.info(
                 'Loading INDRA bio ontology from cache at %s' % CACHE_FILE)
             with open(CACHE_FILE, 'rb') as fh:
                 self.__dict__.update(pickle.load(fh).__dict__)
+            # Caches made before fingerprints were saved don't have one
+            if get_cached_fingerprint() != self.get_fingerprint():
+                try:
+                    self._cache_fingerprint()
+                except Exception:
+                    logger.warning('Failed to cache ontology fingerprint at '
+                                   '%s.' % CACHE_DIR)
+            if not self._load_ancestor_index(ANCESTOR_INDEX_DIR):
+                self._cache_ancestor_index()
+
+    def _cache_fingerprint(self):
+        # The fingerprint is saved next to the cached pickle so that files
+        # derived from the ontology can be checked without loading it
+        _save_json(CACHE_DIR, FINGERPRINT_FILE, self.get_fingerprint())
+
+    def _cache_ancestor_index(self):
+        # The ancestor index is memory-mapped from files next to the
+        # cached pickle, if it can't be built there, we fall back to
+        # traversing the graph for isa/partof lookups.
+        try:
+            self._build_ancestor_index(ANCESTOR_INDEX_DIR)
+        except Exception:
+            logger.warning('Failed to build ancestor index at %s.' %
+                           ANCESTOR_INDEX_DIR)
+            self.ancestor_index = None
 
     def _build(self):
         # Add all nodes with annotations
@@ -472,3 +501,24 @@ CACHE_DIR = os.path.join((get_config('INDRA_RESOURCES') or
                          '%s_ontology' % BioOntology.name,
                          BioOntology.version)
 CACHE_FILE = os.path.join(CACHE_DIR, 'bio_ontology.pkl')
+FINGERPRINT_FILE = 'bio_ontology_fingerprint.json'
+ANCESTOR_INDEX_DIR = os.path.join(CACHE_DIR, 'ancestor_index')
+COMPACT_DIR = os.path.join(CACHE_DIR, 'compact')
+
+
+def get_cached_fingerprint():
+    """Return the fingerprint of the cached bio ontology if available.
+
+    Returns
+    -------
+    dict or None
+        The fingerprint of the cached BioOntology or None if it isn't
+        cached.
+    """
+    if not os.path.exists(CACHE_FILE):
+        return None
+    try:
+        with open(os.path.join(CACHE_DIR, FINGERPRINT_FILE), 'r') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
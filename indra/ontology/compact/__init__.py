@@ -0,0 +1,3 @@
+"""This module implements a compact ontology which answers queries using
+memory-mapped arrays stored on disk instead of an in-memory graph."""
+from .ontology import CompactOntology
@@ -0,0 +1,282 @@
+import os
+import json
+import bisect
+import logging
+import numpy
+from ..ontology_graph import IndraOntology, with_initialize
+from ..ancestor_index import AncestorIndex, _load_array, _save_array, \
+    _save_json
+
+
+logger = logging.getLogger(__name__)
+
+
+class CompactOntology(IndraOntology):
+    """An ontology whose content is memory-mapped from a set of files.
+
+    The files contain a table of node labels (shared with the
+    :py:class:`indra.ontology.ancestor_index.AncestorIndex` that is stored in
+    the same folder), integer edge arrays for each relation type in both
+    directions, node attribute columns and a sorted name lookup table.
+    Loading the ontology only memory-maps these files which is fast and
+    allows the operating system to share the pages across processes.
+    The ontology is read-only, and it doesn't contain any nodes or edges
+    as a networkx graph. The fingerprint of the source ontology (see
+    :py:meth:`indra.ontology.IndraOntology.get_fingerprint`) is saved with
+    the files, and if the current fingerprint of the source ontology is
+    known, the files are rebuilt when they were built from a different
+    version of it.
+
+    Parameters
+    ----------
+    path : str
+        The path to the folder in which the ontology files are stored.
+    source : Optional[function]
+        A function returning an IndraOntology instance which, if the
+        ontology files don't exist yet or are out of date, is initialized
+        and used to build them.
+    source_fingerprint : Optional[function]
+        A function returning the current fingerprint of the source ontology
+        without initializing it, or None if it isn't known. If not given,
+        existing ontology files are always used.
+    """
+    def __init__(self, path, source=None, source_fingerprint=None):
+        super().__init__()
+        self.path = path
+        self.source = source
+        self.source_fingerprint = source_fingerprint
+        self._fingerprint = None
+        self._arrays = None
+
+    def initialize(self):
+        """Memory-map the ontology files, building them first if needed."""
+        meta = self._load_meta()
+        if meta is None or not self._is_up_to_date(meta):
+            if self.source is None:
+                raise ValueError('No up to date compact ontology found at %s '
+                                 'and no source ontology to build it from.' %
+                                 self.path)
+            source_ontology = self.source()
+            source_ontology.initialize()
+            self.build(source_ontology, self.path)
+            meta = self._load_meta()
+        self._load(meta)
+        self._initialized = True
+
+    def _load_meta(self):
+        meta_path = os.path.join(self.path, META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r') as fh:
+            return json.load(fh)
+
+    def _is_up_to_date(self, meta):
+        if self.source_fingerprint is None:
+            return True
+        fingerprint = self.source_fingerprint()
+        if fingerprint is None or fingerprint == meta.get('fingerprint'):
+            return True
+        logger.info('The compact ontology at %s was built from a different '
+                    'version of the ontology.' % self.path)
+        return False
+
+    def _load(self, meta):
+        self.name = meta.get('name')
+        self.version = meta.get('version')
+        self._fingerprint = meta.get('fingerprint')
+        self.ancestor_index = AncestorIndex(self.path)
+        self._arrays = {
+            'edges': {rel_type: tuple(_load_array(self.path, '%s_%s' %
+                                                  (rel_type, part))
+                                      for part in EDGE_ARRAYS)
+                      for rel_type in meta['rel_types']},
+            'properties': {prop: _StringColumn.load(self.path,
+                                                    'property_%s' % prop)
+                           for prop in meta['properties']},
+            'name_keys': _StringColumn.load(self.path, 'name_keys'),
+            'name_idx': _load_array(self.path, 'name_idx'),
+        }
+        logger.info('Loaded compact %s ontology from %s' % (self.name,
+                                                             self.path))
+
+    def __getstate__(self):
+        # The memory-mapped arrays are loaded again when unpickling
+        # rather than being copied.
+        state = self.__dict__.copy()
+        state['_arrays'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._initialized:
+            self._load(self._load_meta())
+
+    @with_initialize
+    def get_fingerprint(self):
+        # The fingerprint of the ontology the files were built from
+        return self._fingerprint
+
+    @staticmethod
+    def build(ontology, path):
+        """Save an initialized ontology in the compact format.
+
+        Parameters
+        ----------
+        ontology : indra.ontology.IndraOntology
+            An initialized IndraOntology instance.
+        path : str
+            The path to a folder in which the ontology files are saved.
+        """
+        logger.info('Building compact %s ontology at %s' % (ontology.name,
+                                                            path))
+        # The meta file is removed first and saved last so that an ontology
+        # that is only partially replaced is not loaded
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        index = AncestorIndex.build(ontology, path)
+        label_to_idx = {index.get_label(idx): idx
+                        for idx in range(len(index))}
+        num_nodes = len(label_to_idx)
+
+        # Edges by relation type in both directions
+        edges_by_type = {}
+        for source, target, rel_type in ontology.edges(data='type'):
+            if rel_type is None:
+                continue
+            if rel_type not in edges_by_type:
+                edges_by_type[rel_type] = ([], [])
+            edges_by_type[rel_type][0].append(label_to_idx[source])
+            edges_by_type[rel_type][1].append(label_to_idx[target])
+        for rel_type, (sources, targets) in edges_by_type.items():
+            sources = numpy.array(sources, dtype=numpy.int32)
+            targets = numpy.array(targets, dtype=numpy.int32)
+            arrays = (_get_csr_arrays(sources, targets, num_nodes) +
+                      _get_csr_arrays(targets, sources, num_nodes))
+            for part, array in zip(EDGE_ARRAYS, arrays):
+                _save_array(path, '%s_%s' % (rel_type, part), array)
+
+        # Node properties as JSON-encoded string columns
+        properties = {}
+        name_to_idx = {}
+        for label, data in ontology.nodes(data=True):
+            idx = label_to_idx[label]
+            for prop, value in data.items():
+                if prop not in properties:
+                    properties[prop] = [None] * num_nodes
+                properties[prop][idx] = json.dumps(value)
+            if 'name' in data:
+                name_key = '%s\0%s' % (ontology.get_ns(label), data['name'])
+                name_to_idx[name_key] = idx
+        for prop, values in properties.items():
+            _StringColumn.save(path, 'property_%s' % prop, values)
+
+        # A sorted name lookup table
+        name_keys = sorted(name_to_idx, key=lambda x: x.encode('utf-8'))
+        _StringColumn.save(path, 'name_keys', name_keys)
+        _save_array(path, 'name_idx',
+                    numpy.array([name_to_idx[key] for key in name_keys],
+                                dtype=numpy.int32))
+
+        _save_json(path, META_FILE,
+                   {'name': ontology.name, 'version': ontology.version,
+                    'fingerprint': ontology.get_fingerprint(),
+                    'rel_types': sorted(edges_by_type),
+                    'properties': sorted(properties)})
+
+    def _get_rel(self, ns, id, rel_types, direction):
+        idx = self.ancestor_index.get_idx(self.label(ns, id))
+        if idx is None:
+            return
+        edges = self._arrays['edges']
+        for rel_type in rel_types:
+            if rel_type not in edges:
+                continue
+            indptr, indices = edges[rel_type][2 * direction:
+                                              2 * direction + 2]
+            for other_idx in indices[indptr[idx]:indptr[idx + 1]]:
+                yield self.get_ns_id(self.ancestor_index.get_label(other_idx))
+
+    @with_initialize
+    def child_rel(self, ns, id, rel_types):
+        yield from self._get_rel(ns, id, rel_types, 0)
+
+    @with_initialize
+    def parent_rel(self, ns, id, rel_types):
+        yield from self._get_rel(ns, id, rel_types, 1)
+
+    @with_initialize
+    def get_node_property(self, ns, id, property):
+        column = self._arrays['properties'].get(property)
+        if column is None:
+            return None
+        idx = self.ancestor_index.get_idx(self.label(ns, id))
+        if idx is None:
+            return None
+        value = column[idx]
+        return json.loads(value) if value else None
+
+    @with_initialize
+    def get_id_from_name(self, ns, name):
+        pos = self._arrays['name_keys'].find(('%s\0%s' % (ns, name)).
+                                             encode('utf-8'))
+        if pos is None:
+            return None
+        idx = self._arrays['name_idx'][pos]
+        return self.get_ns_id(self.ancestor_index.get_label(idx))
+
+    @with_initialize
+    def nodes_from_suffix(self, suffix):
+        labels = (self.ancestor_index.get_label(idx)
+                  for idx in range(len(self.ancestor_index)))
+        return [label for label in labels if label.endswith(suffix)]
+
+
+class _StringColumn(object):
+    """A memory-mapped column of strings with missing values allowed."""
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx):
+        return self.data[self.offsets[idx]:self.offsets[idx + 1]].tobytes()
+
+    def find(self, value):
+        """Return the position of a value in a sorted column or None."""
+        pos = bisect.bisect_left(self, value)
+        if pos < len(self) and self[pos] == value:
+            return pos
+        return None
+
+    @classmethod
+    def load(cls, path, name):
+        return cls(_load_array(path, '%s_data' % name),
+                   _load_array(path, '%s_offsets' % name))
+
+    @staticmethod
+    def save(path, name, values):
+        # Missing values are represented as empty strings
+        encoded = [value.encode('utf-8') if value is not None else b''
+                   for value in values]
+        offsets = numpy.zeros(len(encoded) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(enc) for enc in encoded], out=offsets[1:])
+        _save_array(path, '%s_data' % name,
+                    numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8))
+        _save_array(path, '%s_offsets' % name, offsets)
+
+
+def _get_csr_arrays(sources, targets, num_nodes):
+    """Return indptr and indices arrays of an adjacency in CSR format."""
+    order = numpy.lexsort((targets, sources))
+    indices = targets[order]
+    counts = numpy.bincount(sources, minlength=num_nodes)
+    indptr = numpy.zeros(num_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+
+META_FILE = 'compact_meta.json'
+EDGE_ARRAYS = ['out_indptr', 'out_indices', 'in_indptr', 'in_indices']
@@ -35,6 +35,7 @@ class IndraOntology(networkx.DiGraph):
         self._initialized = False
         self.name_to_grounding = {}
         self.transitive_closure = set()
+        self.ancestor_index = None
         self._isa_counter = 0
         self._isrel_counter = 0
 
@@ -140,6 +141,10 @@ class IndraOntology(networkx.DiGraph):
             Otherwise False.
         """
         self._isrel_counter += 1
+        if self.ancestor_index is not None and \
+                self.ancestor_index.supports(rels):
+            return self.ancestor_index.isrel(self.label(ns1, id1),
+                                             self.label(ns2, id2), rels)
         return self._check_path(ns1, id1, ns2, id2, rels)
 
     @with_initialize
@@ -382,8 +387,14 @@ class IndraOntology(networkx.DiGraph):
         -------
         list
             A list of entities (name space, ID pairs) that are the
-            parents of the given entity.
+            parents of the given entity. If the ontology has an ancestor
+            index, the parents are sorted by their labels, otherwise their
+            order is not defined.
         """
+        if self.ancestor_index is not None:
+            return [self.get_ns_id(label) for label in
+                    self.ancestor_index.get_ancestors(self.label(ns, id),
+                                                      {'isa', 'partof'})]
         return self.descendants_rel(ns, id, {'isa', 'partof'})
 
     @with_initialize
@@ -619,6 +630,34 @@ class IndraOntology(networkx.DiGraph):
         """
         return tuple(label.split(':', maxsplit=1))
 
+    def _build_ancestor_index(self, path):
+        from .ancestor_index import AncestorIndex
+        self.ancestor_index = AncestorIndex.build(self, path)
+
+    def _load_ancestor_index(self, path):
+        from .ancestor_index import AncestorIndex
+        self.ancestor_index = AncestorIndex.load(
+            path, fingerprint=self.get_fingerprint())
+        return self.ancestor_index is not None
+
+    @with_initialize
+    def get_fingerprint(self):
+        """Return a fingerprint identifying the content of the ontology.
+
+        Files derived from the ontology (e.g., its ancestor index) are saved
+        with the fingerprint, and are only used for an ontology with the
+        same fingerprint.
+
+        Returns
+        -------
+        dict
+            The name and version of the ontology along with its number of
+            nodes and edges.
+        """
+        return {'name': self.name, 'version': self.version,
+                'num_nodes': self.number_of_nodes(),
+                'num_edges': self.number_of_edges()}
+
     def _build_transitive_closure(self):
         if self.transitive_closure:
             return
@@ -1,2 +1,5 @@
 from .pipeline import AssemblyPipeline, RunnableArgument
-from .decorators import register_pipeline, pipeline_functions
+from .profiler import StepProfiler
+from .parallel import run_parallel
+from .decorators import register_pipeline, pipeline_functions, streamable, \
+    stream_functions
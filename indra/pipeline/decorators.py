@@ -1,4 +1,5 @@
 pipeline_functions = {}
+stream_functions = {}
 
 
 def register_pipeline(function):
@@ -11,5 +12,33 @@ def register_pipeline(function):
     return function
 
 
+def streamable(get_stmt_function, kind='filter'):
+    """Decorator to declare a pipeline function as streamable.
+
+    A streamable function processes each Statement independently of the
+    other Statements, i.e., it is either a filter or a map over Statements.
+    When an AssemblyPipeline is run in streaming mode, consecutive
+    streamable steps are fused into a single pass over the Statements.
+
+    Parameters
+    ----------
+    get_stmt_function : function
+        A function taking the same arguments as the decorated function
+        (except for the Statements) and returning a function that is applied
+        to each Statement. For filters, this function returns True if the
+        Statement should be kept, for maps, it returns a new Statement, or
+        None if the Statement should be dropped.
+    kind : Optional[str]
+        Either 'filter' or 'map'. Default: 'filter'
+    """
+    if kind not in ('filter', 'map'):
+        raise ValueError('Invalid streamable kind: %s' % kind)
+
+    def decorator(function):
+        stream_functions[function.__name__] = (kind, get_stmt_function)
+        return function
+    return decorator
+
+
 class ExistingFunctionError(Exception):
     pass
@@ -0,0 +1,188 @@
+"""Running streamable pipeline functions on Statements in parallel.
+
+Pipeline functions declared with the
+:py:func:`indra.pipeline.decorators.streamable` decorator process each
+Statement independently. The functions here apply a chain of such functions
+to contiguous shards of a list of Statements in a pool of processes, and
+merge the results back in the order of the input Statements. Each worker
+process sets up the per-statement functions (e.g., the GroundingMapper used
+by `map_grounding`) once and applies them to all the shards it receives.
+"""
+__all__ = ['run_parallel', 'map_stmts_parallel']
+
+import gc
+import pickle
+import logging
+import multiprocessing as mp
+from .decorators import stream_functions
+
+
+logger = logging.getLogger(__name__)
+
+
+def run_parallel(func, stmts_in, *args, n_jobs=None, **kwargs):
+    """Run a streamable pipeline function on Statements in parallel.
+
+    Parameters
+    ----------
+    func : str or function
+        A pipeline function or the name of a pipeline function which was
+        declared streamable, e.g., `map_grounding`.
+    stmts_in : list[indra.statements.Statement]
+        A list of Statements to run the function on.
+    n_jobs : Optional[int]
+        The number of processes to use. By default, the number of CPUs is
+        used.
+    args : args
+        Args that are passed to the function.
+    kwargs : kwargs
+        Kwargs that are passed to the function.
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The Statements returned by the function, in the order of the input
+        Statements.
+    """
+    func_name = func if isinstance(func, str) else func.__name__
+    if func_name not in stream_functions:
+        raise ValueError('%s is not declared streamable.' % func_name)
+    kind, get_stmt_function = stream_functions[func_name]
+    return map_stmts_parallel(stmts_in,
+                              [(kind, get_stmt_function, args, kwargs)],
+                              n_jobs=n_jobs)
+
+
+def map_stmts_parallel(stmts, stmt_function_specs, n_jobs=None):
+    """Apply a chain of per-statement functions to Statements in parallel.
+
+    Statements are sent to and from the worker processes by pickling, so the
+    returned Statements are copies even if they were only filtered. Since
+    the supports and supported_by links between Statements would be broken
+    this way, Statements with such links are processed in the current
+    process. Functions using a cache (i.e., with a use_cache kwarg set to
+    True, as in `map_sequence`) are also applied in the current process,
+    since the caches extended by the worker processes would not be saved.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statements.Statement]
+        The Statements to process.
+    stmt_function_specs : list[tuple]
+        A list of (kind, get_stmt_function, args, kwargs) tuples, where kind
+        and get_stmt_function are as declared with the @streamable
+        decorator, and args and kwargs are passed to get_stmt_function to
+        obtain the per-statement function.
+    n_jobs : Optional[int]
+        The number of processes to use. By default, the number of CPUs is
+        used.
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The processed Statements in the order of the input Statements.
+    """
+    stmts = list(stmts)
+    if n_jobs is None:
+        n_jobs = mp.cpu_count()
+    if n_jobs > 1 and any(stmt.supports or stmt.supported_by
+                          for stmt in stmts):
+        logger.info('Statements have supports, processing them in a single '
+                    'process.')
+        n_jobs = 1
+    if n_jobs > 1 and any(kwargs.get('use_cache')
+                          for _, _, _, kwargs in stmt_function_specs):
+        logger.warning('Functions use a cache, processing statements in a '
+                       'single process so that the cache is saved.')
+        n_jobs = 1
+    if n_jobs <= 1 or len(stmts) < 2:
+        return list(stream_stmts(stmts, _get_stmt_functions(
+            stmt_function_specs)))
+
+    # We aim for a few shards per worker so that the load is balanced.
+    # Shards are pickled explicitly so that the garbage collector can be
+    # disabled while they are unpickled.
+    shard_size = max(1, len(stmts) // (4 * n_jobs))
+    shards = [pickle.dumps(stmts[idx:idx + shard_size],
+                           protocol=pickle.HIGHEST_PROTOCOL)
+              for idx in range(0, len(stmts), shard_size)]
+    logger.info('Processing %d statements in %d shards using %d processes' %
+                (len(stmts), len(shards), n_jobs))
+    global _worker_stmt_functions
+    if 'fork' in mp.get_all_start_methods():
+        # With forking, workers inherit the per-statement functions set up
+        # here without any pickling
+        _worker_stmt_functions = _get_stmt_functions(stmt_function_specs)
+        ctx = mp.get_context('fork')
+        pool_kwargs = {}
+    else:
+        ctx = mp.get_context()
+        pool_kwargs = {'initializer': _init_worker,
+                       'initargs': (stmt_function_specs,)}
+    stmts_out = []
+    try:
+        with ctx.Pool(n_jobs, **pool_kwargs) as pool:
+            for shard_out in pool.imap(_process_shard, shards):
+                stmts_out += _loads(shard_out)
+    finally:
+        _worker_stmt_functions = None
+    return stmts_out
+
+
+def stream_stmts(stmts, stmt_functions):
+    """Apply a chain of per-statement filters and maps in a single pass.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statements.Statement]
+        The Statements to process.
+    stmt_functions : list[tuple]
+        A list of (kind, stmt_function) tuples where kind is 'filter' or
+        'map'.
+
+    Yields
+    ------
+    indra.statements.Statement
+        The Statements that were kept, after applying the maps.
+    """
+    for stmt in stmts:
+        for kind, stmt_function in stmt_functions:
+            if kind == 'map':
+                stmt = stmt_function(stmt)
+                if stmt is None:
+                    break
+            elif not stmt_function(stmt):
+                break
+        else:
+            yield stmt
+
+
+def _get_stmt_functions(stmt_function_specs):
+    return [(kind, get_stmt_function(*args, **kwargs))
+            for kind, get_stmt_function, args, kwargs
+            in stmt_function_specs]
+
+
+_worker_stmt_functions = None
+
+
+def _init_worker(stmt_function_specs):
+    global _worker_stmt_functions
+    _worker_stmt_functions = _get_stmt_functions(stmt_function_specs)
+
+
+def _process_shard(shard):
+    shard_out = list(stream_stmts(_loads(shard), _worker_stmt_functions))
+    return pickle.dumps(shard_out, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _loads(data):
+    # Unpickling creates many objects at once, the garbage collector is
+    # disabled meanwhile since it would otherwise run repeatedly in vain.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return pickle.loads(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
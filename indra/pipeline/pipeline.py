@@ -1,8 +1,14 @@
+import os
+import gc
 import json
+import pickle
+import hashlib
 import logging
 import inspect
 
-from .decorators import pipeline_functions, register_pipeline
+from .decorators import pipeline_functions, register_pipeline, \
+    stream_functions
+from .parallel import map_stmts_parallel, stream_stmts, _get_stmt_functions
 from indra.statements import get_statement_by_name, Statement
 
 
@@ -107,13 +113,45 @@ class AssemblyPipeline():
         with open(filename, 'w') as f:
             json.dump(self.steps, f, indent=1)
 
-    def run(self, statements, **kwargs):
+    def run(self, statements, stream=False, cache_dir=None, profiler=None,
+            n_jobs=None, **kwargs):
         """Run all steps of the pipeline.
 
         Parameters
         ----------
         statements : list[indra.statements.Statement]
-            A list of INDRA Statements to run the pipeline on.
+            A list of INDRA Statements to run the pipeline on. In streaming
+            mode, this can be any iterable of Statements, e.g., a generator.
+        stream : Optional[bool]
+            If True, consecutive steps whose functions are declared with the
+            @streamable decorator are fused into a single pass over the
+            Statements, without creating intermediate lists. Other steps
+            receive a list of Statements, which is only materialized at their
+            boundary. Streamable steps with a `save` kwarg are also run on a
+            list. Default: False
+        cache_dir : Optional[str]
+            The path to a folder in which the result of each step is cached.
+            Results are keyed by a fingerprint of the input Statements
+            and the functions and arguments of the steps up to and including
+            the given step, as well as the kwargs provided to the entire
+            pipeline. Objects without a JSON representation are keyed by
+            their repr. When the pipeline is run again, the steps with
+            cached results are skipped and the pipeline resumes after the
+            last step with a cached result. Caching can't be combined with
+            streaming.
+        profiler : Optional[indra.pipeline.profiler.StepProfiler]
+            If given, the resources used by each step that is run are
+            recorded by the profiler. In streaming mode, only the steps
+            receiving a list of Statements are recorded, and the fused
+            steps before them are included in their records.
+        n_jobs : Optional[int]
+            If given, steps whose functions are declared with the
+            @streamable decorator are run in this many processes on shards
+            of the Statements (see
+            :py:func:`indra.pipeline.parallel.map_stmts_parallel`), while
+            other steps, such as preassembly, are run in the current
+            process. In streaming mode, consecutive streamable steps are run
+            together in the worker processes. Default: None
         **kwargs : kwargs
             It is recommended to define all arguments for the steps functions
             in the steps definition, but it is also possible to provide some
@@ -131,10 +169,101 @@ class AssemblyPipeline():
             on the list of input Statements.
         """
         logger.info('Running the pipeline')
+        if cache_dir:
+            if stream:
+                raise ValueError('Caching can\'t be combined with streaming.')
+            return self._run_cached(statements, cache_dir, profiler, n_jobs,
+                                    **kwargs)
+        if stream:
+            return self._run_stream(statements, profiler, n_jobs, **kwargs)
         for step in self.steps:
-            statements = self.run_function(step, statements, **kwargs)
+            statements = self._run_step(step, statements, profiler, n_jobs,
+                                        **kwargs)
         return statements
 
+    def _run_step(self, step, statements, profiler, n_jobs, **kwargs):
+        spec = self._get_stmt_function_spec(step, **kwargs) \
+            if n_jobs is not None else None
+        if spec is not None:
+            logger.info('Calling %s in parallel' % step['function'])
+            run = lambda stmts: map_stmts_parallel(stmts, [spec], n_jobs)
+        else:
+            run = lambda stmts: self.run_function(step, stmts, **kwargs)
+        if profiler is None:
+            return run(statements)
+        return profiler.run_step(step['function'], run, statements)
+
+    def _get_stmt_function_spec(self, step, **kwargs):
+        """Return the per-statement function spec of a streamable step."""
+        func_name, func_args, func_kwargs = self.get_function_parameters(step)
+        if func_name not in stream_functions or 'save' in func_kwargs:
+            return None
+        kind, get_stmt_function = stream_functions[func_name]
+        new_args, new_kwargs = self.get_function_arguments(
+            self.get_function_from_name(func_name), func_args, func_kwargs,
+            **kwargs)
+        return kind, get_stmt_function, new_args, new_kwargs
+
+    def _run_cached(self, statements, cache_dir, profiler, n_jobs,
+                    **kwargs):
+        os.makedirs(cache_dir, exist_ok=True)
+        # The key of each step is chained with the key of the previous step
+        # so that it depends on all the steps before it. The kwargs of the
+        # pipeline are part of the first key since they can be passed to any
+        # of the steps.
+        cache_files = []
+        key = hashlib.sha256(
+            (_get_stmts_fingerprint(statements) +
+             json.dumps(kwargs, sort_keys=True, default=repr)).
+            encode('utf-8')).hexdigest()
+        for step in self.steps:
+            key = hashlib.sha256(
+                (key + json.dumps(step, sort_keys=True, default=repr)).
+                encode('utf-8')).hexdigest()
+            cache_files.append(os.path.join(cache_dir, '%s.pkl' % key))
+        start = 0
+        for idx in reversed(range(len(self.steps))):
+            if os.path.exists(cache_files[idx]):
+                logger.info('Loading cached result of step %d (%s) from %s'
+                            % (idx, self.steps[idx]['function'],
+                               cache_files[idx]))
+                statements = _load_cached(cache_files[idx])
+                start = idx + 1
+                break
+        for idx in range(start, len(self.steps)):
+            statements = self._run_step(self.steps[idx], statements,
+                                        profiler, n_jobs, **kwargs)
+            _dump_cached(statements, cache_files[idx])
+        return statements
+
+    def _run_stream(self, statements, profiler, n_jobs, **kwargs):
+        specs = []
+        for step in self.steps:
+            spec = self._get_stmt_function_spec(step, **kwargs)
+            if spec is not None:
+                logger.info('Streaming %s' % step['function'])
+                specs.append(spec)
+                continue
+            # This is a barrier step which needs all the Statements
+            if specs:
+                statements = self._stream_stmts(statements, specs, n_jobs)
+                specs = []
+            if not isinstance(statements, list):
+                statements = list(statements)
+            statements = self._run_step(step, statements, profiler, None,
+                                        **kwargs)
+        if specs:
+            statements = self._stream_stmts(statements, specs, n_jobs)
+        if not isinstance(statements, list):
+            statements = list(statements)
+        return statements
+
+    @staticmethod
+    def _stream_stmts(statements, specs, n_jobs):
+        if n_jobs is not None:
+            return map_stmts_parallel(statements, specs, n_jobs)
+        return stream_stmts(statements, _get_stmt_functions(specs))
+
     def append(self, func, *args, **kwargs):
         """Append a step to the end of the pipeline.
 
@@ -309,6 +438,32 @@ class AssemblyPipeline():
             func_dict)
         func = self.get_function_from_name(func_name)
         logger.info('Calling %s' % func_name)
+        new_args, new_kwargs = self.get_function_arguments(
+            func, func_args, func_kwargs, **kwargs)
+        if statements is not None:
+            new_kwargs['statements'] = statements
+        return self.run_simple_function(func, *new_args, **new_kwargs)
+
+    def get_function_arguments(self, func, func_args, func_kwargs, **kwargs):
+        """Return the values of the args and kwargs of a function.
+
+        Parameters
+        ----------
+        func : function
+            The function whose arguments are obtained.
+        func_args : list
+            The JSON representation of the args of the function.
+        func_kwargs : dict
+            The JSON representation of the kwargs of the function.
+        kwargs : kwargs
+            Kwargs provided to the entire pipeline, these are added if the
+            function expects an argument with the same name.
+
+        Returns
+        -------
+        tuple of list and dict
+            The values of the args and kwargs of the function.
+        """
         new_args = []
         new_kwargs = {}
         for arg in func_args:
@@ -317,13 +472,12 @@ class AssemblyPipeline():
         for k, v in func_kwargs.items():
             kwarg_value = self.get_argument_value(v)
             new_kwargs[k] = kwarg_value
-        if statements is not None:
-            new_kwargs['statements'] = statements
         if kwargs:
+            func_arg_names = inspect.getfullargspec(func).args
             for k, v in kwargs.items():
-                if k not in new_kwargs and k in inspect.getargspec(func).args:
+                if k not in new_kwargs and k in func_arg_names:
                     new_kwargs[k] = v
-        return self.run_simple_function(func, *new_args, **new_kwargs)
+        return new_args, new_kwargs
 
     @staticmethod
     def is_function(argument, keyword='function'):
@@ -369,6 +523,43 @@ class AssemblyPipeline():
         return iter(self.steps)
 
 
+def _load_cached(fname):
+    # Unpickling creates many objects at once, the garbage collector is
+    # disabled meanwhile since it would otherwise run repeatedly in vain.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(fname, 'rb') as fh:
+            return pickle.load(fh)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _dump_cached(obj, fname):
+    # We write into a temporary file first so that interrupted runs don't
+    # leave partial results in the cache
+    tmp_fname = fname + '.tmp'
+    with open(tmp_fname, 'wb') as fh:
+        pickle.dump(obj, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_fname, fname)
+
+
+def _get_stmts_fingerprint(stmts):
+    """Return a fingerprint of the content of a list of Statements.
+
+    The fingerprint is based on the JSON serialization of the Statements
+    so that it covers all the information that steps can depend on, e.g.,
+    beliefs, supports, and the names and db_refs of Agents.
+    """
+    fingerprint = hashlib.sha256()
+    for stmt in stmts:
+        fingerprint.update(json.dumps(stmt.to_json(), sort_keys=True).
+                           encode('utf-8'))
+        fingerprint.update(b'\n')
+    return fingerprint.hexdigest()
+
+
 class NotRegisteredFunctionError(Exception):
     pass
 
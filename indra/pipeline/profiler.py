@@ -0,0 +1,162 @@
+"""Instrumentation of the steps of an assembly pipeline.
+
+A :py:class:`StepProfiler` can be passed to
+:py:meth:`indra.pipeline.AssemblyPipeline.run` to record the resources used
+by each step of the pipeline. The records can then be obtained as a JSON
+report, e.g., to compare the resources used by different versions of a
+pipeline.
+"""
+__all__ = ['StepProfiler']
+
+import json
+import time
+import logging
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows
+    resource = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class StepProfiler(object):
+    """Records the time, memory and work done by each step of a pipeline.
+
+    For each step, the following are recorded: the wall and CPU time, the
+    increase of the peak resident set size of the process (in kilobytes),
+    the number of input and output Statements and their evidence, the number
+    of isa and isrel calls made to ontologies and the number of refinement
+    comparisons made by Preassemblers. Note that the ontology calls made in
+    subprocesses, e.g., when preassembly is parallelized, are not counted.
+
+    Parameters
+    ----------
+    ontologies : Optional[list[indra.ontology.IndraOntology]]
+        The ontologies whose calls are counted. By default, the calls of the
+        bio and world ontologies are counted.
+    hook : Optional[function]
+        A function which is called with the name of each step's function and
+        returns a context manager which is entered while the step runs. This
+        can be used to run a (sampling) profiler on each step, e.g.,
+        `lambda name: cProfile.Profile()`.
+
+    Attributes
+    ----------
+    records : list[dict]
+        A record of the resources used by each step in the order in which the
+        steps were run.
+    """
+    def __init__(self, ontologies=None, hook=None):
+        if ontologies is None:
+            from indra.ontology.bio import bio_ontology
+            from indra.ontology.world import world_ontology
+            ontologies = [bio_ontology, world_ontology]
+        self.ontologies = ontologies
+        self.hook = hook
+        self.records = []
+
+    def run_step(self, func_name, run, statements):
+        """Run a step of a pipeline and record the resources it uses.
+
+        Parameters
+        ----------
+        func_name : str
+            The name of the function of the step.
+        run : function
+            A function which takes the input Statements and runs the step
+            on them.
+        statements : list[indra.statements.Statement]
+            The input Statements of the step.
+
+        Returns
+        -------
+        object
+            The value returned by the step, typically a list of Statements.
+        """
+        from indra.preassembler import Preassembler
+        record = {'step': len(self.records), 'function': func_name}
+        record['stmts_in'], record['evidence_in'] = _get_counts(statements)
+        counters = self._get_ontology_counters()
+        comparisons = Preassembler._total_comparison_counter
+        max_rss = _get_max_rss()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        if self.hook is not None:
+            with self.hook(func_name):
+                result = run(statements)
+        else:
+            result = run(statements)
+        record['wall_time'] = time.perf_counter() - start_wall
+        record['cpu_time'] = time.process_time() - start_cpu
+        record['max_rss_delta'] = _get_max_rss() - max_rss \
+            if max_rss is not None else None
+        record['stmts_out'], record['evidence_out'] = _get_counts(result)
+        for key, value in self._get_ontology_counters().items():
+            record[key] = value - counters[key]
+        record['comparisons'] = \
+            Preassembler._total_comparison_counter - comparisons
+        logger.info('%s took %.2fs (%.2fs CPU), %s -> %s statements' %
+                    (func_name, record['wall_time'], record['cpu_time'],
+                     record['stmts_in'], record['stmts_out']))
+        self.records.append(record)
+        return result
+
+    def _get_ontology_counters(self):
+        return {'isa_calls': sum(getattr(ontology, '_isa_counter', 0)
+                                 for ontology in self.ontologies),
+                'isrel_calls': sum(getattr(ontology, '_isrel_counter', 0)
+                                   for ontology in self.ontologies)}
+
+    def get_report(self):
+        """Return a report of the resources used by the steps.
+
+        Returns
+        -------
+        dict
+            A JSON-serializable report with the records of the steps and
+            their totals.
+        """
+        totals = {key: 0 for key in TOTAL_KEYS}
+        for record in self.records:
+            for key in TOTAL_KEYS:
+                if record[key] is None:
+                    totals[key] = None
+                elif totals[key] is not None:
+                    totals[key] += record[key]
+        return {'steps': self.records, 'totals': totals}
+
+    def to_json_file(self, filename):
+        """Save the report of the resources used by the steps to a JSON file.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the JSON file to save the report into.
+        """
+        with open(filename, 'w') as fh:
+            json.dump(self.get_report(), fh, indent=1)
+
+
+def _get_counts(statements):
+    """Return the number of Statements and evidence in a step's input/output.
+    """
+    if not isinstance(statements, list):
+        return None, None
+    try:
+        return len(statements), sum(len(stmt.evidence)
+                                    for stmt in statements)
+    except AttributeError:
+        return len(statements), None
+
+
+def _get_max_rss():
+    # This is in kilobytes on Linux
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+TOTAL_KEYS = ['wall_time', 'cpu_time', 'max_rss_delta', 'isa_calls',
+              'isrel_calls', 'comparisons']
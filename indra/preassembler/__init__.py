@@ -1,8 +1,12 @@
+import os
+import json
 import time
 import logging
+import tempfile
 import itertools
 import functools
 import collections
+import numpy
 import networkx as nx
 from indra.util import fast_deepcopy
 from indra.statements import *
@@ -46,12 +50,16 @@ class Preassembler(object):
     ontology : dict[:py:class:`indra.preassembler.ontology_graph.IndraOntology`]
         An INDRA Ontology object.
     """
+    # The number of comparisons made by all Preassembler instances, e.g.,
+    # for profiling assembly pipelines
+    _total_comparison_counter = 0
+
     def __init__(self, ontology, stmts=None, matches_fun=None,
                  refinement_fun=None, refinement_ns=None):
         self.ontology = ontology
         if stmts:
-            logger.debug("Deepcopying stmts in __init__")
-            self.stmts = fast_deepcopy(stmts)
+            logger.debug("Copying stmts in __init__")
+            self.stmts = copy_stmts(stmts)
         else:
             self.stmts = []
         self.unique_stmts = None
@@ -62,6 +70,13 @@ class Preassembler(object):
             default_refinement_fun
         self.refinement_ns = refinement_ns
         self._comparison_counter = 0
+        # An index of unique_stmts to find possible refinements of
+        # statements added by add_and_assemble, built on first use
+        self._refinement_index = None
+
+    def _add_comparisons(self, n_comparisons):
+        self._comparison_counter += n_comparisons
+        Preassembler._total_comparison_counter += n_comparisons
 
     def add_statements(self, stmts):
         """Add to the current list of statements.
@@ -71,7 +86,7 @@ class Preassembler(object):
         stmts : list of :py:class:`indra.statements.Statement`
             Statements to add to the current list.
         """
-        self.stmts += fast_deepcopy(stmts)
+        self.stmts += copy_stmts(stmts)
 
     def combine_duplicates(self):
         """Combine duplicates among `stmts` and save result in `unique_stmts`.
@@ -97,6 +112,7 @@ class Preassembler(object):
 
         return itertools.groupby(st, key=self.matches_fun)
 
+    @matches_key_cache()
     def combine_duplicate_stmts(self, stmts):
         """Combine evidence from duplicate Statements.
 
@@ -163,8 +179,7 @@ class Preassembler(object):
                 raw_grounding = [None if ag is None else ag.db_refs
                                  for ag in stmt.agent_list(deep_sorted=True)]
                 for ev in stmt.evidence:
-                    ev_key = ev.matches_key() + str(raw_text) + \
-                        str(raw_grounding)
+                    ev_key = _get_ev_key(ev, raw_text, raw_grounding)
                     if ev_key not in ev_keys:
                         # In case there are already agents annotations, we
                         # just add a new key for raw_text, otherwise create
@@ -197,9 +212,98 @@ class Preassembler(object):
                               matches_fun=self.matches_fun)
         return unique_stmts
 
-    # Note that the kwargs here are just there for backwards compatibility
-    # with old code that uses arguments related to multiprocessing.
-    def combine_related(self, return_toplevel=True, filters=None, **kwargs):
+    def iter_combine_duplicate_stmts(self, stmts, num_buckets=256,
+                                     tmp_dir=None):
+        """Combine evidence from duplicate Statements in a streaming fashion.
+
+        This is an alternative to :py:meth:`combine_duplicate_stmts` for
+        statement corpora that don't fit into memory. The statements are
+        first written into buckets on disk based on their shallow hash
+        so that duplicates always end up in the same bucket. Buckets are
+        then loaded and de-duplicated one by one, and the resulting
+        unique statements, with the same evidence annotations as produced
+        by :py:meth:`combine_duplicate_stmts`, are yielded. Note that the
+        order of the unique statements differs from that of
+        :py:meth:`combine_duplicate_stmts`.
+
+        Parameters
+        ----------
+        stmts : iterable of :py:class:`indra.statements.Statement` or str
+            An iterable (e.g., a generator) of statements to de-duplicate,
+            or the path to a JSONL file with one statement per line.
+        num_buckets : Optional[int]
+            The number of buckets the statements are split into. Only one
+            bucket is loaded into memory at a time so the number of buckets
+            should be chosen such that the statements in a bucket fit into
+            memory. Default: 256
+        tmp_dir : Optional[str]
+            The folder in which the temporary bucket files are created.
+            If not given, the system default temporary folder is used.
+
+        Yields
+        ------
+        :py:class:`indra.statements.Statement`
+            Unique statements with accumulated evidence across duplicates.
+        """
+        if isinstance(stmts, str):
+            stmts = iter_stmts_from_jsonl(stmts)
+        with tempfile.TemporaryDirectory(dir=tmp_dir) as bucket_dir:
+            bucket_fnames = [os.path.join(bucket_dir, 'bucket_%d.jsonl' % idx)
+                             for idx in range(num_buckets)]
+            bucket_fhs = [open(fname, 'w', encoding='utf-8')
+                          for fname in bucket_fnames]
+            num_stmts = 0
+            try:
+                for stmt in stmts:
+                    stmt_hash = stmt.get_hash(matches_fun=self.matches_fun)
+                    bucket_fhs[stmt_hash % num_buckets].write(
+                        json.dumps(stmt.to_json(matches_fun=self.matches_fun))
+                        + '\n')
+                    num_stmts += 1
+            finally:
+                for fh in bucket_fhs:
+                    fh.close()
+            logger.info('Combining duplicates among %d statements in %d '
+                        'buckets' % (num_stmts, num_buckets))
+            for fname in bucket_fnames:
+                bucket_stmts = list(iter_stmts_from_jsonl(fname))
+                os.remove(fname)
+                yield from self.combine_duplicate_stmts(bucket_stmts)
+
+    def combine_duplicate_stmts_to_jsonl(self, stmts, fname, **kwargs):
+        """Combine evidence from duplicate Statements into a JSONL file.
+
+        A wrapper around the method :py:meth:`iter_combine_duplicate_stmts`
+        which writes the unique statements into a file, one per line.
+
+        Parameters
+        ----------
+        stmts : iterable of :py:class:`indra.statements.Statement` or str
+            An iterable (e.g., a generator) of statements to de-duplicate,
+            or the path to a JSONL file with one statement per line.
+        fname : str
+            The path to the JSONL file into which the unique statements
+            are written.
+        **kwargs
+            Keyword arguments passed to
+            :py:meth:`iter_combine_duplicate_stmts`.
+
+        Returns
+        -------
+        int
+            The number of unique statements written.
+        """
+        num_unique = 0
+        with open(fname, 'w', encoding='utf-8') as fh:
+            for stmt in self.iter_combine_duplicate_stmts(stmts, **kwargs):
+                fh.write(json.dumps(stmt.to_json(matches_fun=self.matches_fun))
+                         + '\n')
+                num_unique += 1
+        return num_unique
+
+    @matches_key_cache()
+    def combine_related(self, return_toplevel=True, filters=None,
+                        poolsize=None, size_cutoff=None, **kwargs):
         """Connect related statements based on their refinement relationships.
 
         This function takes as a starting point the unique statements (with
@@ -263,6 +367,15 @@ class Preassembler(object):
             automatically appended to the list of filters. In this case,
             consider adding the `ontology_refinement_filter` function from this
             module to the filters list.
+        poolsize : Optional[int]
+            The number of worker processes to use to confirm possible
+            refinements. If None (default) or 1, all comparisons are done
+            in the current process.
+        size_cutoff : Optional[int]
+            Statement types with fewer than size_cutoff candidate
+            comparisons are compared in the parent process, while larger
+            ones are sharded across worker processes. Only relevant
+            if poolsize is given. Default: 100
 
         Returns
         -------
@@ -306,7 +419,9 @@ class Preassembler(object):
 
         # Generate the index map, linking related statements.
         idx_map = self._generate_id_maps(unique_stmts,
-                                         filters=filters)
+                                         filters=filters,
+                                         poolsize=poolsize,
+                                         size_cutoff=size_cutoff)
 
         # Now iterate over all indices and set supports/supported by
         for ix1, ix2 in idx_map:
@@ -320,10 +435,180 @@ class Preassembler(object):
         else:
             return unique_stmts
 
-    # Note that the kwargs here are just there for backwards compatibility
-    # with old code that uses arguments related to multiprocessing.
+    @matches_key_cache()
+    def add_and_assemble(self, stmts, return_toplevel=True, filters=None,
+                         belief_engine=None, poolsize=None, size_cutoff=None):
+        """Add new statements to an already assembled set of statements.
+
+        New statements are first de-duplicated among themselves and then
+        merged into existing unique statements with the same matches key
+        hash. The remaining, genuinely new, unique statements are then
+        checked for refinements with respect to the existing unique
+        statements and with respect to each other, but existing
+        statements are not compared with each other again. This way the
+        cost of an update is proportional to the number of new statements
+        rather than the size of the already assembled corpus.
+
+        If the existing statements haven't been assembled yet,
+        :py:meth:`combine_related` is called on them first.
+
+        Parameters
+        ----------
+        stmts : list of :py:class:`indra.statements.Statement`
+            New statements to add and assemble.
+        return_toplevel : Optional[bool]
+            If True only the top level statements are returned.
+            If False, all statements are returned. Default: True
+        filters : Optional[list[function]]
+            A list of function handles that define filter functions on
+            possible statement refinements. See :py:meth:`combine_related`
+            for more details. If not provided, the possible refinements
+            of new statements are looked up in an ontology-based index of
+            the existing unique statements that is kept across updates,
+            otherwise, the filters are applied to all unique statements.
+        belief_engine : Optional[indra.belief.BeliefEngine]
+            If provided, the beliefs of statements that are affected by
+            the update (i.e., new statements, existing statements that got
+            new evidence, and all the statements these support directly
+            or indirectly) are recalculated. The beliefs of other
+            statements are left unchanged.
+        poolsize : Optional[int]
+            The number of worker processes to use to confirm possible
+            refinements. If None (default), no parallelization is performed.
+        size_cutoff : Optional[int]
+            Statement types with fewer than size_cutoff candidate
+            comparisons are compared in the parent process. Default: 100
+
+        Returns
+        -------
+        list of :py:class:`indra.statement.Statement`
+            The top-level statements after the update, or all unique
+            statements if return_toplevel is False. The attributes
+            :py:attr:`unique_stmts` and :py:attr:`related_stmts` are
+            updated accordingly.
+        """
+        if self.related_stmts is None:
+            self.combine_related(return_toplevel=False, filters=filters,
+                                 poolsize=poolsize, size_cutoff=size_cutoff)
+        new_stmts = copy_stmts(stmts)
+        self.stmts += new_stmts
+        new_unique_stmts = self.combine_duplicate_stmts(new_stmts)
+
+        # Merge the evidence of new statements into existing ones if they
+        # are duplicates, and otherwise collect them as newly added
+        existing_by_hash = {stmt.get_hash(matches_fun=self.matches_fun): stmt
+                            for stmt in self.unique_stmts}
+        added_stmts = []
+        affected_stmts = []
+        for stmt in new_unique_stmts:
+            stmt_hash = stmt.get_hash(matches_fun=self.matches_fun)
+            existing_stmt = existing_by_hash.get(stmt_hash)
+            if existing_stmt is None:
+                added_stmts.append(stmt)
+                affected_stmts.append(stmt)
+                continue
+            # The evidences here were already annotated by
+            # combine_duplicate_stmts so we compare them irrespective of
+            # which raw statement they came from, and for duplicates, we
+            # keep track of the raw statements on the existing evidence
+            existing_evs = {_get_annotated_ev_key(ev): ev
+                            for ev in existing_stmt.evidence}
+            for ev in stmt.evidence:
+                ev_key = _get_annotated_ev_key(ev)
+                existing_ev = existing_evs.get(ev_key)
+                if existing_ev is None:
+                    existing_stmt.evidence.append(ev)
+                    existing_evs[ev_key] = ev
+                    continue
+                prior_uuids = \
+                    existing_ev.annotations.setdefault('prior_uuids', [])
+                for uuid in ev.annotations.get('prior_uuids', []):
+                    if uuid not in prior_uuids:
+                        prior_uuids.append(uuid)
+            existing_stmt.get_hash(shallow=False, refresh=True,
+                                   matches_fun=self.matches_fun)
+            affected_stmts.append(existing_stmt)
+        logger.info('%d new unique statements and %d statements merged into '
+                    'existing ones' % (len(added_stmts),
+                                       len(new_unique_stmts) -
+                                       len(added_stmts)))
+
+        # Find refinements between new and existing statements and among
+        # new statements, but not among existing statements
+        if added_stmts:
+            unique_stmts = self.unique_stmts + added_stmts
+            if filters:
+                num_existing = len(self.unique_stmts)
+                idx_map = self._generate_id_maps(unique_stmts,
+                                                 split_idx=num_existing - 1,
+                                                 filters=filters,
+                                                 poolsize=poolsize,
+                                                 size_cutoff=size_cutoff)
+                idx_map += [(ix1 + num_existing, ix2 + num_existing)
+                            for ix1, ix2 in
+                            self._generate_id_maps(added_stmts,
+                                                   filters=filters,
+                                                   poolsize=poolsize,
+                                                   size_cutoff=size_cutoff)]
+                for ix1, ix2 in idx_map:
+                    unique_stmts[ix1].supported_by.append(unique_stmts[ix2])
+                    unique_stmts[ix2].supports.append(unique_stmts[ix1])
+            else:
+                self._add_refinements_with_index(added_stmts, poolsize,
+                                                 size_cutoff)
+            self.unique_stmts = unique_stmts
+            self.related_stmts = [st for st in unique_stmts
+                                  if not st.supports]
+
+        if belief_engine is not None:
+            # Beliefs propagate from more specific to more general
+            # statements, so we need to update everything that the
+            # affected statements are directly or indirectly supported by
+            affected_stmts = _get_supported_by_closure(affected_stmts)
+            logger.info('Updating beliefs for %d affected statements' %
+                        len(affected_stmts))
+            belief_engine.set_prior_probs(affected_stmts)
+            belief_engine.set_hierarchy_probs(affected_stmts)
+
+        if return_toplevel:
+            return self.related_stmts
+        else:
+            return self.unique_stmts
+
+    def _add_refinements_with_index(self, added_stmts, poolsize,
+                                    size_cutoff):
+        """Set supports/supported by between added and unique statements.
+
+        The possible refinements are only looked up for the added
+        statements in an index of the unique statements which is kept up
+        to date across calls rather than applying the ontology-based
+        pre-filter to all statements again.
+        """
+        index = self._refinement_index
+        # The unique statements can be replaced, in which case the index
+        # is built again for the new ones
+        if index is None or not index.has_statements(self.unique_stmts):
+            index = _OntologyRefinementIndex(self.ontology,
+                                             self.matches_fun)
+            index.add_statements(self.unique_stmts)
+            self._refinement_index = index
+        added_hashes = index.add_statements(added_stmts)
+        stmts_to_compare = index.get_possible_refinements(added_hashes)
+        logger.info('Total comparisons: %d' %
+                    sum(len(v) for v in stmts_to_compare.values()))
+        maps = self.confirm_possible_refinements(index.stmts_by_hash,
+                                                 stmts_to_compare,
+                                                 poolsize=poolsize,
+                                                 size_cutoff=size_cutoff)
+        for refinement, refined in maps:
+            index.stmts_by_hash[refinement].supported_by.append(
+                index.stmts_by_hash[refined])
+            index.stmts_by_hash[refined].supports.append(
+                index.stmts_by_hash[refinement])
+
     def _generate_id_maps(self, unique_stmts, split_idx=None,
-                          filters=None, **kwargs):
+                          filters=None, poolsize=None, size_cutoff=None,
+                          **kwargs):
         """Return pairs of statement indices representing refinement relations.
 
         Parameters
@@ -341,6 +626,12 @@ class Preassembler(object):
             of possible refinements where the keys are statement hashes
             and the values are sets of statement hashes that the
             key statement possibly refines.
+        poolsize : Optional[int]
+            The number of worker processes to use to confirm possible
+            refinements. If None, no parallelization is performed.
+        size_cutoff : Optional[int]
+            Statement types with fewer than size_cutoff candidate
+            comparisons are compared in the parent process. Default: 100
 
         Returns
         -------
@@ -392,7 +683,7 @@ class Preassembler(object):
         # to distinct groups of statements (identified by an index at which we
         # split the unique_statements list) rather than globally across
         # all unique statements.
-        if split_idx:
+        if split_idx is not None:
             # This dict maps statement hashes to a bool value based on which
             # of the two groups the statement belongs to.
             hash_to_split_group = {sh: (idx <= split_idx) for sh, idx
@@ -405,14 +696,17 @@ class Preassembler(object):
         maps = \
             self.confirm_possible_refinements(stmts_by_hash,
                                               stmts_to_compare,
-                                              split_groups=hash_to_split_group)
+                                              split_groups=hash_to_split_group,
+                                              poolsize=poolsize,
+                                              size_cutoff=size_cutoff)
 
         idx_maps = [(stmt_to_idx[refinement], stmt_to_idx[refined])
                     for refinement, refined in maps]
         return idx_maps
 
     def confirm_possible_refinements(self, stmts_by_hash, stmts_to_compare,
-                                     split_groups=None):
+                                     split_groups=None, poolsize=None,
+                                     size_cutoff=None):
         """Return confirmed pairs of statement refinement relationships.
 
         Parameters
@@ -430,6 +724,15 @@ class Preassembler(object):
             same group aren't compared, only statements in different
             groups are. This can be used to do "bipartite" refinement
             checking across a set of statements.
+        poolsize : Optional[int]
+            The number of worker processes to use. If None or 1, all
+            comparisons are done in the current process. Otherwise, the
+            candidate comparisons are sharded by statement type across
+            a pool of worker processes. The result is identical to the
+            one obtained without parallelization.
+        size_cutoff : Optional[int]
+            Statement types with fewer than size_cutoff candidate
+            comparisons are compared in the parent process. Default: 100
 
         Returns
         -------
@@ -438,42 +741,105 @@ class Preassembler(object):
             hash of a statement which refines that statement whose hash
             is the second element of the tuple.
         """
-        maps = []
-        # We again iterate over statements
         ts = time.time()
-        # Given the possible refinements in stmts_to_compare, we confirm each
+        if poolsize is not None and poolsize > 1:
+            confirmed = self._confirm_refinements_parallel(
+                stmts_by_hash, stmts_to_compare, split_groups, poolsize,
+                size_cutoff if size_cutoff is not None else 100)
+        else:
+            confirmed = {}
+            for stmt_hash, possible_refined_hashes in \
+                    stmts_to_compare.items():
+                confirmed[stmt_hash], n_comparisons = \
+                    _confirm_refinements_for_stmt(
+                        stmts_by_hash, stmt_hash, possible_refined_hashes,
+                        split_groups, self.refinement_fun, self.ontology)
+                self._add_comparisons(n_comparisons)
+        # We assemble the confirmed pairs in the order in which the
+        # candidates are iterated so that the result doesn't depend on
+        # whether parallelization was used.
+        maps = []
         for stmt_hash, possible_refined_hashes in stmts_to_compare.items():
-            # We use the previously constructed set of statements that this one
-            # can possibly refine
-            for possible_refined_hash in possible_refined_hashes:
-                # We handle split groups here to only check refinements between
-                # statements that are in different groups to compare
-                if not split_groups or split_groups[stmt_hash] != \
-                        split_groups[possible_refined_hash]:
-                    # And then do the actual comparison. Here we use
-                    # entities_refined=True which means that we assert that
-                    # the entities, in each role, are already confirmed to
-                    # be "compatible" for refinement, and therefore, we
-                    # don't need to again confirm this (i.e., call "isa") in
-                    # the refinement_of function.
-                    self._comparison_counter += 1
-                    ref = self.refinement_fun(
-                        stmts_by_hash[stmt_hash],
-                        stmts_by_hash[possible_refined_hash],
-                        ontology=self.ontology,
-                        # NOTE: here we assume that the entities at this point
-                        # are definitely refined due to the use of an
-                        # ontology-based pre-filter. If this is not the case
-                        # for some reason then it is the responsibility of the
-                        # user-supplied self.refinement_fun to disregard the
-                        # entities_refined argument.
-                        entities_refined=True)
-                    if ref:
-                        maps.append((stmt_hash, possible_refined_hash))
+            confirmed_hashes = confirmed.get(stmt_hash)
+            if not confirmed_hashes:
+                continue
+            confirmed_hashes = set(confirmed_hashes)
+            maps += [(stmt_hash, possible_refined_hash)
+                     for possible_refined_hash in possible_refined_hashes
+                     if possible_refined_hash in confirmed_hashes]
         te = time.time()
         logger.debug('Confirmed %d refinements in %.2fs' % (len(maps), te-ts))
         return maps
 
+    def _confirm_refinements_parallel(self, stmts_by_hash, stmts_to_compare,
+                                      split_groups, poolsize, size_cutoff):
+        """Confirm possible refinements using a pool of worker processes.
+
+        Candidate comparisons are grouped by statement type. Types with
+        fewer than size_cutoff comparisons are handled in this process,
+        while the others are split into chunks that are sent to workers.
+        The statements themselves are not sent with each task, instead,
+        workers inherit them from the parent process when forking (or
+        receive them once on startup where forking isn't available).
+        """
+        import multiprocessing as mp
+        # Group the candidate comparisons by statement type
+        tasks_by_type = collections.defaultdict(list)
+        for stmt_hash, possible_refined_hashes in stmts_to_compare.items():
+            if possible_refined_hashes:
+                stmt_type = indra_stmt_type(stmts_by_hash[stmt_hash])
+                tasks_by_type[stmt_type].append(
+                    (stmt_hash, list(possible_refined_hashes)))
+
+        confirmed = {}
+        chunks = []
+        for stmt_type, tasks in tasks_by_type.items():
+            num_comparisons = sum(len(refined) for _, refined in tasks)
+            if num_comparisons < size_cutoff:
+                for stmt_hash, possible_refined_hashes in tasks:
+                    confirmed[stmt_hash], n_comparisons = \
+                        _confirm_refinements_for_stmt(
+                            stmts_by_hash, stmt_hash,
+                            possible_refined_hashes, split_groups,
+                            self.refinement_fun, self.ontology)
+                    self._add_comparisons(n_comparisons)
+                continue
+            # We aim for a few chunks per worker for each type so that
+            # the load is balanced across workers
+            chunk_size = max(1, len(tasks) // (4 * poolsize))
+            for idx in range(0, len(tasks), chunk_size):
+                chunks.append(tasks[idx:idx + chunk_size])
+        if not chunks:
+            return confirmed
+
+        logger.info('Confirming refinements in %d chunks using %d '
+                    'processes' % (len(chunks), poolsize))
+        state = {'stmts_by_hash': stmts_by_hash,
+                 'split_groups': split_groups,
+                 'refinement_fun': self.refinement_fun,
+                 'ontology': self.ontology}
+        if 'fork' in mp.get_all_start_methods():
+            # With forking, workers see the module-level state as it was
+            # when the pool was created without any pickling
+            global _refinement_worker_state
+            _refinement_worker_state = state
+            ctx = mp.get_context('fork')
+            pool_kwargs = {}
+        else:
+            ctx = mp.get_context()
+            pool_kwargs = {'initializer': _init_refinement_worker,
+                           'initargs': (state,)}
+        try:
+            with ctx.Pool(poolsize, **pool_kwargs) as pool:
+                for chunk_confirmed, n_comparisons in \
+                        pool.imap_unordered(_confirm_refinements_chunk,
+                                            chunks):
+                    confirmed.update(chunk_confirmed)
+                    self._add_comparisons(n_comparisons)
+        finally:
+            _refinement_worker_state = None
+        return confirmed
+
     def find_contradicts(self):
         """Return pairs of contradicting Statements.
 
@@ -767,6 +1133,49 @@ def flatten_stmts(stmts):
     return list(total_stmts)
 
 
+def _get_ev_key(ev, raw_text, raw_grounding):
+    """Return a key for finding duplicate Evidences of matching Statements.
+    """
+    return ev.matches_key() + str(raw_text) + str(raw_grounding)
+
+
+def _get_annotated_ev_key(ev):
+    """Return the key of an Evidence annotated by combine_duplicate_stmts.
+
+    The key is the one the Evidence had before combine_duplicate_stmts
+    saved the raw agent texts and groundings and the prior UUIDs in its
+    annotations, so that duplicates are found irrespective of which raw
+    Statement they came from.
+    """
+    annotations = {k: v for k, v in ev.annotations.items()
+                   if k != 'prior_uuids'}
+    agents = annotations.pop('agents', {})
+    raw_agents = {k: v for k, v in agents.items()
+                  if k not in {'raw_text', 'raw_grounding'}}
+    if raw_agents:
+        annotations['agents'] = raw_agents
+    raw_ev = Evidence(source_api=ev.source_api, source_id=ev.source_id,
+                      pmid=ev.pmid, text=ev.text, annotations=annotations,
+                      epistemics=ev.epistemics)
+    return _get_ev_key(raw_ev, agents.get('raw_text'),
+                       agents.get('raw_grounding'))
+
+
+def _get_supported_by_closure(stmts):
+    """Return the given statements and all the ones they are supported by."""
+    closure = []
+    seen = set()
+    stack = list(stmts)
+    while stack:
+        stmt = stack.pop()
+        if id(stmt) in seen:
+            continue
+        seen.add(id(stmt))
+        closure.append(stmt)
+        stack += stmt.supported_by
+    return closure
+
+
 def flatten_evidence(stmts, collect_from=None):
     """Add evidence from *supporting* stmts to evidence for *supported* stmts.
 
@@ -817,7 +1226,7 @@ def flatten_evidence(stmts, collect_from=None):
     logger.info('Flattening evidence based on %s' % collect_from)
     # Copy all of the statements--these will be the ones where we update
     # the evidence lists
-    stmts = fast_deepcopy(stmts)
+    stmts = copy_stmts(stmts, copy_supports=True)
     for stmt in stmts:
         # We get the original evidence keys here so we can differentiate them
         # from ones added during flattening.
@@ -860,6 +1269,69 @@ def default_matches_fun(st):
     return st.matches_key()
 
 
+def _confirm_refinements_for_stmt(stmts_by_hash, stmt_hash,
+                                  possible_refined_hashes, split_groups,
+                                  refinement_fun, ontology):
+    """Return the hashes that a given statement is confirmed to refine,
+    along with the number of comparisons that were made."""
+    confirmed = []
+    n_comparisons = 0
+    # We use the previously constructed set of statements that this one
+    # can possibly refine
+    for possible_refined_hash in possible_refined_hashes:
+        # We handle split groups here to only check refinements between
+        # statements that are in different groups to compare
+        if not split_groups or split_groups[stmt_hash] != \
+                split_groups[possible_refined_hash]:
+            # And then do the actual comparison. Here we use
+            # entities_refined=True which means that we assert that
+            # the entities, in each role, are already confirmed to
+            # be "compatible" for refinement, and therefore, we
+            # don't need to again confirm this (i.e., call "isa") in
+            # the refinement_of function.
+            n_comparisons += 1
+            ref = refinement_fun(
+                stmts_by_hash[stmt_hash],
+                stmts_by_hash[possible_refined_hash],
+                ontology=ontology,
+                # NOTE: here we assume that the entities at this point
+                # are definitely refined due to the use of an
+                # ontology-based pre-filter. If this is not the case
+                # for some reason then it is the responsibility of the
+                # user-supplied refinement_fun to disregard the
+                # entities_refined argument.
+                entities_refined=True)
+            if ref:
+                confirmed.append(possible_refined_hash)
+    return confirmed, n_comparisons
+
+
+# This is the state shared with worker processes confirming refinements.
+# It is set in the parent process before forking so that the statements
+# are inherited by the workers rather than pickled with each task.
+_refinement_worker_state = None
+
+
+def _init_refinement_worker(state):
+    global _refinement_worker_state
+    _refinement_worker_state = state
+
+
+def _confirm_refinements_chunk(chunk):
+    state = _refinement_worker_state
+    confirmed = {}
+    total_comparisons = 0
+    for stmt_hash, possible_refined_hashes in chunk:
+        confirmed[stmt_hash], n_comparisons = \
+            _confirm_refinements_for_stmt(state['stmts_by_hash'], stmt_hash,
+                                          possible_refined_hashes,
+                                          state['split_groups'],
+                                          state['refinement_fun'],
+                                          state['ontology'])
+        total_comparisons += n_comparisons
+    return confirmed, total_comparisons
+
+
 # TODO: we could make the agent key function parameterizable with the
 # preassembler to allow custom agent mappings to the ontology.
 def get_agent_key(agent):
@@ -992,83 +1464,250 @@ def ontology_refinement_filter_by_stmt_type(stmts_by_hash, ontology):
         hash of a statement which refines that statement whose hash
         is the second element of the tuple.
     """
-    # Step 1. initialize data structures
+    # Step 1. Encode statements by their position, and agent keys
+    # by an integer ID per role
     roles = stmts_by_hash[next(iter(stmts_by_hash))]._agent_order
-    # Mapping agent keys to statement hashes
-    agent_key_to_hash = {}
-    # Mapping statement hashes to agent keys
-    hash_to_agent_key = {}
-    # All agent keys for a given agent role
-    all_keys_by_role = {}
-    for role in roles:
-        agent_key_to_hash[role] = collections.defaultdict(set)
-        hash_to_agent_key[role] = collections.defaultdict(set)
+    hashes = list(stmts_by_hash)
+    # Mapping agent keys to integer IDs per role
+    key_ids = {role: {} for role in roles}
+    # Mapping agent key IDs to the positions of statements per role
+    positions_by_key_id = {role: [] for role in roles}
+    # Mapping statement positions to agent key IDs per role
+    key_ids_by_position = {role: [] for role in roles}
 
     # Step 2. Fill up the initial data structures in preparation
     # for identifying potential refinements
-    for sh, stmt in stmts_by_hash.items():
+    for pos, stmt in enumerate(stmts_by_hash.values()):
         for role in roles:
-            agents = getattr(stmt, role)
-            # Handle a special case here where a list=like agent
-            # role can be empty, here we will consider anything else
-            # to be a refinement, hence add a None key
-            if isinstance(agents, list) and not agents:
-                agent_keys = {None}
-            # Generally, we take all the agent keys for a single or
-            # list-like agent role.
-            else:
-                agent_keys = {get_agent_key(agent) for agent in
-                              (agents if isinstance(agents, list)
-                               else [agents])}
+            agent_keys = _get_role_agent_keys(stmt, role)
+            stmt_key_ids = []
             for agent_key in agent_keys:
-                agent_key_to_hash[role][agent_key].add(sh)
-                hash_to_agent_key[role][sh].add(agent_key)
-
-    agent_key_to_hash = dict(agent_key_to_hash)
-    hash_to_agent_key = dict(hash_to_agent_key)
-
-    for role in roles:
-        all_keys_by_role[role] = set(agent_key_to_hash[role].keys())
+                key_id = key_ids[role].get(agent_key)
+                if key_id is None:
+                    key_id = len(key_ids[role])
+                    key_ids[role][agent_key] = key_id
+                    positions_by_key_id[role].append([])
+                positions_by_key_id[role][key_id].append(pos)
+                stmt_key_ids.append(key_id)
+            key_ids_by_position[role].append(stmt_key_ids)
+    # Positions are added in increasing order so these arrays are sorted
+    positions_by_key_id = {
+        role: [numpy.array(positions, dtype=numpy.int64)
+               for positions in positions_for_role]
+        for role, positions_for_role in positions_by_key_id.items()
+    }
 
     # Step 3. Identify all the pairs of statements which can be in a
     # refinement relationship
+    # The ontology is only queried once per distinct agent key, and the
+    # sorted array of statement positions that an agent key can refine in
+    # a given role is memoized for reuse across statements.
+    parents_cache = {}
+    candidates_cache = {role: {} for role in roles}
+
+    def get_candidates(role, key_id, agent_key):
+        candidates = candidates_cache[role].get(key_id)
+        if candidates is not None:
+            return candidates
+        parents = parents_cache.get(agent_key)
+        if parents is None:
+            parents = set(ontology.get_parents(*agent_key)) \
+                if agent_key is not None else set()
+            parents_cache[agent_key] = parents
+        relevant_key_ids = {key_ids[role][key] for key in
+                            parents | {None, agent_key}
+                            if key in key_ids[role]}
+        if len(relevant_key_ids) == 1:
+            candidates = positions_by_key_id[role][relevant_key_ids.pop()]
+        else:
+            candidates = numpy.unique(numpy.concatenate(
+                [positions_by_key_id[role][rel_id]
+                 for rel_id in relevant_key_ids]))
+        candidates_cache[role][key_id] = candidates
+        return candidates
+
+    keys_by_id = {role: list(key_ids[role]) for role in roles}
     stmts_to_compare = {}
     # We iterate over each statement and find all other statements that it
     # can potentially refine
-    ts = time.time()
-    for sh, stmt in stmts_by_hash.items():
-        relevants = None
-        # We now iterate over all the agent roles in the given statement
-        # type
-        for role, hash_to_agent_key_for_role in hash_to_agent_key.items():
-            # We get all the agent keys in all other statements that the
-            # agent
-            # in this role in this statement can be a refinement.
-            for agent_key in hash_to_agent_key_for_role[sh]:
-                relevant_keys = get_relevant_keys(
-                    agent_key,
-                    all_keys_by_role[role],
-                    ontology)
-                # We now get the actual statement hashes that these other
-                # potentially refined agent keys appear in in the given role
-                role_relevant_stmt_hashes = set.union(
-                    *[agent_key_to_hash[role][rel]
-                      for rel in relevant_keys]) - {sh}
-                # In the first iteration, we initialize the set with the
-                # relevant statement hashes
-                if relevants is None:
-                    relevants = role_relevant_stmt_hashes
-                # In subsequent iterations, we take the intersection of
-                # the relevant sets per role
-                else:
-                    relevants &= role_relevant_stmt_hashes
+    for pos, sh in enumerate(hashes):
+        # We get the sorted statement positions that the agent in each
+        # role of this statement can be a refinement of, and take their
+        # intersection, starting with the smallest one
+        role_candidates = [get_candidates(role, key_id,
+                                          keys_by_id[role][key_id])
+                           for role in roles
+                           for key_id in key_ids_by_position[role][pos]]
+        if not role_candidates:
+            stmts_to_compare[sh] = None
+            continue
+        role_candidates.sort(key=len)
+        relevants = role_candidates[0]
+        for candidates in role_candidates[1:]:
+            if not len(relevants):
+                break
+            relevants = numpy.intersect1d(relevants, candidates,
+                                          assume_unique=True)
         # These hashes are now the ones that this statement needs
         # to be compared against. Importantly, the relationship is in
         # a well-defined direction so we don't need to test both ways.
-        stmts_to_compare[sh] = relevants
+        stmts_to_compare[sh] = {hashes[rel_pos] for rel_pos
+                                in relevants.tolist() if rel_pos != pos}
     return stmts_to_compare
 
 
+def _get_role_agent_keys(stmt, role):
+    """Return the set of agent keys of a Statement in a given role."""
+    agents = getattr(stmt, role)
+    # Handle a special case here where a list=like agent
+    # role can be empty, here we will consider anything else
+    # to be a refinement, hence add a None key
+    if isinstance(agents, list) and not agents:
+        return {None}
+    # Generally, we take all the agent keys for a single or
+    # list-like agent role.
+    return {get_agent_key(agent) for agent in
+            (agents if isinstance(agents, list) else [agents])}
+
+
+class _OntologyRefinementIndex(object):
+    """An index of Statements by agent key for finding possible refinements.
+
+    For the Statements in the index, the possible refinements are the
+    same as the ones :py:func:`ontology_refinement_filter` returns, but
+    Statements can be added to the index, and the possible refinements
+    are only looked up for the given Statements rather than all of them.
+
+    Parameters
+    ----------
+    ontology : indra.ontology.IndraOntology
+        An IndraOntology instance with respect to which possible
+        refinements are found.
+    matches_fun : function
+        The function used to get the matches key hashes of Statements.
+    """
+    def __init__(self, ontology, matches_fun):
+        self.ontology = ontology
+        self.matches_fun = matches_fun
+        self.stmts_by_hash = {}
+        self._stmt_ids = set()
+        # The statement type and agent keys by role of each statement
+        self._keys_by_hash = {}
+        # Statement hashes by statement type, role and agent key
+        self._hashes_by_key = collections.defaultdict(set)
+        # Statement hashes by statement type, role and the keys that
+        # one of the agent keys in the role can refine
+        self._hashes_by_relevant_key = collections.defaultdict(set)
+        self._relevant_keys = {}
+
+    def __len__(self):
+        return len(self.stmts_by_hash)
+
+    def _get_relevant_keys(self, agent_key):
+        relevant_keys = self._relevant_keys.get(agent_key)
+        if relevant_keys is None:
+            relevant_keys = {None, agent_key}
+            if agent_key is not None:
+                relevant_keys |= set(self.ontology.get_parents(*agent_key))
+            self._relevant_keys[agent_key] = relevant_keys
+        return relevant_keys
+
+    def add_statements(self, stmts):
+        """Add Statements to the index and return their hashes."""
+        stmt_hashes = []
+        for stmt in stmts:
+            stmt_hash = stmt.get_hash(matches_fun=self.matches_fun)
+            stmt_type = indra_stmt_type(stmt)
+            keys = {role: _get_role_agent_keys(stmt, role)
+                    for role in stmt._agent_order}
+            self.stmts_by_hash[stmt_hash] = stmt
+            self._stmt_ids.add(id(stmt))
+            self._keys_by_hash[stmt_hash] = (stmt_type, keys)
+            for role, agent_keys in keys.items():
+                for agent_key in agent_keys:
+                    self._hashes_by_key[(stmt_type, role, agent_key)].add(
+                        stmt_hash)
+                    for relevant_key in self._get_relevant_keys(agent_key):
+                        self._hashes_by_relevant_key[
+                            (stmt_type, role, relevant_key)].add(stmt_hash)
+            stmt_hashes.append(stmt_hash)
+        return stmt_hashes
+
+    def has_statements(self, stmts):
+        """Return True if the index contains exactly the given Statements.
+        """
+        # The index keeps references to its statements so their ids
+        # can't be reused by other objects
+        return len(stmts) == len(self._stmt_ids) and \
+            all(id(stmt) in self._stmt_ids for stmt in stmts)
+
+    def _can_refine(self, keys, other_keys):
+        return all(self._get_relevant_keys(agent_key) & other_keys[role]
+                   for role, agent_keys in keys.items()
+                   for agent_key in agent_keys)
+
+    def get_possible_refinements(self, stmt_hashes):
+        """Return the possible refinements involving given Statements.
+
+        Parameters
+        ----------
+        stmt_hashes : list[int]
+            The hashes of Statements in the index whose possible
+            refinements are returned.
+
+        Returns
+        -------
+        dict
+            A dict whose keys are statement hashes and values are sets
+            of statement hashes that can potentially be refined by the
+            statement identified by the key, where either the key or
+            the value is one of the given statement hashes.
+        """
+        stmts_to_compare = collections.defaultdict(set)
+        for stmt_hash in stmt_hashes:
+            stmt_type, keys = self._keys_by_hash[stmt_hash]
+            # The statements that this statement can possibly refine
+            refined = _intersect_all(
+                _union_all([self._hashes_by_key.get((stmt_type, role, key),
+                                                    set())
+                            for key in self._get_relevant_keys(agent_key)])
+                for role, agent_keys in keys.items()
+                for agent_key in agent_keys)
+            refined.discard(stmt_hash)
+            stmts_to_compare[stmt_hash] |= refined
+            # The statements that can possibly refine this statement have
+            # one of its agent keys as a relevant key in each role, which
+            # is necessary but not sufficient for list-like roles
+            refining = _intersect_all(
+                _union_all([self._hashes_by_relevant_key.get(
+                    (stmt_type, role, agent_key), set())
+                    for agent_key in agent_keys])
+                for role, agent_keys in keys.items())
+            refining.discard(stmt_hash)
+            for other_hash in refining:
+                if self._can_refine(self._keys_by_hash[other_hash][1], keys):
+                    stmts_to_compare[other_hash].add(stmt_hash)
+        return dict(stmts_to_compare)
+
+
+def _union_all(sets):
+    return sets[0] if len(sets) == 1 else set().union(*sets)
+
+
+def _intersect_all(sets):
+    # Intersecting starting from the smallest set makes this proportional
+    # to its size rather than the size of the largest set
+    sets = sorted(sets, key=len)
+    if not sets:
+        return set()
+    intersection = set(sets[0])
+    for other in sets[1:]:
+        if not intersection:
+            break
+        intersection &= other
+    return intersection
+
+
 def bio_ontology_refinement_filter(stmts_by_hash, stmts_to_compare):
     """An ontology refinement filter that works with the INDRA BioOntology."""
     from indra.ontology.bio import bio_ontology
@@ -1,12 +1,15 @@
 """This module implements a client to the Gilda grounding web service,
 and contains functions to help apply it during the course of INDRA assembly."""
+import copy
 import logging
 import requests
-from copy import deepcopy
+from functools import lru_cache
 from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 from indra.ontology.standardize \
     import standardize_agent_name
 from indra.config import get_config, has_config
+from indra.statements import copy_stmts
 from indra.pipeline import register_pipeline
 
 
@@ -15,6 +18,14 @@ logger = logging.getLogger(__name__)
 grounding_service_url = get_config('GILDA_URL', failure_ok=True) \
     if has_config('GILDA_URL') else 'http://grounding.indra.bio/'
 
+# The number of texts sent to the web service in a single request when
+# grounding in batch, and the number of concurrent requests used if the
+# web service doesn't support grounding multiple texts per request
+GILDA_BATCH_SIZE = 1000
+GILDA_MAX_WORKERS = 8
+
+_session = None
+
 
 def get_grounding(txt, context=None, mode='web'):
     """Return the top Gilda grounding for a given text.
@@ -38,20 +49,103 @@ def get_grounding(txt, context=None, mode='web'):
     list
         The list of ScoredMatches
     """
-    grounding = {}
     if mode == 'web':
-        resp = requests.post(urljoin(grounding_service_url, 'ground'),
-                             json={'text': txt, 'context': context})
-        results = resp.json()
-        if results:
-            grounding = {results[0]['term']['db']: results[0]['term']['id']}
+        results = _ground_web(txt, context)
     else:
-        from gilda import ground
-        results = ground(txt, context)
-        if results:
-            grounding = {results[0].term.db: results[0].term.id}
-            results = [sm.to_json() for sm in results]
-    return grounding, results
+        results = [sm.to_json() for sm in _ground_local(txt, context)]
+    return _get_top_grounding(results), results
+
+
+def get_groundings(texts_contexts, mode='web'):
+    """Return the top Gilda groundings for a list of texts in batch.
+
+    Each distinct (text, context) pair is only grounded once. In web mode,
+    the texts are sent to the web service's ground_multi endpoint in
+    batches, or, if the service doesn't support it, by concurrent
+    requests on a shared session. In local mode, groundings are cached
+    across calls.
+
+    Parameters
+    ----------
+    texts_contexts : list[tuple]
+        A list of (text, context) tuples where context is an Optional[str].
+    mode : Optional[str]
+        If 'web', the web service given in the GILDA_URL config setting or
+        environmental variable is used. Otherwise, the gilda package is
+        attempted to be imported and used. Default: web
+
+    Returns
+    -------
+    list[tuple]
+        A list of (grounding, results) tuples, one for each (text, context)
+        tuple, as returned by get_grounding.
+    """
+    unique_pairs = list(dict.fromkeys(texts_contexts))
+    logger.info('Grounding %d distinct texts with Gilda' % len(unique_pairs))
+    if mode == 'web':
+        results_list = _ground_web_batch(unique_pairs)
+    else:
+        results_list = [[sm.to_json() for sm in _ground_local(txt, context)]
+                        for txt, context in unique_pairs]
+    groundings = {pair: (_get_top_grounding(results), results)
+                  for pair, results in zip(unique_pairs, results_list)}
+    return [groundings[pair] for pair in texts_contexts]
+
+
+def _get_top_grounding(results):
+    if not results:
+        return {}
+    return {results[0]['term']['db']: results[0]['term']['id']}
+
+
+def _get_session():
+    # A shared session keeps connections to the web service alive
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=GILDA_MAX_WORKERS)
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+    return _session
+
+
+def _ground_web(txt, context=None):
+    resp = _get_session().post(urljoin(grounding_service_url, 'ground'),
+                               json={'text': txt, 'context': context})
+    return resp.json()
+
+
+def _ground_web_batch(texts_contexts):
+    url = urljoin(grounding_service_url, 'ground_multi')
+    results_list = []
+    for idx in range(0, len(texts_contexts), GILDA_BATCH_SIZE):
+        batch = texts_contexts[idx:idx + GILDA_BATCH_SIZE]
+        resp = _get_session().post(url, json=[{'text': txt,
+                                               'context': context}
+                                              for txt, context in batch])
+        if resp.status_code in {404, 405}:
+            logger.info('The Gilda web service does not support grounding '
+                        'in batch, using concurrent requests instead.')
+            return results_list + _ground_web_concurrent(
+                texts_contexts[idx:])
+        resp.raise_for_status()
+        results_list += resp.json()
+    return results_list
+
+
+def _ground_web_concurrent(texts_contexts):
+    with ThreadPoolExecutor(GILDA_MAX_WORKERS) as executor:
+        return list(executor.map(lambda pair: _ground_web(*pair),
+                                 texts_contexts))
+
+
+@lru_cache(maxsize=100000)
+def _ground_local(txt, context=None):
+    from gilda import ground
+    # The ScoredMatches are cached rather than their JSON so that each call
+    # returns new results which the caller is free to change
+    return ground(txt, context)
 
 
 def get_gilda_models(mode='web'):
@@ -99,10 +193,7 @@ def ground_agent(agent, txt, context=None, mode='web'):
     """
     gr, results = get_grounding(txt, context, mode)
     if gr:
-        db_refs = {'TEXT': txt}
-        db_refs.update(gr)
-        agent.db_refs = db_refs
-        standardize_agent_name(agent, standardize_refs=True)
+        _set_agent_grounding(agent, txt, gr)
     return results
 
 
@@ -123,16 +214,8 @@ def ground_statement(stmt, mode='web', ungrounded_only=False):
         If True, only ungrounded Agents will be grounded, and ones that
         are already grounded will not be modified. Default: False
     """
-    if stmt.evidence and stmt.evidence[0].text:
-        context = stmt.evidence[0].text
-    else:
-        context = None
-    for agent in stmt.agent_list():
-        if agent is not None and 'TEXT' in agent.db_refs:
-            txt = agent.db_refs['TEXT']
-            gr = agent.get_grounding()
-            if not ungrounded_only or gr[0] is None:
-                ground_agent(agent, txt, context, mode=mode)
+    for agent, txt, context in _get_agents_to_ground(stmt, ungrounded_only):
+        ground_agent(agent, txt, context, mode=mode)
 
 
 @register_pipeline
@@ -164,9 +247,54 @@ def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False):
         The list of Statements that were changed in place by reference.
     """
     source_filter = set(sources) if sources else set()
-    grounded_stmts = deepcopy(stmts)
+    grounded_stmts = copy_stmts(stmts, share_evidence=True)
+    # We first collect the Agents to be grounded along with their text and
+    # context, and then ground each distinct text and context once
+    agents_to_ground = []
     for stmt in grounded_stmts:
         if not source_filter or (stmt.evidence and stmt.evidence[0].source_api
                                  in source_filter):
-            ground_statement(stmt, mode=mode, ungrounded_only=ungrounded_only)
+            agents_to_ground += _get_agents_to_ground(stmt, ungrounded_only)
+    pairs = [(txt, context) for _, txt, context in agents_to_ground]
+    groundings = get_groundings(pairs, mode=mode)
+    # Agents with the same text and grounding end up with the same name and
+    # standardized db_refs, so we only standardize each of these once
+    standardized = {}
+    for (agent, txt, _), (gr, _) in zip(agents_to_ground, groundings):
+        if not gr:
+            continue
+        key = (txt, tuple(gr.items()))
+        if key not in standardized:
+            name_set = _set_agent_grounding(agent, txt, gr)
+            standardized[key] = (agent.name if name_set else None,
+                                 agent.db_refs)
+        else:
+            name, db_refs = standardized[key]
+            if name is not None:
+                agent.name = name
+            agent.db_refs = copy.deepcopy(db_refs)
     return grounded_stmts
+
+
+def _get_agents_to_ground(stmt, ungrounded_only=False):
+    """Return (agent, text, context) tuples of Agents to ground in a Statement.
+    """
+    if stmt.evidence and stmt.evidence[0].text:
+        context = stmt.evidence[0].text
+    else:
+        context = None
+    agents = []
+    for agent in stmt.agent_list():
+        if agent is not None and 'TEXT' in agent.db_refs:
+            txt = agent.db_refs['TEXT']
+            gr = agent.get_grounding()
+            if not ungrounded_only or gr[0] is None:
+                agents.append((agent, txt, context))
+    return agents
+
+
+def _set_agent_grounding(agent, txt, gr):
+    db_refs = {'TEXT': txt}
+    db_refs.update(gr)
+    agent.db_refs = db_refs
+    return standardize_agent_name(agent, standardize_refs=True)
@@ -6,7 +6,7 @@ import csv
 import json
 import logging
 from copy import deepcopy
-from indra.statements import Agent
+from indra.statements import Agent, copy_stmts
 from indra.databases import hgnc_client
 from indra.util import read_unicode_csv
 from indra.preassembler.grounding_mapper.gilda import get_gilda_models
@@ -47,6 +47,13 @@ class GroundingMapper(object):
         is assumed to be the web service endpoint through which Gilda is used.
         If 'local', we assume that the gilda Python package is installed
         and will be used.
+
+    Attributes
+    ----------
+    agent_cache : dict
+        A cache of the outcome of mapping Agents with a given set of db_refs
+        which is used by map_agent. It needs to be cleared if the grounding
+        resources of the mapper are changed after it was first used.
     """
     def __init__(self, grounding_map=None, agent_map=None, ignores=None,
                  misgrounding_map=None, use_adeft=True, gilda_mode=None):
@@ -55,13 +62,14 @@ class GroundingMapper(object):
         self.check_grounding_map(self.grounding_map)
         self.agent_map = agent_map if agent_map is not None \
             else default_agent_map
-        self.ignores = set(ignores) if ignores else default_ignores
+        self.ignores = set(ignores) if ignores else set(default_ignores)
         self.misgrounding_map = misgrounding_map if misgrounding_map \
             else default_misgrounding_map
         self.use_adeft = use_adeft
         self.disamb_manager = DisambManager()
         self.gilda_mode = gilda_mode
         self._gilda_models = None
+        self.agent_cache = {}
 
     @property
     def gilda_models(self):
@@ -136,7 +144,7 @@ class GroundingMapper(object):
         mapped_stmt : :py:class:`indra.statements.Statement`
             The mapped Statement.
         """
-        mapped_stmt = deepcopy(stmt)
+        mapped_stmt = stmt.copy(share_evidence=True)
 
         # Iterate over the agents
         # Update agents directly participating in the statement
@@ -149,18 +157,19 @@ class GroundingMapper(object):
             # then filter out the Statement
             agent_txts = {agent.db_refs[t] for t in {'TEXT', 'TEXT_NORM'}
                           if t in agent.db_refs}
-            if agent_txts and agent_txts & set(self.ignores):
+            if any(txt in self.ignores for txt in agent_txts):
                 return None
 
             # Check if an adeft model exists for agent text
             adeft_success = False
-            if self.use_adeft and agent_txts and agent_txts & \
-                    set(adeft_disambiguators):
+            adeft_txts = {txt for txt in agent_txts
+                          if txt in adeft_disambiguators}
+            if self.use_adeft and adeft_txts:
                 try:
                     # Us the longest match for disambiguation
-                    txt_for_adeft = sorted(agent_txts &
-                                           set(adeft_disambiguators),
+                    txt_for_adeft = sorted(adeft_txts,
                                            key=lambda x: len(x))[-1]
+                    _unshare_first_evidence(mapped_stmt, stmt)
                     adeft_success = self.disamb_manager.\
                         run_adeft_disambiguation(mapped_stmt, agent, idx,
                                                  txt_for_adeft)
@@ -172,12 +181,13 @@ class GroundingMapper(object):
             gilda_success = False
             # Gilda is not used if agent text is in the grounding map
             if not adeft_success and self.gilda_mode and \
-               not agent_txts & set(self.grounding_map) and \
+               not any(txt in self.grounding_map for txt in agent_txts) and \
                agent_txts & set(self.gilda_models):
                 try:
                     # Us the longest match for disambiguation
                     txt_for_gilda = sorted(agent_txts & set(self.gilda_models),
                                            key=lambda x: len(x))[-1]
+                    _unshare_first_evidence(mapped_stmt, stmt)
                     gilda_success = self.disamb_manager.\
                         run_gilda_disambiguation(mapped_stmt, agent, idx,
                                                  txt_for_gilda,
@@ -220,6 +230,10 @@ class GroundingMapper(object):
         (which might be a different object if we load a new agent state
         from json) or the same object otherwise.
 
+        Since the mapping of an Agent only depends on its db_refs, the outcome
+        of mapping a given set of db_refs is cached in the agent_cache
+        attribute and reused for other Agents with the same db_refs.
+
         Parameters
         ----------
         agent : :py:class:`indra.statements.Agent`
@@ -235,6 +249,40 @@ class GroundingMapper(object):
         grounded_agent : :py:class:`indra.statements.Agent`
             The grounded Agent.
         """
+        try:
+            key = (do_rename, tuple(sorted(agent.db_refs.items())))
+            mapping = self.agent_cache.get(key)
+        except TypeError:
+            # Some db_refs values, e.g., scored groundings, are not hashable,
+            # we map such Agents without the cache
+            return self._map_agent(agent, do_rename)
+        if mapping is None:
+            mapping = self._get_agent_mapping(agent.db_refs, do_rename)
+            self.agent_cache[key] = mapping
+        mapped_agent, db_refs, name = mapping
+        if mapped_agent is not None:
+            return deepcopy(mapped_agent)
+        agent.db_refs = deepcopy(db_refs)
+        if name is not None:
+            agent.name = name
+        return agent
+
+    def _get_agent_mapping(self, db_refs, do_rename):
+        """Return the outcome of mapping an Agent with given db_refs.
+
+        The outcome is either an Agent from the agent map which replaces the
+        Agent, or the new db_refs and name of the Agent, where the name is
+        None if the Agent's name is not changed.
+        """
+        unchanged = object()
+        probe = Agent(unchanged, db_refs=deepcopy(db_refs))
+        mapped_agent = self._map_agent(probe, do_rename)
+        if mapped_agent is not probe:
+            return mapped_agent, None, None
+        return None, probe.db_refs, \
+            probe.name if probe.name is not unchanged else None
+
+    def _map_agent(self, agent, do_rename):
         # We always standardize DB refs as a functionality in the
         # GroundingMapper. If a new module is implemented which is
         # responsible for standardizing grounding, this can be removed.
@@ -383,7 +431,7 @@ class GroundingMapper(object):
             A new list of Statements with updated Agent names
         """
         # Make a copy of the stmts
-        mapped_stmts = deepcopy(stmts)
+        mapped_stmts = copy_stmts(stmts, share_evidence=True)
         # Iterate over the statements
         for _, stmt in enumerate(mapped_stmts):
             # Iterate over the agents
@@ -394,6 +442,17 @@ class GroundingMapper(object):
 
 # TODO: handle the cases when there is more than one entry for the same
 # key (e.g., ROS, ER)
+def _unshare_first_evidence(mapped_stmt, stmt):
+    """Copy the first Evidence of a mapped Statement if it is shared.
+
+    Disambiguation writes annotations and text refs into the first Evidence
+    of the Statement, so it can't be shared with the original Statement.
+    """
+    if mapped_stmt.evidence and stmt.evidence and \
+            mapped_stmt.evidence[0] is stmt.evidence[0]:
+        mapped_stmt.evidence[0] = deepcopy(stmt.evidence[0])
+
+
 def load_grounding_map(grounding_map_path, lineterminator='\r\n',
                        hgnc_symbols=True):
     """Return a grounding map dictionary loaded from a csv file.
@@ -124,7 +124,7 @@ class SiteMapper(ProtMapper):
         self.do_isoform_mapping = do_isoform_mapping
 
     def map_stmt_sites(self, stmt):
-        stmt_copy = deepcopy(stmt)
+        stmt_copy = stmt.copy(share_evidence=True)
         # For all statements, replace agents with invalid modifications
         mapped_sites = []
         new_agent_list = []
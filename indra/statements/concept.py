@@ -17,6 +17,9 @@ class Concept(object):
     db_refs : dict
         Dictionary of database identifiers associated with this concept.
     """
+    # The attributes that memoized matches keys don't depend on
+    _non_key_attrs = frozenset()
+
     def __init__(self, name, db_refs=None):
         self.name = name
         self.db_refs = db_refs if db_refs else {}
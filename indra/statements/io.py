@@ -2,10 +2,11 @@ from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
 
 __all__ = ['stmts_from_json', 'stmts_from_json_file', 'stmts_to_json',
-           'stmts_to_json_file', 'draw_stmt_graph',
-           'UnresolvedUuidError', 'InputError']
+           'stmts_to_json_file', 'iter_stmts_from_jsonl', 'write_stmts_jsonl',
+           'draw_stmt_graph', 'UnresolvedUuidError', 'InputError']
 
 import json
+import math
 import logging
 from indra.statements.statements import Statement, Unresolved
 
@@ -13,6 +14,14 @@ from indra.statements.statements import Statement, Unresolved
 logger = logging.getLogger(__name__)
 
 
+try:
+    import orjson
+    has_orjson = True
+except ImportError:
+    orjson = None
+    has_orjson = False
+
+
 def stmts_from_json(json_in, on_missing_support='handle'):
     """Get a list of Statements from Statement jsons.
 
@@ -84,8 +93,9 @@ def stmts_from_json_file(fname, format='json'):
         if format == 'json':
             return stmts_from_json(json.load(fh))
         else:
-            return stmts_from_json([json.loads(line)
-                                    for line in fh.readlines()])
+            loads = _get_json_loads(None)
+            return stmts_from_json(loads(line) for line in fh
+                                   if line.strip())
 
 
 def stmts_to_json_file(stmts, fname, format='json', **kwargs):
@@ -101,14 +111,12 @@ def stmts_to_json_file(stmts, fname, format='json', **kwargs):
         One of 'json' to use regular JSON with indent=1 formatting or
         'jsonl' to put each statement on a new line without indents.
     """
-    sj = stmts_to_json(stmts, **kwargs)
-    with open(fname, 'w') as fh:
-        if format == 'json':
+    if format == 'json':
+        sj = stmts_to_json(stmts, **kwargs)
+        with open(fname, 'w') as fh:
             json.dump(sj, fh, indent=1)
-        else:
-            for json_stmt in sj:
-                json.dump(json_stmt, fh)
-                fh.write('\n')
+    else:
+        write_stmts_jsonl(stmts, fname, **kwargs)
 
 
 def stmts_to_json(stmts_in, use_sbo=False, matches_fun=None):
@@ -140,6 +148,119 @@ def stmts_to_json(stmts_in, use_sbo=False, matches_fun=None):
     return json_dict
 
 
+def iter_stmts_from_jsonl(fname, on_missing_support='handle',
+                          json_backend=None):
+    """Yield Statements from a JSONL file one at a time.
+
+    Unlike :py:func:`stmts_from_json_file`, this function doesn't load the
+    whole file into memory, however, since Statements are processed one by
+    one, the uuids in the `supports` and `supported_by` lists of
+    pre-assembled Statements can't be resolved into Statements.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the JSONL file with one Statement JSON per line.
+    on_missing_support : Optional[str]
+        Handles the uuids in the `supports` and `supported_by` lists of
+        each Statement, see :py:func:`stmts_from_json`. Default: 'handle'
+    json_backend : Optional[str]
+        The JSON library used for decoding, one of 'json' or 'orjson'.
+        By default, orjson is used if it is installed.
+
+    Yields
+    ------
+    :py:class:`indra.statements.Statement`
+        The Statements in the file in their original order.
+    """
+    loads = _get_json_loads(json_backend)
+    with open(fname, 'rb') as fh:
+        for line in fh:
+            if line.strip():
+                yield from stmts_from_json([loads(line)], on_missing_support)
+
+
+def write_stmts_jsonl(stmts, fname, json_backend=None, use_sbo=False,
+                      matches_fun=None):
+    """Write Statements into a JSONL file one at a time.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statements.Statement]
+        An iterable (e.g., a list or a generator) of Statements to write.
+    fname : str
+        Path to the JSONL file to write the Statements into, one per line.
+    json_backend : Optional[str]
+        The JSON library used for encoding, one of 'json' or 'orjson'.
+        By default, orjson is used if it is installed.
+    use_sbo : Optional[bool]
+        If True, SBO annotations are added to each applicable element of the
+        JSON. Default: False
+    matches_fun : Optional[function]
+        A custom function which, if provided, is used to construct the
+        matches key which is then hashed and put into the JSON.
+        Default: None
+    """
+    dumps = _get_json_dumps(json_backend)
+    with open(fname, 'wb') as fh:
+        for stmt in stmts:
+            fh.write(dumps(stmt.to_json(use_sbo=use_sbo,
+                                        matches_fun=matches_fun)))
+            fh.write(b'\n')
+
+
+def _get_json_backend(json_backend):
+    if json_backend is None:
+        return 'orjson' if has_orjson else 'json'
+    if json_backend == 'orjson' and not has_orjson:
+        raise ImportError('The orjson package is not available.')
+    if json_backend not in {'json', 'orjson'}:
+        raise InputError('Invalid JSON backend: %s' % json_backend)
+    return json_backend
+
+
+def _get_json_loads(json_backend):
+    if _get_json_backend(json_backend) == 'orjson':
+        def loads(line):
+            try:
+                return orjson.loads(line)
+            # orjson doesn't support some values that the json module
+            # does, e.g., NaN
+            except ValueError:
+                return json.loads(line)
+        return loads
+    return json.loads
+
+
+def _get_json_dumps(json_backend):
+    if _get_json_backend(json_backend) == 'orjson':
+        def dumps(obj):
+            try:
+                data = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+            # orjson doesn't support some values that the json module
+            # does, e.g., integers larger than 64 bits
+            except TypeError:
+                return json.dumps(obj).encode('utf-8')
+            # orjson writes NaN and infinite values as null, we use the json
+            # module for these so that the output doesn't depend on the
+            # backend
+            if b'null' in data and _has_non_finite_float(obj):
+                return json.dumps(obj).encode('utf-8')
+            return data
+        return dumps
+    return lambda obj: json.dumps(obj).encode('utf-8')
+
+
+def _has_non_finite_float(obj):
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    elif isinstance(obj, dict):
+        return any(_has_non_finite_float(v) for v in obj.values())
+    elif isinstance(obj, (list, tuple)):
+        return any(_has_non_finite_float(v) for v in obj)
+    return False
+
+
 def _promote_support(sup_list, uuid_dict, on_missing='handle'):
     """Promote the list of support-related uuids to Statements, if possible."""
     valid_handling_choices = ['handle', 'error', 'ignore']
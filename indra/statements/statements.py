@@ -222,13 +222,14 @@ __all__ = [
 
     # Functions and values
     'stmts_from_json', 'get_unresolved_support_uuids', 'stmts_to_json',
-    'stmts_from_json_file', 'stmts_to_json_file', 'get_valid_residue',
+    'stmts_from_json_file', 'stmts_to_json_file', 'iter_stmts_from_jsonl',
+    'write_stmts_jsonl', 'get_valid_residue',
     'draw_stmt_graph', 'get_all_descendants','make_statement_camel',
     'amino_acids', 'amino_acids_reverse', 'activity_types',
     'modtype_to_modclass',
     'modclass_to_modtype', 'modtype_conditions', 'modtype_to_inverse',
     'modclass_to_inverse', 'get_statement_by_name', 'make_hash', 'stmt_type',
-    'default_ns_order', 'mk_str'
+    'default_ns_order', 'mk_str', 'matches_key_cache', 'copy_stmts'
     ]
 
 import abc
@@ -240,6 +241,7 @@ import itertools
 from copy import deepcopy
 from collections import OrderedDict as _o
 from .util import *
+from .util import cache_key_methods
 from .concept import *
 from .context import *
 from .evidence import *
@@ -272,6 +274,9 @@ class Statement(object):
     """
 
     _agent_order = NotImplemented
+    # The attributes that memoized matches keys don't depend on
+    _non_key_attrs = frozenset(['evidence', 'belief', 'uuid', 'supports',
+                                'supported_by'])
 
     def __init__(self, evidence=None, supports=None, supported_by=None):
         if evidence is None:
@@ -293,6 +298,10 @@ class Statement(object):
         self._shallow_hash = None
         return
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cache_key_methods(cls, ['matches_key'])
+
     def matches_key(self):
         raise NotImplementedError("Method must be implemented in child class.")
 
@@ -611,6 +620,35 @@ class Statement(object):
         new_instance._shallow_hash = my_shallow_hash
         return new_instance
 
+    def copy(self, deep=True, share_evidence=False, copy_supports=False):
+        """Return a copy of this Statement with the same uuid.
+
+        This is a faster alternative to `copy.deepcopy` and
+        :py:func:`indra.util.fast_deepcopy` which makes use of the known
+        structure of Statements, see :py:func:`copy_stmts` for details.
+
+        Parameters
+        ----------
+        deep : Optional[bool]
+            If True, Agents and other attributes are copied recursively,
+            otherwise they are shared with this Statement. Default: True
+        share_evidence : Optional[bool]
+            If True, the evidence list of the copy is a new list containing
+            the Evidence objects of this Statement rather than copies of
+            them. Default: False
+        copy_supports : Optional[bool]
+            If True, the Statements in `supports` and `supported_by` are
+            copied as well, otherwise the lists of the copy refer to the
+            original Statements. Default: False
+
+        Returns
+        -------
+        indra.statements.Statement
+            The copy of this Statement.
+        """
+        return copy_stmts([self], deep=deep, share_evidence=share_evidence,
+                          copy_supports=copy_supports)[0]
+
     def flip_polarity(self, agent_idx=None):
         """If applicable, flip the polarity of the statement"""
         pass
@@ -2659,3 +2697,135 @@ def stmt_type(obj, mk=True):
 def mk_str(mk):
     """Replace class path for backwards compatibility of matches keys."""
     return str(mk).replace('indra.statements.statements', 'indra.statements')
+
+
+def copy_stmts(stmts, deep=True, share_evidence=False, copy_supports=False):
+    """Return copies of a list of Statements.
+
+    Unlike `copy.deepcopy` or :py:func:`indra.util.fast_deepcopy`, which
+    pickles and unpickles the entire object graph, this function makes use
+    of the known structure of Statements: strings, numbers and other
+    immutable values are shared between the originals and the copies, and
+    Agents, Evidence, conditions and contexts are copied by attribute.
+    By default, the `supports` and `supported_by` hierarchy isn't copied,
+    which would otherwise pull in every Statement reachable from the given
+    ones. Copies keep the uuids and cached hashes of the originals.
+
+    Parameters
+    ----------
+    stmts : list[indra.statements.Statement]
+        A list of Statements to copy.
+    deep : Optional[bool]
+        If True, Agents and other attributes are copied recursively,
+        otherwise they are shared with the original Statements (while the
+        evidence, supports and supported_by lists are still new lists).
+        Default: True
+    share_evidence : Optional[bool]
+        If True, the evidence lists of the copies are new lists containing
+        the original Evidence objects rather than copies of them. This is
+        useful if the evidence lists of the copies may be changed but the
+        Evidence objects themselves won't be. Default: False
+    copy_supports : Optional[bool]
+        If True, the Statements in `supports` and `supported_by` are copied
+        as well, and references between copied Statements are preserved,
+        like in the case of a deep copy of the list. Otherwise, the
+        `supports` and `supported_by` lists of the copies refer to the
+        original Statements. Default: False
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The copies of the Statements, in the same order.
+    """
+    copier = _StatementCopier(deep, share_evidence, copy_supports)
+    return [copier.copy_stmt(stmt) for stmt in stmts]
+
+
+# Values of these types are shared between originals and copies
+_immutable_types = frozenset({str, int, float, bool, bytes, type(None)})
+
+
+class _StatementCopier(object):
+    """Copy Statements and the objects they contain by attribute."""
+    def __init__(self, deep, share_evidence, copy_supports):
+        self.deep = deep
+        self.share_evidence = share_evidence
+        self.copy_supports = copy_supports
+        # A memo of copies by the id of the original objects to preserve
+        # shared references as deepcopy does
+        self.memo = {}
+
+    def copy_stmt(self, stmt):
+        copied = self.memo.get(id(stmt))
+        if copied is not None:
+            return copied
+        new_stmt = object.__new__(type(stmt))
+        self.memo[id(stmt)] = new_stmt
+        copy_value = self.copy_value
+        state = {}
+        for attr, value in stmt.__dict__.items():
+            if attr == 'evidence':
+                if self.share_evidence or not self.deep:
+                    state[attr] = list(value)
+                else:
+                    state[attr] = [copy_value(ev) for ev in value]
+            elif attr in ('supports', 'supported_by'):
+                if self.copy_supports:
+                    state[attr] = [self.copy_stmt(st) for st in value]
+                else:
+                    state[attr] = list(value)
+            elif self.deep:
+                state[attr] = copy_value(value)
+            else:
+                state[attr] = value
+        # We set the attributes directly to avoid invalidating any memoized
+        # matches keys
+        new_stmt.__dict__.update(state)
+        return new_stmt
+
+    def copy_value(self, value):
+        value_type = type(value)
+        if value_type in _immutable_types:
+            return value
+        copy_value = self.copy_value
+        # Lists, dicts and tuples aren't memoized since they aren't
+        # expected to be shared between the objects in Statements
+        if value_type is list:
+            return [v if type(v) in _immutable_types else copy_value(v)
+                    for v in value]
+        elif value_type is dict:
+            return {k: (v if type(v) in _immutable_types else copy_value(v))
+                    for k, v in value.items()}
+        elif value_type is tuple:
+            return tuple([copy_value(v) for v in value])
+        copied = self.memo.get(id(value))
+        if copied is not None:
+            return copied
+        if _is_structured_type(value_type):
+            copied = object.__new__(value_type)
+            self.memo[id(value)] = copied
+            copied.__dict__.update(
+                {k: (v if type(v) in _immutable_types else copy_value(v))
+                 for k, v in value.__dict__.items()})
+        elif issubclass(value_type, Statement):
+            # E.g., the Events of an Influence
+            copied = self.copy_stmt(value)
+        else:
+            copied = deepcopy(value, self.memo)
+        return copied
+
+
+# Classes whose instances are copied attribute by attribute, and a cache of
+# whether a given class is one of them
+_structured_types = (Concept, Evidence, Context, RefContext, TimeContext,
+                     Delta, BoundCondition, MutCondition, ModCondition,
+                     ActivityCondition)
+_structured_type_cache = {}
+
+
+def _is_structured_type(cls):
+    is_structured = _structured_type_cache.get(cls)
+    if is_structured is None:
+        is_structured = issubclass(cls, _structured_types)
+        _structured_type_cache[cls] = is_structured
+    return is_structured
@@ -0,0 +1,270 @@
+"""A compact, memory-mapped container of Statements with random access.
+
+A statement store is a single file which contains the JSON of each
+Statement, with its evidence encoded separately, followed by a set of
+index arrays and a JSON footer describing them. The index arrays map
+shallow hashes and uuids to the position of Statements in the file, and
+contain the type of each Statement. Opening a store only memory-maps the
+file, after which individual Statements (with or without their evidence)
+can be looked up and decoded without reading the rest of the file.
+"""
+__all__ = ['StatementStore']
+
+import json
+import struct
+import logging
+from array import array
+import numpy
+from .evidence import Evidence
+from .io import stmts_from_json, _get_json_dumps, _get_json_loads
+
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'INDRA_STMT_STORE\n'
+FORMAT_VERSION = 1
+
+
+class StatementStore(object):
+    """A memory-mapped store of Statements with lookup by hash and uuid.
+
+    Instances are typically obtained using the :py:meth:`build` class method
+    or by opening an existing file. Statement shallow hashes are assumed to
+    be unique within a store (as is the case after duplicate combination),
+    if not, lookups by hash return the first matching Statement. The
+    `supports` and `supported_by` lists of Statements returned from a
+    store contain Unresolved Statements whose uuids can be looked up using
+    :py:meth:`get_stmt_by_uuid`.
+
+    Parameters
+    ----------
+    fname : str
+        The path to the statement store file.
+    json_backend : Optional[str]
+        The JSON library used for decoding, one of 'json' or 'orjson'.
+        By default, orjson is used if it is installed.
+
+    Attributes
+    ----------
+    stmt_types : list of str
+        The names of the Statement types in the store.
+    """
+    def __init__(self, fname, json_backend=None):
+        self.fname = fname
+        self.json_backend = json_backend
+        self._loads = _get_json_loads(json_backend)
+        self._data = numpy.memmap(fname, dtype=numpy.uint8, mode='r')
+        if self._data[:len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError('%s is not a statement store.' % fname)
+        footer_offset = struct.unpack('<Q', self._data[-8:].tobytes())[0]
+        footer = json.loads(self._data[footer_offset:-8].tobytes().
+                            decode('utf-8'))
+        if footer['version'] != FORMAT_VERSION:
+            raise ValueError('Unsupported statement store version: %s' %
+                             footer['version'])
+        self.stmt_types = footer['stmt_types']
+        self._arrays = {}
+        for name, (offset, dtype, length) in footer['arrays'].items():
+            self._arrays[name] = numpy.frombuffer(self._data, dtype=dtype,
+                                                  count=length,
+                                                  offset=offset)
+
+    def __len__(self):
+        return len(self._arrays['types'])
+
+    def __getstate__(self):
+        # The file is memory-mapped again when unpickling
+        return {'fname': self.fname, 'json_backend': self.json_backend}
+
+    def __setstate__(self, state):
+        self.__init__(state['fname'], json_backend=state['json_backend'])
+
+    @classmethod
+    def build(cls, stmts, fname, json_backend=None):
+        """Write Statements into a statement store file.
+
+        Statements are written one at a time so `stmts` can be a generator,
+        e.g., one returned by
+        :py:func:`indra.statements.io.iter_stmts_from_jsonl`.
+
+        Parameters
+        ----------
+        stmts : iterable[indra.statements.Statement]
+            The Statements to write into the store.
+        fname : str
+            The path to the statement store file to write.
+        json_backend : Optional[str]
+            The JSON library used for encoding, one of 'json' or 'orjson'.
+            By default, orjson is used if it is installed.
+
+        Returns
+        -------
+        StatementStore
+            The statement store that was written.
+        """
+        dumps = _get_json_dumps(json_backend)
+        offsets = array('q')
+        ev_offsets = array('q')
+        hashes = array('q')
+        types = array('H')
+        uuids = []
+        type_ids = {}
+        with open(fname, 'wb') as fh:
+            fh.write(MAGIC)
+            for stmt in stmts:
+                stmt_json = stmt.to_json()
+                ev_json = stmt_json.pop('evidence', [])
+                offsets.append(fh.tell())
+                fh.write(dumps(stmt_json))
+                ev_offsets.append(fh.tell())
+                fh.write(dumps(ev_json))
+                hashes.append(stmt.get_hash(shallow=True))
+                type_name = stmt_json['type']
+                if type_name not in type_ids:
+                    type_ids[type_name] = len(type_ids)
+                types.append(type_ids[type_name])
+                uuids.append(stmt.uuid.encode('utf-8'))
+            offsets.append(fh.tell())
+            hashes = numpy.frombuffer(hashes, dtype=numpy.int64)
+            hash_positions = numpy.argsort(hashes, kind='stable')
+            uuids = numpy.array(uuids, dtype='S%d' %
+                                max([len(u) for u in uuids] + [1]))
+            uuid_positions = numpy.argsort(uuids, kind='stable')
+            arrays = {
+                'offsets': numpy.frombuffer(offsets, dtype=numpy.int64),
+                'ev_offsets': numpy.frombuffer(ev_offsets, dtype=numpy.int64),
+                'types': numpy.frombuffer(types, dtype=numpy.uint16),
+                'sorted_hashes': hashes[hash_positions],
+                'hash_positions': hash_positions.astype(numpy.int64),
+                'sorted_uuids': uuids[uuid_positions],
+                'uuid_positions': uuid_positions.astype(numpy.int64),
+            }
+            footer = {'version': FORMAT_VERSION,
+                      'stmt_types': sorted(type_ids, key=type_ids.get),
+                      'arrays': {}}
+            for name, arr in arrays.items():
+                # We align arrays to 8 bytes for efficient access
+                fh.write(b'\0' * (-fh.tell() % 8))
+                footer['arrays'][name] = [fh.tell(), arr.dtype.str, len(arr)]
+                fh.write(arr.tobytes())
+            footer_offset = fh.tell()
+            fh.write(json.dumps(footer).encode('utf-8'))
+            fh.write(struct.pack('<Q', footer_offset))
+        logger.info('Wrote %d statements into %s' % (len(types), fname))
+        return cls(fname, json_backend=json_backend)
+
+    def get_stmt(self, stmt_hash, evidence=True):
+        """Return the Statement with a given shallow hash.
+
+        Parameters
+        ----------
+        stmt_hash : int
+            The shallow hash of a Statement.
+        evidence : Optional[bool]
+            If True, the evidence of the Statement is also decoded,
+            otherwise the Statement is returned without evidence.
+            Default: True
+
+        Returns
+        -------
+        indra.statements.Statement or None
+            The Statement with the given hash or None if it is not in the
+            store.
+        """
+        pos = self._find(self._arrays['sorted_hashes'],
+                         self._arrays['hash_positions'], stmt_hash)
+        return self._get_stmt(pos, evidence) if pos is not None else None
+
+    def get_stmt_by_uuid(self, uuid, evidence=True):
+        """Return the Statement with a given uuid.
+
+        Parameters
+        ----------
+        uuid : str
+            The uuid of a Statement.
+        evidence : Optional[bool]
+            If True, the evidence of the Statement is also decoded,
+            otherwise the Statement is returned without evidence.
+            Default: True
+
+        Returns
+        -------
+        indra.statements.Statement or None
+            The Statement with the given uuid or None if it is not in the
+            store.
+        """
+        pos = self._find(self._arrays['sorted_uuids'],
+                         self._arrays['uuid_positions'],
+                         uuid.encode('utf-8'))
+        return self._get_stmt(pos, evidence) if pos is not None else None
+
+    def get_evidence(self, stmt_hash):
+        """Return the evidence of the Statement with a given shallow hash.
+
+        Parameters
+        ----------
+        stmt_hash : int
+            The shallow hash of a Statement.
+
+        Returns
+        -------
+        list[indra.statements.Evidence] or None
+            The evidence of the Statement with the given hash or None if it
+            is not in the store.
+        """
+        pos = self._find(self._arrays['sorted_hashes'],
+                         self._arrays['hash_positions'], stmt_hash)
+        return self._get_evidence(pos) if pos is not None else None
+
+    def iter_stmts(self, stmt_type=None, evidence=True):
+        """Yield the Statements in the store in their original order.
+
+        Parameters
+        ----------
+        stmt_type : Optional[str]
+            If given, only Statements of this type (e.g., Phosphorylation)
+            are decoded and returned. Note that subclasses of the type
+            are not included.
+        evidence : Optional[bool]
+            If True, the evidence of each Statement is also decoded,
+            otherwise Statements are returned without evidence.
+            Default: True
+
+        Yields
+        ------
+        indra.statements.Statement
+            The Statements in the store.
+        """
+        if stmt_type is None:
+            positions = range(len(self))
+        elif stmt_type not in self.stmt_types:
+            return
+        else:
+            type_id = self.stmt_types.index(stmt_type)
+            positions = \
+                numpy.flatnonzero(self._arrays['types'] == type_id).tolist()
+        for pos in positions:
+            yield self._get_stmt(pos, evidence)
+
+    @staticmethod
+    def _find(sorted_keys, positions, key):
+        idx = numpy.searchsorted(sorted_keys, key)
+        if idx < len(sorted_keys) and sorted_keys[idx] == key:
+            return int(positions[idx])
+        return None
+
+    def _get_stmt(self, pos, evidence):
+        start = self._arrays['offsets'][pos]
+        ev_start = self._arrays['ev_offsets'][pos]
+        stmt_json = self._loads(self._data[start:ev_start].tobytes())
+        stmt = stmts_from_json([stmt_json])[0]
+        if evidence:
+            stmt.evidence = self._get_evidence(pos)
+        return stmt
+
+    def _get_evidence(self, pos):
+        ev_start = self._arrays['ev_offsets'][pos]
+        end = self._arrays['offsets'][pos + 1]
+        return [Evidence._from_json(ev) for ev in
+                self._loads(self._data[ev_start:end].tobytes())]
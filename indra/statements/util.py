@@ -3,14 +3,127 @@ from builtins import dict, str
 from future.utils import python_2_unicode_compatible
 
 
-__all__ = ['make_hash']
+__all__ = ['make_hash', 'matches_key_cache']
 
 
+import functools
+import threading
 from hashlib import md5
+from contextlib import contextmanager
 
 
 def make_hash(s, n_bytes):
     """Make the hash from a matches key."""
     raw_h = int(md5(s.encode('utf-8')).hexdigest()[:n_bytes], 16)
     # Make it a signed int.
-    return 16**n_bytes//2 - raw_h
\ No newline at end of file
+    return 16**n_bytes//2 - raw_h
+
+
+# The matches keys memoized while a matches_key_cache context is active
+# are kept per thread
+_key_cache_state = threading.local()
+# The key attributes of objects, by class and attribute names
+_key_attrs = {}
+
+
+@contextmanager
+def matches_key_cache():
+    """Return a context within which Statement matches keys are memoized.
+
+    Within the context, the matches key of each Statement is computed only
+    once. A memoized key is only reused if the key attributes of the
+    Statement and its Agents are the same objects as when the key was
+    computed, and the lists and dicts among them (e.g., db_refs, mods or the
+    members of a Complex) have the same entries. Changes to the attributes
+    of condition objects (e.g., a ModCondition or a BoundCondition) made in
+    place are not detected, and these objects should be replaced instead.
+    The memoized keys are kept separately for each thread, nested contexts
+    share the keys of the outermost context in the thread, and the keys are
+    discarded when it exits.
+
+    Examples
+    --------
+    >>> from indra.statements import Agent, Phosphorylation
+    >>> stmt = Phosphorylation(Agent('MAP2K1'), Agent('MAPK1'))
+    >>> with matches_key_cache():
+    ...     key = stmt.matches_key()
+    ...     assert stmt.matches_key() is key
+    """
+    if getattr(_key_cache_state, 'keys', None) is not None:
+        yield
+        return
+    _key_cache_state.keys = {}
+    try:
+        yield
+    finally:
+        _key_cache_state.keys = None
+
+
+def _get_key_state(obj):
+    state = []
+    _add_key_state(obj, state)
+    return tuple(state)
+
+
+def _add_key_state(obj, state):
+    # The state of the Agents (and other Concepts and Statements) that an
+    # object refers to is added to its own, to be checked in one go
+    attr_dict = obj.__dict__
+    state.append(len(attr_dict))
+    for attr in _get_key_attrs(obj):
+        value = attr_dict.get(attr)
+        state.append(value)
+        if type(value) is dict:
+            state.append(len(value))
+            state += value
+            state += value.values()
+        elif type(value) is list:
+            state.append(len(value))
+            for element in value:
+                state.append(element)
+                if hasattr(element, '_non_key_attrs'):
+                    _add_key_state(element, state)
+        elif hasattr(value, '_non_key_attrs'):
+            _add_key_state(value, state)
+
+
+def _get_key_attrs(obj):
+    # Objects of the same class with the same attributes have the same key
+    # attributes
+    attrs_id = (type(obj), tuple(obj.__dict__))
+    attrs = _key_attrs.get(attrs_id)
+    if attrs is None:
+        attrs = tuple(attr for attr in attrs_id[1]
+                      if attr[0] != '_' and attr not in obj._non_key_attrs)
+        _key_attrs[attrs_id] = attrs
+    return attrs
+
+
+def cached_key(func):
+    """Return a key method that is memoized in a matches_key_cache context."""
+    @functools.wraps(func)
+    def wrapper(self):
+        keys = getattr(_key_cache_state, 'keys', None)
+        if keys is None:
+            return func(self)
+        # Tuples compare their elements by identity first so this is fast
+        # for unchanged objects
+        state = _get_key_state(self)
+        entry = keys.get(id(self))
+        if entry is not None and entry[0] is self and entry[1] == state:
+            return entry[2]
+        key = func(self)
+        # The object is kept so that its ID can't be reused by another
+        # object while the context is active
+        keys[id(self)] = (self, state, key)
+        return key
+    wrapper._cached_key = True
+    return wrapper
+
+
+def cache_key_methods(cls, names):
+    """Make the given key methods defined by a class memoized."""
+    for name in names:
+        func = cls.__dict__.get(name)
+        if func is not None and not getattr(func, '_cached_key', False):
+            setattr(cls, name, cached_key(func))
@@ -226,6 +226,40 @@ def test_filter_gene_list_families():
     assert st17 in stmts_out
 
 
+def test_filter_with_index():
+    stmts = [st1, st2, st3, st4, st5, st6, st7, st8, st9, st10, st16, st17,
+             st18, st19, st20, st21]
+    index = ac.StatementIndex(stmts)
+    filters = [(ac.filter_grounded_only, [], {}),
+               (ac.filter_genes_only, [], {}),
+               (ac.filter_genes_only, [], {'specific_only': True}),
+               (ac.filter_gene_list, [['a', 'b', 'd'], 'all'], {}),
+               (ac.filter_gene_list, [['d'], 'one'], {}),
+               (ac.filter_gene_list, [['a', 'd'], 'all'], {'invert': True}),
+               (ac.filter_concept_names, [['a', 'b'], 'all'], {}),
+               (ac.filter_concept_names, [['e'], 'one'], {'invert': True}),
+               (ac.filter_by_db_refs, ['HGNC', ['1234'], 'one'], {}),
+               (ac.filter_by_db_refs, ['UP', ['P15056'], 'all'],
+                {'invert': True})]
+    for stmts_in in [stmts, stmts[::2]]:
+        for filter_fun, args, kwargs in filters:
+            st_out = filter_fun(stmts_in, *args, **kwargs)
+            st_out_index = filter_fun(stmts_in, *args, index=index, **kwargs)
+            assert st_out == st_out_index, filter_fun
+    # Statements not in the index are filtered without the index
+    st_out = ac.filter_concept_names([st1, st11], ['a', 'b'], 'all',
+                                     index=index)
+    assert st_out == [st1]
+
+    assert list(index.get_positions_by_name('d')) == [1, 2, 5]
+    assert list(index.get_positions_by_grounding('FPLX', 'ERK')) == [9, 11]
+    assert len(index.get_positions_by_type(Phosphorylation)) == len(stmts)
+    # Bound conditions without an Agent are not indexed
+    a = Agent('a', bound_conditions=[BoundCondition(None)])
+    index = ac.StatementIndex([Phosphorylation(a, Agent('b'))])
+    assert list(index.get_positions_by_name('a')) == [0]
+
+
 def test_run_preassembly():
     st_out = ac.run_preassembly([st1, st3, st5, st6])
     assert len(st_out) == 2
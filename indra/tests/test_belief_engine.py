@@ -2,7 +2,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
 from nose.tools import raises
 from indra.statements import *
-from indra.belief import BeliefEngine, load_default_probs, _get_belief_package,\
+from indra.belief import BeliefEngine, load_default_probs, \
     sample_statements, evidence_random_noise_prior, tag_evidence_subtype, \
     SimpleScorer
 from indra.belief import wm_scorer, BayesianScorer
@@ -126,50 +126,6 @@ def test_hierarchy_probs4():
     assert_close_enough(st4.belief, 1-0.35*(0.05 + 0.3*0.3*0.3))
 
 
-def test_get_belief_package1():
-    matches_fun = lambda st: st.matches_key()
-    st1 = Phosphorylation(None, Agent('a'), evidence=[ev1])
-    package = _get_belief_package(st1, matches_fun)
-    assert len(package) == 1
-    assert package[0][0] == st1.matches_key()
-
-
-def test_get_belief_package2():
-    st1 = Phosphorylation(None, Agent('A1'), evidence=[ev1])
-    st2 = Phosphorylation(None, Agent('A'), evidence=[ev2])
-    st1.supported_by = [st2]
-    st2.supports = [st1]
-    matches_fun = lambda st: st.matches_key()
-    package = _get_belief_package(st1, matches_fun)
-    assert len(package) == 1
-    assert package[0].statement_key == st1.matches_key()
-    assert len(package[0].evidences) == 1, package[0][1]
-    assert package[0].evidences[0].source_api == 'reach'
-    package = _get_belief_package(st2, matches_fun)
-    assert len(package) == 2, package
-    assert package[0].statement_key == st1.matches_key()
-    assert package[1].statement_key == st2.matches_key()
-
-
-def test_get_belief_package3():
-    matches_fun = lambda st: st.matches_key()
-    st1 = Phosphorylation(Agent('B'), Agent('A1'), evidence=[ev1])
-    st2 = Phosphorylation(None, Agent('A1'), evidence=[ev2])
-    st3 = Phosphorylation(None, Agent('A'), evidence=[ev4])
-    st1.supported_by = [st2, st3]
-    st2.supported_by = [st3]
-    st2.supports = [st1]
-    st3.supports = [st1, st2]
-    package = _get_belief_package(st1, matches_fun)
-    assert len(package) == 1
-    package = _get_belief_package(st2, matches_fun)
-    assert len(package) == 2
-    package = _get_belief_package(st3, matches_fun)
-    assert len(package) == 3
-    sources = [pkg.evidences[0].source_api for pkg in package]
-    assert sources == ['reach', 'trips', 'biopax']
-
-
 def test_default_probs():
     """Make sure default probs are set with empty constructor."""
     be = BeliefEngine()
@@ -389,5 +345,85 @@ def test_cycle():
     engine.set_hierarchy_probs([st1, st2])
 
 
+def test_hierarchy_probs_diamond():
+    # The top statement is supported through two paths but its evidence
+    # should only be counted once
+    st_top = Phosphorylation(None, Agent('a'), evidence=[ev1])
+    st_mid1 = Phosphorylation(Agent('b'), Agent('a'), evidence=[ev1])
+    st_mid2 = Phosphorylation(None, Agent('a'), 'S', evidence=[ev1])
+    st_bottom = Phosphorylation(Agent('b'), Agent('a'), 'S',
+                                evidence=[ev1])
+    st_top.supported_by = [st_mid1, st_mid2]
+    st_mid1.supports = [st_top]
+    st_mid1.supported_by = [st_bottom]
+    st_mid2.supports = [st_top]
+    st_mid2.supported_by = [st_bottom]
+    st_bottom.supports = [st_mid1, st_mid2]
+    engine = BeliefEngine()
+    engine.set_hierarchy_probs([st_top, st_mid1, st_mid2, st_bottom])
+    rand = default_probs['rand']['reach']
+    syst = default_probs['syst']['reach']
+    assert_close_enough(st_top.belief, 1 - (rand + syst))
+    assert_close_enough(st_mid1.belief, 1 - (rand ** 2 + syst))
+    assert_close_enough(st_mid2.belief, 1 - (rand ** 2 + syst))
+    assert_close_enough(st_bottom.belief, 1 - (rand ** 4 + syst))
+
+
+def test_update_hierarchy_probs():
+    st_top = Phosphorylation(None, Agent('a'), evidence=[ev1])
+    st_mid = Phosphorylation(Agent('b'), Agent('a'), evidence=[ev1])
+    st_bottom = Phosphorylation(Agent('b'), Agent('a'), 'S',
+                                evidence=[ev1])
+    st_other = Phosphorylation(Agent('c'), Agent('a'), evidence=[ev1])
+    st_top.supported_by = [st_mid, st_other]
+    st_mid.supports = [st_top]
+    st_mid.supported_by = [st_bottom]
+    st_bottom.supports = [st_mid]
+    st_other.supports = [st_top]
+    stmts = [st_top, st_mid, st_bottom, st_other]
+    engine = BeliefEngine(incremental=True)
+    engine.set_hierarchy_probs(stmts)
+    # Only the changed statement and the ones supporting it are updated
+    st_mid.evidence.append(ev2)
+    updated = engine.update_hierarchy_probs([st_mid.get_hash()])
+    assert set(updated) == {st_mid, st_bottom}
+    beliefs = [st.belief for st in stmts]
+    BeliefEngine().set_hierarchy_probs(stmts)
+    for st, belief in zip(stmts, beliefs):
+        assert_close_enough(belief, st.belief)
+
+
+@raises(ValueError)
+def test_update_hierarchy_probs_not_incremental():
+    engine = BeliefEngine()
+    st = Phosphorylation(None, Agent('a'), evidence=[ev1])
+    engine.set_hierarchy_probs([st])
+    engine.update_hierarchy_probs([st.get_hash()])
+
+
+def test_score_statements():
+    ev_reactome = Evidence(source_api='biopax',
+                           annotations={'source_sub_id': 'reactome'})
+    ev_neg = Evidence(source_api='trips', epistemics={'negated': True})
+    evidences = [[], [ev1], [ev1, ev2, ev1], [ev_reactome, ev4, ev1],
+                 [ev1, ev_neg], [ev_neg]]
+    stmts = [Phosphorylation(None, Agent('a'), evidence=evs)
+             for evs in evidences]
+    extra_evidence = [[ev2], [], [ev4], None, [ev_neg], [ev1]]
+    scorers = [SimpleScorer(subtype_probs={'biopax': {'reactome': 0.4}}),
+               BayesianScorer({'reach': [5, 3], 'trips': [3, 3],
+                               'biopax': [5, 1]}, {})]
+    for scorer in scorers:
+        beliefs = scorer.score_statements(stmts)
+        assert len(beliefs) == len(stmts)
+        for stmt, belief in zip(stmts, beliefs):
+            assert_close_enough(belief, scorer.score_statement(stmt))
+        beliefs = scorer.score_statements(stmts, extra_evidence)
+        for stmt, extra_ev, belief in zip(stmts, extra_evidence, beliefs):
+            assert_close_enough(belief,
+                                scorer.score_statement(stmt, extra_ev))
+    assert scorers[0].score_statements([]) == []
+
+
 def assert_close_enough(b1, b2):
     assert abs(b1 - b2) < 1e-6, 'Got %.6f, Expected: %.6f' % (b1, b2)
@@ -1,8 +1,10 @@
+from copy import deepcopy
 from indra.preassembler.grounding_mapper import default_mapper as gm
-from indra.preassembler.grounding_mapper import GroundingMapper
+from indra.preassembler.grounding_mapper import GroundingMapper, \
+    default_grounding_map
 from indra.preassembler.grounding_mapper.analysis import *
 from indra.preassembler.grounding_mapper.gilda import ground_statements, \
-    get_gilda_models, ground_statement
+    get_gilda_models, ground_statement, get_groundings
 from indra.statements import Agent, Phosphorylation, Complex, Inhibition, \
     Evidence, BoundCondition
 from indra.util import unicode_strs
@@ -20,6 +22,25 @@ def test_simple_mapping():
     assert mapped_akt.db_refs['FPLX'] == 'AKT'
 
 
+def test_map_agent_cache():
+    gmapper = GroundingMapper(default_grounding_map)
+    akt1 = Agent('pkbA', db_refs={'TEXT': 'Akt', 'UP': 'XXXXXX'})
+    akt2 = Agent('pkbB', db_refs={'TEXT': 'Akt', 'UP': 'XXXXXX'})
+    xyz1 = Agent('x1', db_refs={'TEXT': 'xyz'})
+    xyz2 = Agent('x2', db_refs={'TEXT': 'xyz'})
+    stmts = [Phosphorylation(xyz, akt) for xyz, akt in ((xyz1, akt1),
+                                                        (xyz2, akt2))]
+    mapped_stmts = gmapper.map_stmts(stmts)
+    assert len(gmapper.agent_cache) == 2
+    st1, st2 = mapped_stmts
+    assert st1.sub.name == st2.sub.name == 'AKT'
+    assert st1.sub.db_refs == st2.sub.db_refs
+    assert st1.sub.db_refs is not st2.sub.db_refs
+    # The names of Agents that aren't renamed by the mapping are kept
+    assert st1.enz.name == 'x1'
+    assert st2.enz.name == 'x2'
+
+
 def test_map_standardize_up_hgnc():
     a1 = Agent('MAPK1', db_refs={'HGNC': '6871'})
     a2 = Agent('MAPK1', db_refs={'UP': 'P28482'})
@@ -355,6 +376,22 @@ def test_adeft_mapping():
     assert 'GO:GO:0005783' in annotations['agents']['adeft'][1]
 
 
+def test_adeft_mapping_keeps_input_evidence():
+    er = Agent('ER', db_refs={'TEXT': 'ER'})
+    pmid = '28369137'
+    stmt = Inhibition(None, er, evidence=[Evidence(pmid=pmid,
+                                                   text_refs={'PMID': pmid})])
+    annotations = deepcopy(stmt.evidence[0].annotations)
+    text_refs = deepcopy(stmt.evidence[0].text_refs)
+    mapped_stmt = gm.map_stmts([stmt])[0]
+    assert 'adeft' in mapped_stmt.evidence[0].annotations['agents']
+    # The disambiguation annotations are only added to the mapped Statement
+    assert stmt.evidence[0].annotations == annotations, \
+        stmt.evidence[0].annotations
+    assert stmt.evidence[0].text_refs == text_refs
+    assert stmt.obj.db_refs == {'TEXT': 'ER'}
+
+
 def test_adeft_mapping_non_pos():
     er = Agent('ER', db_refs={'TEXT': 'ER'})
     # This is an exact definition of a pos_label entry so we
@@ -441,6 +478,23 @@ def test_gilda_ground_ungrounded():
     assert grounded_stmts[0].sub.name == 'RAS'
 
 
+def test_gilda_ground_batch():
+    for mode in ['web', 'local']:
+        texts_contexts = [('MEK', None), ('Erk1', None), ('MEK', None)]
+        groundings = get_groundings(texts_contexts, mode=mode)
+        assert [gr for gr, _ in groundings] == \
+            [{'FPLX': 'MEK'}, {'HGNC': '6877'}, {'FPLX': 'MEK'}]
+        stmts = [Phosphorylation(Agent('x', db_refs={'TEXT': 'MEK'}),
+                                 Agent('y', db_refs={'TEXT': 'Erk1'}))
+                 for _ in range(3)]
+        grounded_stmts = ground_statements(stmts, mode=mode)
+        assert all(stmt.sub.name == 'MAPK3' and stmt.sub.db_refs['UP'] ==
+                   'P27361' for stmt in grounded_stmts)
+        # Agents grounded the same way don't share their db_refs
+        assert grounded_stmts[0].sub.db_refs is not \
+            grounded_stmts[1].sub.db_refs
+
+
 def test_get_gilda_models():
     models = get_gilda_models()
     assert 'NDR1' in models
@@ -117,3 +117,25 @@ def test_human_only():
     im.preassemble(filters=['human_only'])
     assert len(im.assembled_stmts) == 2, \
         (im.assembled_stmts[0].sub.db_refs, im.assembled_stmts[1].sub.db_refs)
+
+
+def test_incremental_preassemble():
+    im = IncrementalModel()
+    im.add_statements('12345', [stmt4])
+    im.preassemble(incremental=True)
+    assert len(im.assembled_stmts) == 1
+    pa = im.preassembler
+    assert pa is not None
+    im.add_statements('12346', [stmt3, stmt4])
+    im.preassemble(incremental=True)
+    # The preassembler state is kept and the duplicate is merged
+    assert im.preassembler is pa
+    assert len(im.assembled_stmts) == 2, im.assembled_stmts
+    braf_stmt = [st for st in im.assembled_stmts
+                 if st.sub.name == 'BRAF'][0]
+    raf_stmt = [st for st in im.assembled_stmts
+                if st.sub.name == 'RAF'][0]
+    assert len(raf_stmt.evidence) == 1
+    assert braf_stmt.supported_by == [raf_stmt]
+    assert raf_stmt.supports == [braf_stmt]
+    assert raf_stmt.belief > braf_stmt.belief
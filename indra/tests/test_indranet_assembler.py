@@ -2,7 +2,8 @@ import numpy as np
 import pandas as pd
 import networkx as nx
 from indra.statements import *
-from indra.assemblers.indranet.net import default_sign_dict
+from indra.assemblers.indranet.net import default_sign_dict, \
+    _simple_scorer_update, _complementary_belief
 from indra.assemblers.indranet import IndraNetAssembler, IndraNet
 
 
@@ -95,6 +96,21 @@ def test_from_df():
     assert net['b']['d'][0]['evidence_count'] == 0
 
 
+def test_from_df_extra_columns():
+    ia = IndraNetAssembler([st1, st2, st3])
+    df = ia.make_df().astype(object)
+    df['agA_loc'] = ['x%d' % i for i in range(len(df))]
+    df['weight'] = [0.5] * len(df)
+    df.loc[1, 'agB_name'] = None
+    net = IndraNet.from_df(df)
+    assert len(net.edges) == len(df) - 1
+    assert None not in net.nodes
+    # Nodes get the attributes of the first row they appear in
+    assert net.nodes['a']['agA_loc'] == 'x0'
+    assert 'agA_loc' not in net.nodes['b']
+    assert all(data['weight'] == 0.5 for _, _, data in net.edges(data=True))
+
+
 ab1 = Activation(Agent('a'), Agent('b'), evidence=[
     Evidence(source_api='sparser')])
 ab2 = Phosphorylation(Agent('a'), Agent('b'),evidence=[
@@ -127,10 +143,10 @@ def test_to_digraph():
             'Activation', 'Phosphorylation', 'Inhibition', 'IncreaseAmount'}
     assert all(digraph.edges[e].get('belief', False) for e in digraph.edges)
     assert all(isinstance(digraph.edges[e]['belief'],
-                          (float, np.longfloat)) for e in digraph.edges)
+                          (float, np.longdouble)) for e in digraph.edges)
     assert all(digraph.edges[e].get('weight', False) for e in digraph.edges)
     assert all(isinstance(digraph.edges[e]['weight'],
-                          (float, np.longfloat)) for e in digraph.edges)
+                          (float, np.longdouble)) for e in digraph.edges)
     digraph_from_df = IndraNet.digraph_from_df(df)
     assert nx.is_isomorphic(digraph, digraph_from_df)
 
@@ -158,11 +174,43 @@ def test_to_signed_graph():
     assert all(signed_graph.edges[e].get('belief', False) for e in
                signed_graph.edges)
     assert all(isinstance(signed_graph.edges[e]['belief'],
-                          (float, np.longfloat)) for e in signed_graph.edges)
+                          (float, np.longdouble)) for e in signed_graph.edges)
     assert all(signed_graph.edges[e].get('weight', False) for e in
                signed_graph.edges)
     assert all(isinstance(signed_graph.edges[e]['weight'],
-                          (float, np.longfloat)) for e in signed_graph.edges)
+                          (float, np.longdouble)) for e in signed_graph.edges)
+
+
+def test_flattening_methods():
+    ia = IndraNetAssembler([ab1, ab2, ab3, ab4, bc1, bc2, bc3, bc4])
+    net = IndraNet.from_df(ia.make_df())
+    # The beliefs of all edges are the same as those of the per-edge
+    # functions
+    for G in (net.to_digraph(), net.to_signed_graph()):
+        for e in G.edges:
+            assert G.edges[e]['belief'] == _simple_scorer_update(G, e)
+    # _complementary_belief changes the numpy error handling
+    with np.errstate():
+        for G in (net.to_digraph(flattening_method='complementary_belief'),
+                  net.to_signed_graph(
+                      flattening_method='complementary_belief')):
+            for e in G.edges:
+                assert G.edges[e]['belief'] == _complementary_belief(G, e)
+    G = net.to_digraph(flattening_method=lambda G, edge: len(
+        G.edges[edge]['statements']))
+    assert G.edges[('a', 'b')]['belief'] == 4
+
+
+def test_flattening_no_edges():
+    for flattening_method in ('simple_scorer', 'complementary_belief'):
+        G = IndraNet().to_digraph(flattening_method=flattening_method)
+        assert len(G.edges) == 0
+        # Statements without a sign are not added to the signed graph
+        ia = IndraNetAssembler([st5])
+        net = IndraNet.from_df(ia.make_df())
+        SG = net.to_signed_graph(flattening_method=flattening_method)
+        assert len(SG.nodes) == 3
+        assert len(SG.edges) == 0
 
 
 def _weight_mapping(G):
@@ -1594,6 +1594,52 @@ def test_signed_path():
     assert stmts6 == [[st2, st7], [st5], [st8]]
 
 
+def test_check_model_batch():
+    ia = IndraNetAssembler(statements)
+    signed_model = ia.make_model(graph_type='signed')
+    smc = SignedGraphModelChecker(signed_model)
+    # Several statements with the same targets are checked together
+    smc.add_statements(test_statements + test_statements[:3])
+    for n_jobs in [None, 2]:
+        results = smc.check_model(max_paths=2, n_jobs=n_jobs)
+        assert [stmt for stmt, _ in results] == smc.statements
+        for stmt, result in results:
+            single_result = smc.check_statement(stmt, max_paths=2)
+            assert result.result_code == single_result.result_code
+            assert result.paths == single_result.paths
+            assert [(pm.source_node, pm.length) for pm in
+                    result.path_metrics] == \
+                [(pm.source_node, pm.length) for pm in
+                 single_result.path_metrics]
+
+
+def test_signed_graph_cache():
+    import tempfile
+    ia = IndraNetAssembler(statements)
+    signed_model = ia.make_model(graph_type='signed')
+    cache_dir = tempfile.mkdtemp()
+    smc = SignedGraphModelChecker(signed_model, test_statements,
+                                  cache_dir=cache_dir)
+    results = smc.check_model()
+    fingerprint = smc.get_fingerprint()
+    assert os.path.exists(smc.get_cache_path(fingerprint))
+    # A new model checker of the same model loads the graph from the cache
+    cached_smc = SignedGraphModelChecker(signed_model, test_statements,
+                                         cache_dir=cache_dir)
+    assert cached_smc.get_fingerprint() == fingerprint
+    assert cached_smc.load_cached_graph(fingerprint)
+    assert list(cached_smc.graph.edges(data=True)) == \
+        list(smc.graph.edges(data=True))
+    assert set(cached_smc.nodes_to_agents) == set(smc.nodes_to_agents)
+    cached_results = cached_smc.check_model()
+    assert [(r.result_code, r.paths) for _, r in cached_results] == \
+        [(r.result_code, r.paths) for _, r in results]
+    # Another model has a different fingerprint
+    signed_model.add_edge('A', 'E', sign=0, belief=0.9)
+    assert SignedGraphModelChecker(signed_model).get_fingerprint() != \
+        fingerprint
+
+
 def test_pybel_path():
     pba = PybelAssembler(statements)
     pybel_model = pba.make_model()
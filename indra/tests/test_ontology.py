@@ -1,7 +1,11 @@
+import os
 import copy
+import tempfile
 from indra.statements import Agent
+from indra.ontology import IndraOntology
 from indra.ontology.bio import bio_ontology
 from indra.ontology.world import world_ontology
+from indra.ontology.compact import CompactOntology
 from indra.databases import go_client, hgnc_client
 from indra.ontology.standardize import \
     standardize_agent_name, standardize_db_refs, standardize_name_db_refs
@@ -122,6 +126,100 @@ def test_get_parents():
     # assert ampk in p3
 
 
+def test_ancestor_index():
+    assert bio_ontology.ancestor_index is not None
+    for ns, id in [('HGNC', '9376'), ('HGNC', '6871'),
+                   ('HGNC', hgnc_client.get_hgnc_id('RICTOR')),
+                   ('CHEBI', 'CHEBI:87307'), ('FPLX', 'AMPK')]:
+        assert set(bio_ontology.get_parents(ns, id)) == \
+            set(bio_ontology.descendants_rel(ns, id, {'isa', 'partof'}))
+    assert bio_ontology.ancestor_index.isrel('HGNC:6871', 'FPLX:MAPK',
+                                             {'isa'})
+    assert not bio_ontology.ancestor_index.isrel('HGNC:6871', 'FPLX:JNK',
+                                                 {'isa', 'partof'})
+    assert not bio_ontology.isa('HGNC', 'xxx', 'FPLX', 'MAPK')
+
+
+class _SmallOntology(IndraOntology):
+    name = 'small'
+    version = '1.0'
+
+    def initialize(self):
+        self.add_edges_from([('HGNC:1', 'FPLX:A', {'type': 'isa'}),
+                             ('HGNC:2', 'FPLX:A', {'type': 'isa'}),
+                             ('FPLX:A', 'FPLX:B', {'type': 'partof'})])
+        self._initialized = True
+
+
+def test_ancestor_index_fingerprint():
+    ontology = _SmallOntology()
+    ontology.initialize()
+    with tempfile.TemporaryDirectory() as path:
+        ontology._build_ancestor_index(path)
+        assert ontology.get_parents('HGNC', '1') == \
+            [('FPLX', 'A'), ('FPLX', 'B')]
+        assert ontology._load_ancestor_index(path)
+        assert not [fname for fname in os.listdir(path)
+                    if fname.endswith('.tmp')]
+        # The index isn't loaded for an ontology that has changed
+        ontology.add_edge('HGNC:3', 'FPLX:B', type='isa')
+        assert not ontology._load_ancestor_index(path)
+        assert ontology.get_parents('HGNC', '3') == [('FPLX', 'B')]
+        ontology._build_ancestor_index(path)
+        assert ontology._load_ancestor_index(path)
+        assert ontology.get_parents('HGNC', '3') == [('FPLX', 'B')]
+
+
+def test_compact_ontology_fingerprint():
+    source_ontology = _SmallOntology()
+    source_ontology.initialize()
+    with tempfile.TemporaryDirectory() as path:
+        ontology = CompactOntology(
+            path, source=lambda: source_ontology,
+            source_fingerprint=source_ontology.get_fingerprint)
+        ontology.initialize()
+        assert ontology.get_fingerprint() == source_ontology.get_fingerprint()
+        assert not ontology.isa('HGNC', '3', 'FPLX', 'B')
+        # The files are rebuilt once the source ontology has changed
+        source_ontology.add_edge('HGNC:3', 'FPLX:B', type='isa')
+        ontology = CompactOntology(
+            path, source=lambda: source_ontology,
+            source_fingerprint=source_ontology.get_fingerprint)
+        ontology.initialize()
+        assert ontology.get_fingerprint() == source_ontology.get_fingerprint()
+        assert ontology.isa('HGNC', '3', 'FPLX', 'B')
+        # Without a source, out of date files aren't loaded
+        source_ontology.add_edge('HGNC:4', 'FPLX:B', type='isa')
+        ontology = CompactOntology(
+            path, source_fingerprint=source_ontology.get_fingerprint)
+        try:
+            ontology.initialize()
+            assert False, 'Out of date compact ontology was loaded'
+        except ValueError:
+            pass
+
+
+def test_compact_ontology():
+    path = tempfile.mkdtemp()
+    ontology = CompactOntology(path, source=lambda: bio_ontology)
+    ontology.initialize()
+    for ns, id in [('HGNC', '9376'), ('HGNC', '6871'), ('FPLX', 'MAPK'),
+                   ('CHEBI', 'CHEBI:87307'), ('UP', 'P28482')]:
+        for rel_types in [{'isa', 'partof'}, {'xref'}]:
+            assert set(ontology.child_rel(ns, id, rel_types)) == \
+                set(bio_ontology.child_rel(ns, id, rel_types))
+            assert set(ontology.parent_rel(ns, id, rel_types)) == \
+                set(bio_ontology.parent_rel(ns, id, rel_types))
+        assert ontology.get_name(ns, id) == bio_ontology.get_name(ns, id)
+        assert set(ontology.get_mappings(ns, id)) == \
+            set(bio_ontology.get_mappings(ns, id))
+    assert ontology.get_id_from_name('HGNC', 'MAPK1') == ('HGNC', '6871')
+    assert ontology.get_id_from_name('HGNC', 'xxx') is None
+    assert ontology.isa('HGNC', '6871', 'FPLX', 'MAPK')
+    assert ontology.get_polarity('GO', 'GO:0008283') == \
+        bio_ontology.get_polarity('GO', 'GO:0008283')
+
+
 def test_chebi_isa():
     assert bio_ontology.isa('CHEBI', 'CHEBI:87307', 'CHEBI', 'CHEBI:36962')
 
@@ -4,6 +4,7 @@ import networkx as nx
 from indra.explanation.pathfinding.pathfinding import bfs_search, \
     shortest_simple_paths, bfs_search_multiple_nodes, open_dijkstra_search, \
     simple_paths_with_constraints
+from indra.explanation.pathfinding.compiled_graph import CompiledGraph
 from indra.explanation.model_checker.model_checker import \
     signed_edges_to_signed_nodes
 
@@ -191,6 +192,44 @@ def test_signed_bfs():
     assert len(paths) == 13, len(paths)
 
 
+def test_compiled_graph():
+    seg, sng, all_ns = _setup_signed_graph()
+    sng.add_edge(('B3', INT_PLUS), ('Z1', INT_PLUS),
+                 belief=0.6, weight=-np.log(0.6))
+    cg = CompiledGraph(sng)
+    assert len(cg) == len(sng)
+    target = ('D1', INT_PLUS)
+
+    # Searches on the compiled graph yield the same paths in the same order
+    for kwargs in [dict(reverse=True, depth_limit=5, node_filter=all_ns,
+                        sign=INT_PLUS),
+                   dict(reverse=True, depth_limit=5, terminal_ns=['a'],
+                        sign=INT_MINUS),
+                   dict(reverse=True, depth_limit=3, max_per_node=1)]:
+        assert list(bfs_search(cg, target, **kwargs)) == \
+            list(bfs_search(sng, target, **kwargs))
+    assert list(open_dijkstra_search(cg, target, reverse=True,
+                                     weight='weight')) == \
+        list(open_dijkstra_search(sng, target, reverse=True,
+                                  weight='weight'))
+    source = ('B3', INT_PLUS)
+    for weight in [None, 'weight']:
+        assert list(shortest_simple_paths(cg, source, target,
+                                          weight=weight)) == \
+            list(shortest_simple_paths(sng, source, target, weight=weight))
+
+    # Nodes received by the search are ignored from then on
+    gen = bfs_search(cg, target, reverse=True, depth_limit=5)
+    first = next(gen)
+    paths = [first] + [p for p in gen]
+    gen = bfs_search(cg, target, reverse=True, depth_limit=5)
+    first = next(gen)
+    ign_paths = [first, gen.send(([('C1', INT_MINUS)], []))] + \
+        [p for p in gen]
+    assert all(('C1', INT_MINUS) not in p for p in ign_paths[2:])
+    assert len(ign_paths) < len(paths)
+
+
 def test_shortest_simple_paths_mod_unsigned():
     dg, all_ns = _setup_unsigned_graph()
     dg.add_edge('B1', 'A3', belief=0.7, weight=-np.log(0.7))  # Add long path
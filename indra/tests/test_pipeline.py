@@ -1,5 +1,10 @@
-from indra.pipeline import AssemblyPipeline, RunnableArgument
+import json
+import shutil
+import tempfile
+from copy import deepcopy
+from indra.pipeline import AssemblyPipeline, RunnableArgument, StepProfiler
 from indra.pipeline.pipeline import jsonify_arg_input
+from indra.pipeline.parallel import run_parallel, map_stmts_parallel
 from indra.tests.test_assemble_corpus import st1, st2, st3, st4
 from indra.tools.assemble_corpus import *
 from indra.preassembler.custom_preassembly import location_matches, \
@@ -38,6 +43,113 @@ def test_running_pipeline():
     assert len(assembled_stmts2) == 2
 
 
+def test_running_pipeline_stream():
+    steps = [
+        {'function': 'filter_no_hypothesis'},
+        {'function': 'filter_grounded_only'},
+        {'function': 'run_preassembly', 'kwargs': {'return_toplevel': False}},
+        {'function': 'filter_top_level'},
+        {'function': 'filter_by_type', 'args': [{'stmt_type': 'Activation'}],
+         'kwargs': {'invert': True}}
+    ]
+    ap = AssemblyPipeline(steps)
+    assembled_stmts = ap.run(stmts)
+    # The Statements can be given as a generator when streaming
+    streamed_stmts = ap.run((st for st in stmts), stream=True)
+    assert isinstance(streamed_stmts, list)
+    assert [st.get_hash() for st in streamed_stmts] == \
+        [st.get_hash() for st in assembled_stmts]
+    assert len(streamed_stmts) == 2, streamed_stmts
+
+
+def test_running_pipeline_cache():
+    cache_dir = tempfile.mkdtemp()
+    ap = AssemblyPipeline()
+    ap.append(filter_no_hypothesis)
+    ap.append(filter_grounded_only)
+    assembled_stmts = ap.run(stmts, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+    # The second run loads the cached result of the last step
+    cached_stmts = ap.run(stmts, cache_dir=cache_dir)
+    assert [st.get_hash() for st in cached_stmts] == \
+        [st.get_hash() for st in assembled_stmts]
+    # Changing the arguments of the last step reruns only that step
+    ap.steps[1]['kwargs'] = {'score_threshold': 0.5}
+    ap.run(stmts, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 3
+    # Different input Statements have different cached results
+    ap.run(stmts[:2], cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 5
+    # So do different kwargs of the pipeline
+    ap.run(stmts[:2], cache_dir=cache_dir, score_threshold=0.7)
+    assert len(os.listdir(cache_dir)) == 7
+    shutil.rmtree(cache_dir)
+
+
+def test_running_pipeline_cache_belief():
+    cache_dir = tempfile.mkdtemp()
+    ap = AssemblyPipeline()
+    ap.append(filter_belief, 0.5)
+    high_belief_stmts = deepcopy(stmts)
+    low_belief_stmts = deepcopy(stmts)
+    for stmt in low_belief_stmts:
+        stmt.belief = 0.1
+    assert len(ap.run(high_belief_stmts, cache_dir=cache_dir)) == 4
+    # Statements that only differ in their beliefs don't share the
+    # cached result
+    assert ap.run(low_belief_stmts, cache_dir=cache_dir) == []
+    assert len(os.listdir(cache_dir)) == 2
+    shutil.rmtree(cache_dir)
+
+
+def test_running_pipeline_profiler():
+    ap = AssemblyPipeline()
+    ap.append(filter_no_hypothesis)
+    ap.append(filter_grounded_only)
+    profiler = StepProfiler()
+    ap.run(stmts, profiler=profiler)
+    report = profiler.get_report()
+    assert [record['function'] for record in report['steps']] == \
+        ['filter_no_hypothesis', 'filter_grounded_only']
+    assert report['steps'][1]['stmts_in'] == 4
+    assert report['steps'][1]['stmts_out'] == 2
+    assert report['steps'][1]['evidence_out'] == 2
+    assert report['totals']['comparisons'] == 0
+    assert report['totals']['wall_time'] >= 0
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_running_pipeline_parallel():
+    ap = AssemblyPipeline()
+    ap.append(filter_no_hypothesis)
+    ap.append(filter_grounded_only)
+    ap.append(strip_agent_context)
+    assembled_stmts = ap.run(stmts)
+    assert len(assembled_stmts) == 2
+    for kwargs in [{'n_jobs': 2}, {'n_jobs': 2, 'stream': True}]:
+        parallel_stmts = ap.run(stmts, **kwargs)
+        assert [st.get_hash() for st in parallel_stmts] == \
+            [st.get_hash() for st in assembled_stmts]
+    # Streamable functions can also be run in parallel directly
+    parallel_stmts = run_parallel(filter_grounded_only, stmts, n_jobs=2)
+    assert [st.uuid for st in parallel_stmts] == \
+        [st.uuid for st in filter_grounded_only(stmts)]
+    # Functions using a cache are applied in the current process
+    for use_cache in [False, True]:
+        specs = [('map', _get_pid_setter, [], {'use_cache': use_cache})]
+        stmts_out = map_stmts_parallel(deepcopy(stmts), specs, n_jobs=2)
+        assert len(stmts_out) == len(stmts)
+        in_process = [st.belief == os.getpid() for st in stmts_out]
+        assert all(in_process) if use_cache else not any(in_process)
+
+
+def _get_pid_setter(use_cache=False):
+    def set_pid(stmt):
+        stmt.belief = os.getpid()
+        return stmt
+    return set_pid
+
+
 def test_pipeline_methods():
     ap = AssemblyPipeline()
     assert len(ap) == 0
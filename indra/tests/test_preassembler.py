@@ -1,9 +1,13 @@
 import os
+import tempfile
 
 from indra.preassembler import Preassembler, render_stmt_graph, \
-    flatten_evidence, flatten_stmts, bio_ontology_refinement_filter
+    flatten_evidence, flatten_stmts, bio_ontology_refinement_filter, \
+    ontology_refinement_filter, ontology_refinement_filter_by_stmt_type, \
+    _OntologyRefinementIndex
 from indra.sources import reach
 from indra.statements import *
+from indra.belief import BeliefEngine
 from indra.ontology.bio import bio_ontology
 from indra.ontology.world import world_ontology
 
@@ -32,6 +36,24 @@ def test_duplicates_copy():
     assert len(stmts[1].evidence) == 1
 
 
+def test_combine_combined_duplicates():
+    src = Agent('SRC', db_refs={'HGNC': '11283'})
+    ras = Agent('RAS', db_refs={'FA': '03663'})
+    st1 = Phosphorylation(src, ras, evidence=[Evidence(text='Text 1')])
+    st2 = Phosphorylation(src, ras, evidence=[Evidence(text='Text 1')])
+    pa = Preassembler(bio_ontology)
+    unique_stmts = pa.combine_duplicate_stmts([st1]) + \
+        pa.combine_duplicate_stmts([st2])
+    # Evidences that were combined from different raw statements before
+    # are kept along with their prior UUIDs
+    unique_stmts = pa.combine_duplicate_stmts(unique_stmts)
+    assert len(unique_stmts) == 1
+    assert len(unique_stmts[0].evidence) == 2
+    assert sorted(sorted(set(ev.annotations['prior_uuids']))
+                  for ev in unique_stmts[0].evidence) == \
+        sorted([[st1.uuid], [st2.uuid]])
+
+
 def test_duplicates_sorting():
     mc = ModCondition('phosphorylation')
     map2k1_1 = Agent('MAP2K1', mods=[mc])
@@ -87,6 +109,37 @@ def test_combine_duplicates():
     assert num_evs[3] == 4, num_evs[3]
 
 
+def test_iter_combine_duplicate_stmts():
+    raf = Agent('RAF1', db_refs={'TEXT': 'Raf'})
+    mek = Agent('MEK1')
+    erk = Agent('ERK2')
+    stmts = [Phosphorylation(raf, mek, evidence=Evidence(text='foo')),
+             Phosphorylation(raf, mek, evidence=Evidence(text='bar')),
+             Phosphorylation(raf, mek, evidence=Evidence(text='bar')),
+             Phosphorylation(mek, erk, evidence=Evidence(text='foo2')),
+             Dephosphorylation(mek, erk, evidence=Evidence(text='bar2'))]
+    uuids = {stmt.uuid for stmt in stmts}
+    pa = Preassembler(bio_ontology)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fname = os.path.join(tmp_dir, 'stmts.jsonl')
+        stmts_to_json_file(stmts, fname, format='jsonl')
+        out_fname = os.path.join(tmp_dir, 'unique_stmts.jsonl')
+        assert pa.combine_duplicate_stmts_to_jsonl(fname, out_fname,
+                                                   num_buckets=2) == 3
+        unique_stmts = stmts_from_json_file(out_fname, format='jsonl')
+    num_evs = {stmt.get_hash(): len(stmt.evidence) for stmt in unique_stmts}
+    assert num_evs == {stmts[0].get_hash(): 2, stmts[3].get_hash(): 1,
+                       stmts[4].get_hash(): 1}, num_evs
+    for stmt in unique_stmts:
+        for ev in stmt.evidence:
+            assert set(ev.annotations['prior_uuids']) <= uuids
+            assert ev.annotations['agents']['raw_text'] in \
+                ([None, 'Raf'], ['Raf', None], [None, None])
+    # Statements can also be streamed from an iterator
+    unique_stmts = list(pa.iter_combine_duplicate_stmts(iter(stmts)))
+    assert {stmt.get_hash() for stmt in unique_stmts} == set(num_evs)
+
+
 def test_combine_evidence_exact_duplicates():
     raf = Agent('RAF1')
     mek = Agent('MEK1')
@@ -1026,6 +1079,99 @@ def test_split_idx():
     assert pa._comparison_counter == 1
 
 
+def test_refinement_poolsize():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    stmts = [Phosphorylation(Agent('x'), ras),
+             Phosphorylation(Agent('x'), kras),
+             Phosphorylation(Agent('x'), hras),
+             Activation(Agent('x'), ras),
+             Activation(Agent('x'), kras)]
+    pa = Preassembler(bio_ontology, stmts)
+    maps = pa._generate_id_maps(pa.combine_duplicates())
+    # Setting size_cutoff to 0 makes sure that all statement types
+    # are sent to worker processes
+    pa_mp = Preassembler(bio_ontology, stmts)
+    maps_mp = pa_mp._generate_id_maps(pa_mp.combine_duplicates(),
+                                      poolsize=2, size_cutoff=0)
+    assert maps == maps_mp, (maps, maps_mp)
+    assert pa._comparison_counter == pa_mp._comparison_counter == 3
+
+
+def test_add_and_assemble():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    st1 = Phosphorylation(Agent('x'), ras,
+                          evidence=[Evidence(source_api='reach', text='a')])
+    st2 = Phosphorylation(Agent('x'), kras,
+                          evidence=[Evidence(source_api='reach', text='b')])
+    st3 = Phosphorylation(Agent('x'), hras,
+                          evidence=[Evidence(source_api='reach', text='c')])
+    st4 = Phosphorylation(Agent('x'), ras,
+                          evidence=[Evidence(source_api='reach', text='d')])
+    be = BeliefEngine()
+    pa = Preassembler(bio_ontology, [st1, st2])
+    pa.combine_related()
+    pa._comparison_counter = 0
+    top = pa.add_and_assemble([st3, st4], belief_engine=be)
+    # Only the new HRAS statement needs to be compared, the RAS
+    # statement is merged into the existing one
+    assert pa._comparison_counter == 1, pa._comparison_counter
+    assert len(pa.unique_stmts) == 3
+    assert len(top) == 2, top
+    ras_stmt = [st for st in pa.unique_stmts if st.sub.name == 'RAS'][0]
+    assert len(ras_stmt.evidence) == 2
+    assert len(ras_stmt.supports) == 2
+    for st in top:
+        assert st.supported_by == [ras_stmt]
+    # The result is the same as assembling everything at once
+    pa_all = Preassembler(bio_ontology, [st1, st2, st3, st4])
+    unique_stmts = pa_all.combine_related(return_toplevel=False)
+    be.set_hierarchy_probs(unique_stmts)
+    ras_stmt_all = [st for st in unique_stmts if st.sub.name == 'RAS'][0]
+    assert ras_stmt.belief == ras_stmt_all.belief
+    # A duplicate of an existing evidence isn't added again but the raw
+    # statement it came from is recorded, and the refinement index of
+    # the existing statements is reused
+    index = pa._refinement_index
+    st5 = Phosphorylation(Agent('x'), kras,
+                          evidence=[Evidence(source_api='reach', text='b')])
+    st6 = Phosphorylation(Agent('x', db_refs={'TEXT': 'X'}), kras,
+                          evidence=[Evidence(source_api='reach', text='b')])
+    pa.add_and_assemble([st5, st6])
+    kras_stmt = [st for st in pa.unique_stmts if st.sub.name == 'KRAS'][0]
+    assert len(kras_stmt.evidence) == 2, kras_stmt.evidence
+    assert kras_stmt.evidence[0].annotations['prior_uuids'] == \
+        [st2.uuid, st5.uuid]
+    assert kras_stmt.evidence[1].annotations['prior_uuids'] == [st6.uuid]
+    assert pa._refinement_index is index
+    st7 = Phosphorylation(Agent('x'), kras, 'S',
+                          evidence=[Evidence(source_api='reach', text='e')])
+    pa.add_and_assemble([st7])
+    assert pa._refinement_index is index
+    assert len(index) == len(pa.unique_stmts) == 4
+    st7 = [st for st in pa.unique_stmts if st.residue == 'S'][0]
+    assert set(st7.supported_by) == {kras_stmt, ras_stmt}
+    assert kras_stmt.supports == [st7]
+    # If the unique statements are assembled again, the index isn't
+    # reused even though the number of statements is the same
+    pa.unique_stmts = None
+    pa.related_stmts = None
+    pa.combine_related()
+    assert len(pa.unique_stmts) == len(index)
+    st8 = Phosphorylation(Agent('x'), hras, 'S',
+                          evidence=[Evidence(source_api='reach', text='f')])
+    pa.add_and_assemble([st8])
+    assert pa._refinement_index is not index
+    st8 = [st for st in pa.unique_stmts
+           if st.residue == 'S' and st.sub.name == 'HRAS'][0]
+    assert len(st8.supported_by) == 2
+    for st in st8.supported_by:
+        assert any(st is unique_stmt for unique_stmt in pa.unique_stmts)
+
+
 def test_refinement_filters():
     ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
     kras = Agent('KRAS', db_refs={'HGNC': '6407'})
@@ -1086,3 +1232,51 @@ def test_refinement_filters():
     pa.combine_related(filters=[filter_all, filter_empty,
                                 bio_ontology_refinement_filter])
     assert pa._comparison_counter == 0, pa._comparison_counter
+
+
+def test_ontology_refinement_filter_by_stmt_type():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    braf = Agent('BRAF', db_refs={'HGNC': '1097'})
+    stmts = [Complex([kras, braf]), Complex([ras, braf]), Complex([hras]),
+             Complex([ras]), Complex([kras, Agent('x')])]
+    stmts_by_hash = {stmt.get_hash(): stmt for stmt in stmts}
+    hashes = [stmt.get_hash() for stmt in stmts]
+    stmts_to_compare = \
+        ontology_refinement_filter_by_stmt_type(stmts_by_hash, bio_ontology)
+    assert stmts_to_compare[hashes[0]] == {hashes[1]}
+    assert stmts_to_compare[hashes[1]] == set()
+    assert stmts_to_compare[hashes[2]] == {hashes[1], hashes[3]}
+    assert stmts_to_compare[hashes[3]] == {hashes[1]}
+    assert stmts_to_compare[hashes[4]] == set()
+
+
+def test_ontology_refinement_index():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    braf = Agent('BRAF', db_refs={'HGNC': '1097'})
+    stmts = [Complex([kras, braf]), Complex([ras, braf]), Complex([hras]),
+             Complex([ras]), Complex([kras, Agent('x')]),
+             Phosphorylation(None, kras), Phosphorylation(braf, ras),
+             Phosphorylation(braf, kras), Phosphorylation(None, ras),
+             Phosphorylation(braf, hras)]
+    stmts_by_hash = {stmt.get_hash(): stmt for stmt in stmts}
+    expected = ontology_refinement_filter(stmts_by_hash, None, bio_ontology)
+    for split in [0, 3, 5, 8]:
+        index = _OntologyRefinementIndex(bio_ontology, None)
+        index.add_statements(stmts[::2][:split])
+        added_hashes = index.add_statements([stmt for stmt in stmts
+                                             if stmt not in
+                                             stmts[::2][:split]])
+        assert len(index) == len(stmts)
+        stmts_to_compare = index.get_possible_refinements(added_hashes)
+        # The index returns the possible refinements involving the added
+        # statements, and only those
+        for stmt_hash, refined_hashes in expected.items():
+            refined_hashes = {
+                refined_hash for refined_hash in refined_hashes
+                if stmt_hash in added_hashes or refined_hash in added_hashes}
+            assert stmts_to_compare.get(stmt_hash, set()) == \
+                refined_hashes, (split, stmt_hash)
@@ -2,6 +2,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
 import os
 import json
+import threading
 import unittest
 from copy import deepcopy
 from nose.tools import raises
@@ -160,6 +161,45 @@ def test_matches_key_dbrefs():
     assert unicode_strs((hras1, hras2))
 
 
+def test_matches_key_cache():
+    map2k1 = Agent('MAP2K1', db_refs={'HGNC': '6840'})
+    mapk1 = Agent('MAPK1', db_refs={'HGNC': '6871'})
+    stmt = Phosphorylation(map2k1, mapk1, 'T', '185')
+    key = stmt.matches_key()
+    with matches_key_cache():
+        cached_key = stmt.matches_key()
+        assert cached_key == key
+        assert stmt.matches_key() is cached_key
+        # Setting non-key attributes doesn't invalidate the key
+        stmt.belief = 0.5
+        assert stmt.matches_key() is cached_key
+        # Setting key attributes of the Statement or its Agents does
+        map2k1.location = 'nucleus'
+        assert stmt.matches_key() != key
+        stmt.sub = Agent('MAPK3', db_refs={'HGNC': '6877'})
+        assert '6877' in stmt.matches_key()
+        # So do in-place changes of the Agents' attributes
+        map2k1.db_refs['HGNC'] = '6841'
+        assert '6841' in stmt.matches_key()
+        key = stmt.matches_key()
+        map2k1.mods.append(ModCondition('phosphorylation'))
+        assert stmt.matches_key() != key
+        cplx = Complex([map2k1, Agent('MAPK1')])
+        key = cplx.matches_key()
+        cplx.members[1] = Agent('MAPK3')
+        assert cplx.matches_key() != key
+        # Keys are only memoized in the thread running the context
+        thread_keys = []
+        thread = threading.Thread(
+            target=lambda: thread_keys.extend([stmt.matches_key(),
+                                               stmt.matches_key()]))
+        thread.start()
+        thread.join()
+        assert thread_keys[0] is not thread_keys[1]
+    # Outside the context, keys are computed on every call
+    assert stmt.matches_key() is not stmt.matches_key()
+
+
 def test_matches_bound():
     hras1 = Agent('HRAS',
         bound_conditions=[BoundCondition(Agent('BRAF'), True)])
@@ -2049,3 +2089,53 @@ def test_real_agent_list():
     agents = Phosphorylation(None, x).real_agent_list()
     assert len(agents) == 1
     assert agents[0] == x
+
+
+def test_copy_stmts():
+    ev = Evidence(source_api='reach', text='MEK phosphorylates ERK',
+                  annotations={'agents': {'raw_text': ['MEK', 'ERK']}},
+                  context=BioContext(species=RefContext('human')))
+    st1 = Phosphorylation(Agent('MEK', db_refs={'FPLX': 'MEK'}),
+                          Agent('ERK', mods=[ModCondition('phosphorylation')]),
+                          'T', '185', evidence=[ev])
+    st2 = Phosphorylation(Agent('MEK'), Agent('ERK'), evidence=[deepcopy(ev)])
+    st1.supported_by = [st2]
+    st2.supports = [st1]
+    st1.get_hash()
+
+    cp1, cp2 = copy_stmts([st1, st2])
+    assert cp1.to_json() == st1.to_json()
+    assert cp1.uuid == st1.uuid
+    assert cp1.get_hash() == st1.get_hash()
+    assert cp1.sub is not st1.sub
+    assert cp1.sub.mods[0] is not st1.sub.mods[0]
+    assert cp1.evidence[0] is not ev
+    assert cp1.evidence[0].annotations is not ev.annotations
+    assert cp1.evidence[0].context is not ev.context
+    # The hierarchy isn't copied by default
+    assert cp1.supported_by[0] is st2
+    assert cp1.supported_by is not st1.supported_by
+
+    cp1, cp2 = copy_stmts([st1, st2], copy_supports=True)
+    assert cp1.supported_by[0] is cp2
+    assert cp2.supports[0] is cp1
+    cp1 = st1.copy(copy_supports=True)
+    assert cp1.supported_by[0] is not st2
+    assert cp1.supported_by[0].supports[0] is cp1
+
+    cp1 = st1.copy(share_evidence=True)
+    assert cp1.evidence[0] is ev
+    cp1.evidence.append(Evidence(source_api='sparser'))
+    assert len(st1.evidence) == 1
+
+    cp1 = st1.copy(deep=False)
+    assert cp1.sub is st1.sub
+    assert cp1.evidence is not st1.evidence
+
+    st = Influence(Event(Concept('rain'), delta=QualitativeDelta(polarity=1)),
+                   Event(Concept('flood')))
+    cp = st.copy()
+    assert cp.to_json() == st.to_json()
+    assert cp.subj is not st.subj
+    assert cp.subj.concept is not st.subj.concept
+    assert cp.subj.delta is not st.subj.delta
@@ -1,7 +1,9 @@
 from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
+import os
 import json
 import datetime
+import tempfile
 import jsonschema
 from indra.statements import *
 from .test_json_schema import schema
@@ -384,3 +386,53 @@ def test_file_serialization_json_lines():
     stmts_to_json_file([stmt], 'test_indra_stmts.json', format='jsonl')
     stmts = stmts_from_json_file('test_indra_stmts.json', format='jsonl')
     assert stmts[0].matches(stmt)
+
+
+def test_jsonl_streaming():
+    from indra.statements.io import has_orjson
+    stmts = [IncreaseAmount(Agent('a'), Agent('b'), evidence=[ev]),
+             Phosphorylation(Agent('α'), Agent('b'), 'S', '10')]
+    backends = ['json', 'orjson'] if has_orjson else ['json']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fname = os.path.join(tmp_dir, 'test_indra_stmts.json')
+        for backend in backends:
+            write_stmts_jsonl((stmt for stmt in stmts), fname,
+                              json_backend=backend)
+            stmts_in = iter_stmts_from_jsonl(fname, json_backend=backend)
+            assert not isinstance(stmts_in, list)
+            stmts_in = list(stmts_in)
+            assert len(stmts_in) == 2
+            for stmt, stmt_in in zip(stmts, stmts_in):
+                assert stmt_in.to_json() == stmt.to_json()
+        # NaN values are written the same way by all backends
+        stmt = IncreaseAmount(Agent('a'), Agent('b'), evidence=[ev])
+        stmt.belief = float('nan')
+        lines = set()
+        for backend in backends:
+            write_stmts_jsonl([stmt], fname, json_backend=backend)
+            with open(fname, 'rb') as fh:
+                lines.add(fh.read())
+            stmt_in = list(iter_stmts_from_jsonl(fname,
+                                                 json_backend=backend))[0]
+            assert stmt_in.belief != stmt_in.belief
+        assert len(lines) == 1
+
+
+def test_statement_store():
+    from indra.statements.store import StatementStore
+    st1 = IncreaseAmount(Agent('a'), Agent('b'), evidence=[ev])
+    st2 = Phosphorylation(Agent('a'), Agent('b'), 'S', '10',
+                          evidence=[ev, Evidence(source_api='x')])
+    st3 = IncreaseAmount(Agent('c'), Agent('b'))
+    store = StatementStore.build((st for st in [st1, st2, st3]),
+                                 'test_indra_stmts.json')
+    assert len(store) == 3
+    assert store.get_stmt(st2.get_hash()).to_json() == st2.to_json()
+    assert store.get_stmt_by_uuid(st1.uuid).to_json() == st1.to_json()
+    assert store.get_stmt(st2.get_hash(), evidence=False).evidence == []
+    assert len(store.get_evidence(st2.get_hash())) == 2
+    assert store.get_stmt(12345) is None
+    assert store.get_stmt_by_uuid('xxx') is None
+    assert [st.uuid for st in store.iter_stmts('IncreaseAmount')] == \
+        [st1.uuid, st3.uuid]
+    assert list(store.iter_stmts('Complex')) == []
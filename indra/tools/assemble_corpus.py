@@ -10,16 +10,17 @@ except ImportError:
     import pickle
 import logging
 from collections import defaultdict
-from copy import deepcopy, copy
+from copy import copy
 from indra.statements import *
 from indra.belief import BeliefEngine
 from indra.util import read_unicode_csv
-from indra.pipeline import register_pipeline
+from indra.pipeline import register_pipeline, streamable
 from indra.mechlinker import MechLinker
 from indra.databases import hgnc_client
 from indra.ontology.bio import bio_ontology
 from indra.ontology.world import world_ontology
 from indra.preassembler import Preassembler, flatten_evidence
+from indra.tools.statement_index import StatementIndex
 
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,48 @@ def _filter(kwargs, arg_list):
     return dict(filter(lambda x: x[0] in arg_list, kwargs.items()))
 
 
+def _get_index_positions(stmts_in, index):
+    """Return the positions of statements in an index if all are in it."""
+    if index is None:
+        return None
+    positions = index.get_positions(stmts_in)
+    if positions is None:
+        logger.warning('Not all statements are in the statement index, '
+                       'filtering without the index.')
+    return positions
+
+
+def _filter_by_index(stmts_in, positions, keep, kwargs):
+    """Return the statements whose index positions are marked to keep."""
+    stmts_out = [st for st, keep_st in zip(stmts_in, keep[positions].tolist())
+                 if keep_st]
+    logger.info('%d statements after filter...' % len(stmts_out))
+    dump_pkl = kwargs.get('save')
+    if dump_pkl:
+        dump_statements(stmts_out, dump_pkl)
+    return stmts_out
+
+
+def _all_agents_meet_criterion(index, criterion):
+    """Return a mask of indexed statements whose agents meet a criterion.
+
+    As in the filters scanning statements, the agents in the bound
+    conditions of agents also need to meet the criterion.
+    """
+    matching, total = index.count_agents(criterion)
+    bound_matching, bound_total = index.count_agents(criterion, bound=True)
+    return (matching == total) & (bound_matching == bound_total)
+
+
+def _apply_policy(matching, total, policy, invert):
+    """Return a mask of statements based on the number of matching agents."""
+    if policy == 'one':
+        keep = matching > 0
+    else:
+        keep = matching == total
+    return keep if not invert else ~keep
+
+
 @register_pipeline
 def dump_statements(stmts_in, fname, protocol=4):
     """Dump a list of statements into a pickle file.
@@ -85,7 +128,54 @@ def load_statements(fname, as_dict=False):
     return stmts
 
 
+def _get_grounding_mapper(grounding_map=None, misgrounding_map=None,
+                          agent_map=None, ignores=None, use_adeft=True,
+                          gilda_mode=None, grounding_map_policy='replace'):
+    from indra.preassembler.grounding_mapper import GroundingMapper,\
+        default_agent_map, default_grounding_map, default_ignores, \
+        default_misgrounding_map
+    ignores = ignores if ignores else default_ignores
+    gm = grounding_map
+    if not gm:
+        gm = default_grounding_map
+    elif grounding_map_policy == 'extend':
+        default_gm = {k: v for (k, v) in default_grounding_map.items()}
+        default_gm.update(gm)
+        gm = default_gm
+    misgm = misgrounding_map if misgrounding_map else default_misgrounding_map
+    agent_map = agent_map if agent_map else default_agent_map
+    return GroundingMapper(gm, agent_map=agent_map,
+                           misgrounding_map=misgm, ignores=ignores,
+                           use_adeft=use_adeft, gilda_mode=gilda_mode)
+
+
+def _fix_translocation_locations(stmt):
+    # Patch wrong locations in Translocation statements
+    if isinstance(stmt, Translocation):
+        if not stmt.from_location:
+            stmt.from_location = None
+        if not stmt.to_location:
+            stmt.to_location = None
+
+
+def _get_grounding_map_function(do_rename=True, grounding_map=None,
+                                misgrounding_map=None, agent_map=None,
+                                ignores=None, use_adeft=True, gilda_mode=None,
+                                grounding_map_policy='replace', **kwargs):
+    gm = _get_grounding_mapper(grounding_map, misgrounding_map, agent_map,
+                               ignores, use_adeft, gilda_mode,
+                               grounding_map_policy)
+
+    def map_stmt(stmt):
+        mapped_stmt = gm.map_agents_for_stmt(stmt, do_rename)
+        if mapped_stmt is not None:
+            _fix_translocation_locations(mapped_stmt)
+        return mapped_stmt
+    return map_stmt
+
+
 @register_pipeline
+@streamable(_get_grounding_map_function, kind='map')
 def map_grounding(stmts_in, do_rename=True, grounding_map=None,
                   misgrounding_map=None, agent_map=None, ignores=None, use_adeft=True,
                   gilda_mode=None, grounding_map_policy='replace', **kwargs):
@@ -126,31 +216,13 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     stmts_out : list[indra.statements.Statement]
         A list of mapped statements.
     """
-    from indra.preassembler.grounding_mapper import GroundingMapper,\
-        default_agent_map, default_grounding_map, default_ignores, \
-        default_misgrounding_map
     logger.info('Mapping grounding on %d statements...' % len(stmts_in))
-    ignores = ignores if ignores else default_ignores
-    gm = grounding_map
-    if not gm:
-        gm = default_grounding_map
-    elif grounding_map_policy == 'extend':
-        default_gm = {k: v for (k, v) in default_grounding_map.items()}
-        default_gm.update(gm)
-        gm = default_gm
-    misgm = misgrounding_map if misgrounding_map else default_misgrounding_map
-    agent_map = agent_map if agent_map else default_agent_map
-    gm = GroundingMapper(gm, agent_map=agent_map,
-                         misgrounding_map=misgm, ignores=ignores,
-                         use_adeft=use_adeft, gilda_mode=gilda_mode)
+    gm = _get_grounding_mapper(grounding_map, misgrounding_map, agent_map,
+                               ignores, use_adeft, gilda_mode,
+                               grounding_map_policy)
     stmts_out = gm.map_stmts(stmts_in, do_rename=do_rename)
-    # Patch wrong locations in Translocation statements
     for stmt in stmts_out:
-        if isinstance(stmt, Translocation):
-            if not stmt.from_location:
-                stmt.from_location = None
-            if not stmt.to_location:
-                stmt.to_location = None
+        _fix_translocation_locations(stmt)
     dump_pkl = kwargs.get('save')
     if dump_pkl:
         dump_statements(stmts_out, dump_pkl)
@@ -312,11 +384,36 @@ def merge_deltas(stmts_in):
     return stmts_out
 
 
+def _get_site_map_function(do_methionine_offset=True,
+                           do_orthology_mapping=True, do_isoform_mapping=True,
+                           use_cache=False, **kwargs):
+    from indra.preassembler.sitemapper import SiteMapper, default_site_map
+    sm = SiteMapper(default_site_map, use_cache=use_cache,
+                    do_methionine_offset=do_methionine_offset,
+                    do_orthology_mapping=do_orthology_mapping,
+                    do_isoform_mapping=do_isoform_mapping)
+
+    def map_stmt(stmt):
+        valid, mapped = sm.map_sites([stmt])
+        if valid:
+            return valid[0]
+        elif mapped and all([mm.has_mapping()
+                             for mm in mapped[0].mapped_mods]):
+            return mapped[0].mapped_stmt
+        return None
+    return map_stmt
+
+
 @register_pipeline
+@streamable(_get_site_map_function, kind='map')
 def map_sequence(stmts_in, do_methionine_offset=True,
                  do_orthology_mapping=True, do_isoform_mapping=True, **kwargs):
     """Map sequences using the SiteMapper.
 
+    The valid Statements are returned before the ones with mapped sites.
+    Note that when run by an AssemblyPipeline in streaming or parallel mode,
+    the Statements are instead returned in the order of the input.
+
     Parameters
     ----------
     stmts_in : list[indra.statements.Statement]
@@ -342,7 +439,9 @@ def map_sequence(stmts_in, do_methionine_offset=True,
         If True, a cache will be created/used from the laction specified by
         SITEMAPPER_CACHE_PATH, defined in your INDRA config or the environment.
         If False, no cache is used. For more details on the cache, see the
-        SiteMapper class definition.
+        SiteMapper class definition. When run by an AssemblyPipeline in
+        parallel mode, the Statements are mapped in a single process if a
+        cache is used so that it is saved.
     save : Optional[str]
         The name of a pickle file to save the results (stmts_out) into.
 
@@ -394,13 +493,12 @@ def run_preassembly(stmts_in, return_toplevel=True, poolsize=None,
     poolsize : Optional[int]
         The number of worker processes to use to parallelize the
         comparisons performed by the function. If None (default), no
-        parallelization is performed. NOTE: Parallelization is only
-        available on Python 3.4 and above.
+        parallelization is performed.
     size_cutoff : Optional[int]
-        Groups with size_cutoff or more statements are sent to worker
-        processes, while smaller groups are compared in the parent process.
-        Default value is 100. Not relevant when parallelization is not
-        used.
+        Statement types with size_cutoff or more candidate comparisons are
+        sent to worker processes, while smaller ones are compared in the
+        parent process. Default value is 100. Not relevant when
+        parallelization is not used.
     belief_scorer : Optional[indra.belief.BeliefScorer]
         Instance of BeliefScorer class to use in calculating Statement
         probabilities. If None is provided (default), then the default
@@ -522,11 +620,15 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
         If True, only the top-level statements are returned. If False,
         all statements are returned irrespective of level of specificity.
         Default: True
+    poolsize : Optional[int]
+        The number of worker processes to use to parallelize the
+        comparisons performed by the function. If None (default), no
+        parallelization is performed.
     size_cutoff : Optional[int]
-        Groups with size_cutoff or more statements are sent to worker
-        processes, while smaller groups are compared in the parent process.
-        Default value is 100. Not relevant when parallelization is not
-        used.
+        Statement types with size_cutoff or more candidate comparisons are
+        sent to worker processes, while smaller ones are compared in the
+        parent process. Default value is 100. Not relevant when
+        parallelization is not used.
     flatten_evidence : Optional[bool]
         If True, evidences are collected and flattened via supports/supported_by
         links. Default: False
@@ -546,9 +648,11 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
     logger.info('Combining related on %d statements...' %
                 len(preassembler.unique_stmts))
     return_toplevel = kwargs.get('return_toplevel', True)
+    poolsize = kwargs.get('poolsize', None)
     size_cutoff = kwargs.get('size_cutoff', 100)
     filters = kwargs.get('filters', None)
     stmts_out = preassembler.combine_related(return_toplevel=False,
+                                             poolsize=poolsize,
                                              size_cutoff=size_cutoff,
                                              filters=filters)
     # Calculate beliefs
@@ -576,7 +680,16 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
     return stmts_out
 
 
+def _get_type_filter(stmt_type, invert=False, **kwargs):
+    if isinstance(stmt_type, str):
+        stmt_type = get_statement_by_name(stmt_type)
+    if not invert:
+        return lambda st: isinstance(st, stmt_type)
+    return lambda st: not isinstance(st, stmt_type)
+
+
 @register_pipeline
+@streamable(_get_type_filter)
 def filter_by_type(stmts_in, stmt_type, invert=False, **kwargs):
     """Filter to a given statement type.
 
@@ -605,10 +718,8 @@ def filter_by_type(stmts_in, stmt_type, invert=False, **kwargs):
     logger.info('Filtering %d statements for type %s%s...' %
                 (len(stmts_in), 'not ' if invert else '',
                  stmt_type.__name__))
-    if not invert:
-        stmts_out = [st for st in stmts_in if isinstance(st, stmt_type)]
-    else:
-        stmts_out = [st for st in stmts_in if not isinstance(st, stmt_type)]
+    keep = _get_type_filter(stmt_type, invert)
+    stmts_out = [st for st in stmts_in if keep(st)]
 
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
@@ -687,9 +798,38 @@ def _any_bound_condition_fails_criterion(agent, criterion):
     return False
 
 
+def _get_all_agents_filter(criterion, remove_bound, concepts_bound=True):
+    """Return a filter keeping statements whose agents meet a criterion.
+
+    If remove_bound is True, the bound conditions of agents that don't meet
+    the criterion are removed, otherwise, statements with such bound
+    conditions are filtered out.
+    """
+    def keep(st):
+        for agent in st.agent_list():
+            if agent is not None:
+                if not criterion(agent):
+                    return False
+                if not concepts_bound and not isinstance(agent, Agent):
+                    continue
+                if remove_bound:
+                    _remove_bound_conditions(agent, criterion)
+                elif _any_bound_condition_fails_criterion(agent, criterion):
+                    return False
+        return True
+    return keep
+
+
+def _get_grounded_filter(score_threshold=None, remove_bound=False, **kwargs):
+    criterion = lambda x: _agent_is_grounded(x, score_threshold)
+    return _get_all_agents_filter(criterion, remove_bound,
+                                  concepts_bound=False)
+
+
 @register_pipeline
+@streamable(_get_grounded_filter)
 def filter_grounded_only(stmts_in, score_threshold=None, remove_bound=False,
-                         **kwargs):
+                         index=None, **kwargs):
     """Filter to statements that have grounded agents.
 
     Parameters
@@ -705,6 +845,10 @@ def filter_grounded_only(stmts_in, score_threshold=None, remove_bound=False,
         If true, removes ungrounded bound conditions from a statement.
         If false (default), filters out statements with ungrounded bound
         conditions.
+    index : Optional[indra.tools.statement_index.StatementIndex]
+        An index of Statements including stmts_in to find matching
+        Statements with, unless remove_bound is True (see
+        :py:mod:`indra.tools.statement_index`).
 
     Returns
     -------
@@ -713,24 +857,15 @@ def filter_grounded_only(stmts_in, score_threshold=None, remove_bound=False,
     """
     logger.info('Filtering %d statements for grounded agents...' % 
                 len(stmts_in))
-    stmts_out = []
-    for st in stmts_in:
-        grounded = True
-        for agent in st.agent_list():
-            if agent is not None:
-                criterion = lambda x: _agent_is_grounded(x, score_threshold)
-                if not criterion(agent):
-                    grounded = False
-                    break
-                if not isinstance(agent, Agent):
-                    continue
-                if remove_bound:
-                    _remove_bound_conditions(agent, criterion)
-                elif _any_bound_condition_fails_criterion(agent, criterion):
-                    grounded = False
-                    break
-        if grounded:
-            stmts_out.append(st)
+    positions = _get_index_positions(stmts_in, index) \
+        if not remove_bound else None
+    if positions is not None:
+        criterion = lambda x: _agent_is_grounded(x, score_threshold)
+        return _filter_by_index(stmts_in, positions,
+                                _all_agents_meet_criterion(index, criterion),
+                                kwargs)
+    keep = _get_grounded_filter(score_threshold, remove_bound)
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -766,9 +901,15 @@ def _agent_is_gene(agent, specific_only):
     return True
 
 
+def _get_genes_filter(specific_only=False, remove_bound=False, **kwargs):
+    criterion = lambda a: _agent_is_gene(a, specific_only)
+    return _get_all_agents_filter(criterion, remove_bound)
+
+
 @register_pipeline
+@streamable(_get_genes_filter)
 def filter_genes_only(stmts_in, specific_only=False, remove_bound=False,
-                      **kwargs):
+                      index=None, **kwargs):
     """Filter to statements containing genes only.
 
     Parameters
@@ -785,6 +926,10 @@ def filter_genes_only(stmts_in, specific_only=False, remove_bound=False,
         If true, removes bound conditions that are not genes
         If false (default), filters out statements with non-gene bound
         conditions
+    index : Optional[indra.tools.statement_index.StatementIndex]
+        An index of Statements including stmts_in to find matching
+        Statements with, unless remove_bound is True (see
+        :py:mod:`indra.tools.statement_index`).
 
     Returns
     -------
@@ -793,24 +938,15 @@ def filter_genes_only(stmts_in, specific_only=False, remove_bound=False,
     """
     logger.info('Filtering %d statements for ones containing genes only...' % 
                 len(stmts_in))
-    stmts_out = []
-    for st in stmts_in:
-        genes_only = True
-        for agent in st.agent_list():
-            if agent is not None:
-                criterion = lambda a: _agent_is_gene(a, specific_only)
-                if not criterion(agent):
-                    genes_only = False
-                    break
-                if remove_bound:
-                    _remove_bound_conditions(agent, criterion)
-                else:
-                    if _any_bound_condition_fails_criterion(agent, criterion):
-                        genes_only = False
-                        break
-
-        if genes_only:
-            stmts_out.append(st)
+    positions = _get_index_positions(stmts_in, index) \
+        if not remove_bound else None
+    if positions is not None:
+        criterion = lambda a: _agent_is_gene(a, specific_only)
+        return _filter_by_index(stmts_in, positions,
+                                _all_agents_meet_criterion(index, criterion),
+                                kwargs)
+    keep = _get_genes_filter(specific_only, remove_bound)
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -818,7 +954,21 @@ def filter_genes_only(stmts_in, specific_only=False, remove_bound=False,
     return stmts_out
 
 
+def _get_belief_filter(belief_cutoff, **kwargs):
+    def keep(stmt):
+        if stmt.belief < belief_cutoff:
+            return False
+        # We also eliminate supports/supported-by below the cutoff
+        stmt.supports = [st for st in stmt.supports
+                         if st.belief >= belief_cutoff]
+        stmt.supported_by = [st for st in stmt.supported_by
+                             if st.belief >= belief_cutoff]
+        return True
+    return keep
+
+
 @register_pipeline
+@streamable(_get_belief_filter)
 def filter_belief(stmts_in, belief_cutoff, **kwargs):
     """Filter to statements with belief above a given cutoff.
 
@@ -840,32 +990,78 @@ def filter_belief(stmts_in, belief_cutoff, **kwargs):
     dump_pkl = kwargs.get('save')
     logger.info('Filtering %d statements to above %f belief' %
                 (len(stmts_in), belief_cutoff))
-    # The first round of filtering is in the top-level list
-    stmts_out = []
-    # Now we eliminate supports/supported-by
-    for stmt in stmts_in:
-        if stmt.belief < belief_cutoff:
-            continue
-        stmts_out.append(stmt)
-        supp_by = []
-        supp = []
-        for st in stmt.supports:
-            if st.belief >= belief_cutoff:
-                supp.append(st)
-        for st in stmt.supported_by:
-            if st.belief >= belief_cutoff:
-                supp_by.append(st)
-        stmt.supports = supp
-        stmt.supported_by = supp_by
+    keep = _get_belief_filter(belief_cutoff)
+    stmts_out = [stmt for stmt in stmts_in if keep(stmt)]
     logger.info('%d statements after filter...' % len(stmts_out))
     if dump_pkl:
         dump_statements(stmts_out, dump_pkl)
     return stmts_out
 
 
+def _get_gene_names(gene_list, allow_families):
+    """Return the set of names to filter for given a gene list."""
+    # If we're allowing families, make a list of all FamPlex IDs that
+    # contain members of the gene list, and add them to the filter list
+    filter_list = copy(gene_list)
+    if allow_families:
+        for hgnc_name in gene_list:
+            hgnc_id = hgnc_client.get_hgnc_id(hgnc_name)
+            if not hgnc_id:
+                logger.warning('Could not get HGNC ID for %s.' % hgnc_name)
+                continue
+            parents = bio_ontology.get_parents('HGNC', hgnc_id)
+            filter_list += [db_id for db_ns, db_id in parents
+                            if db_ns == 'FPLX']
+    # We use a set for fast membership checks
+    return set(filter_list)
+
+
+def _get_names_filter(names, policy, invert, bound=False):
+    """Return a filter applying a policy to the names of agents.
+
+    If bound is True, the agents in bound conditions are considered along
+    with the ones directly participating in statements.
+    """
+    if policy not in ('one', 'all'):
+        return lambda st: True
+    enough = any if policy == 'one' else all
+
+    def keep(st):
+        if bound:
+            agent_list = st.agent_list_with_bound_condition_agents()
+        else:
+            agent_list = st.agent_list()
+        found = enough(agent.name in names for agent in agent_list
+                       if agent is not None)
+        return found != invert
+    return keep
+
+
+def _get_gene_list_filter(gene_list, policy, allow_families=False,
+                          remove_bound=False, invert=False, **kwargs):
+    filter_list = _get_gene_names(gene_list, allow_families)
+    names_filter = _get_names_filter(filter_list, policy, invert,
+                                     bound=not remove_bound)
+    if not remove_bound:
+        return names_filter
+    # If requested, remove agents whose names are not in the list from
+    # all bound conditions
+    if not invert:
+        keep_criterion = lambda a: a.name in filter_list
+    else:
+        keep_criterion = lambda a: a.name not in filter_list
+
+    def keep(st):
+        for agent in st.agent_list():
+            _remove_bound_conditions(agent, keep_criterion)
+        return names_filter(st)
+    return keep
+
+
 @register_pipeline
+@streamable(_get_gene_list_filter)
 def filter_gene_list(stmts_in, gene_list, policy, allow_families=False,
-                     remove_bound=False, invert=False, **kwargs):
+                     remove_bound=False, invert=False, index=None, **kwargs):
     """Return statements that contain genes given in a list.
 
     Parameters
@@ -892,6 +1088,10 @@ def filter_gene_list(stmts_in, gene_list, policy, allow_families=False,
     invert : Optional[bool]
         If True, the statements that do not match according to the policy
         are returned. Default: False
+    index : Optional[indra.tools.statement_index.StatementIndex]
+        An index of Statements including stmts_in to find matching
+        Statements with if the policy is 'one' or 'all' and remove_bound
+        is False (see :py:mod:`indra.tools.statement_index`).
 
     Returns
     -------
@@ -906,62 +1106,21 @@ def filter_gene_list(stmts_in, gene_list, policy, allow_families=False,
         logger.info(('Filtering %d statements for ones %scontaining "%s" of: '
                      '%s...') % (len(stmts_in), inv_str, policy, genes_str))
 
-    # If we're allowing families, make a list of all FamPlex IDs that
-    # contain members of the gene list, and add them to the filter list
-    filter_list = copy(gene_list)
-    if allow_families:
-        for hgnc_name in gene_list:
-            hgnc_id = hgnc_client.get_hgnc_id(hgnc_name)
-            if not hgnc_id:
-                logger.warning('Could not get HGNC ID for %s.' % hgnc_name)
-                continue
-            parents = bio_ontology.get_parents('HGNC', hgnc_id)
-            filter_list += [db_id for db_ns, db_id in parents
-                            if db_ns == 'FPLX']
-    stmts_out = []
-
-    if remove_bound:
-        # If requested, remove agents whose names are not in the list from
-        # all bound conditions
-        if not invert:
-            keep_criterion = lambda a: a.name in filter_list
-        else:
-            keep_criterion = lambda a: a.name not in filter_list
-
-        for st in stmts_in:
-            for agent in st.agent_list():
-                _remove_bound_conditions(agent, keep_criterion)
-
-    if policy == 'one':
-        for st in stmts_in:
-            found_gene = False
-            if not remove_bound:
-                agent_list = st.agent_list_with_bound_condition_agents()
-            else:
-                agent_list = st.agent_list()
-            for agent in agent_list:
-                if agent is not None:
-                    if agent.name in filter_list:
-                        found_gene = True
-                        break
-            if (found_gene and not invert) or (not found_gene and invert):
-                stmts_out.append(st)
-    elif policy == 'all':
-        for st in stmts_in:
-            found_genes = True
-            if not remove_bound:
-                agent_list = st.agent_list_with_bound_condition_agents()
-            else:
-                agent_list = st.agent_list()
-            for agent in agent_list:
-                if agent is not None:
-                    if agent.name not in filter_list:
-                        found_genes = False
-                        break
-            if (found_genes and not invert) or (not found_genes and invert):
-                stmts_out.append(st)
-    else:
-        stmts_out = stmts_in
+    filter_list = _get_gene_names(gene_list, allow_families)
+    positions = _get_index_positions(stmts_in, index) \
+        if policy in ('one', 'all') and not remove_bound else None
+    if positions is not None:
+        # Agents in bound conditions are considered along with the ones
+        # directly participating in statements
+        matching, total = index.count_agents_by_name(filter_list)
+        bound_matching, bound_total = \
+            index.count_agents_by_name(filter_list, bound=True)
+        keep = _apply_policy(matching + bound_matching, total + bound_total,
+                             policy, invert)
+        return _filter_by_index(stmts_in, positions, keep, kwargs)
+    keep = _get_gene_list_filter(filter_list, policy, False, remove_bound,
+                                 invert)
+    stmts_out = [st for st in stmts_in if keep(st)]
 
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
@@ -970,8 +1129,15 @@ def filter_gene_list(stmts_in, gene_list, policy, allow_families=False,
     return stmts_out
 
 
+def _get_concept_names_filter(name_list, policy, invert=False, **kwargs):
+    # We use a set for fast membership checks
+    return _get_names_filter(set(name_list), policy, invert)
+
+
 @register_pipeline
-def filter_concept_names(stmts_in, name_list, policy, invert=False, **kwargs):
+@streamable(_get_concept_names_filter)
+def filter_concept_names(stmts_in, name_list, policy, invert=False,
+                         index=None, **kwargs):
     """Return Statements that refer to concepts/agents given as a list of names.
 
     Parameters
@@ -990,6 +1156,10 @@ def filter_concept_names(stmts_in, name_list, policy, invert=False, **kwargs):
     invert : Optional[bool]
         If True, the Statements that do not match according to the policy
         are returned. Default: False
+    index : Optional[indra.tools.statement_index.StatementIndex]
+        An index of Statements including stmts_in to find matching
+        Statements with if the policy is 'one' or 'all' (see
+        :py:mod:`indra.tools.statement_index`).
 
     Returns
     -------
@@ -1004,32 +1174,14 @@ def filter_concept_names(stmts_in, name_list, policy, invert=False, **kwargs):
         logger.info(('Filtering %d statements for ones %scontaining "%s" of: '
                      '%s...') % (len(stmts_in), inv_str, policy, name_str))
 
-    stmts_out = []
-
-    if policy == 'one':
-        for st in stmts_in:
-            found = False
-            agent_list = st.agent_list()
-            for agent in agent_list:
-                if agent is not None:
-                    if agent.name in name_list:
-                        found = True
-                        break
-            if (found and not invert) or (not found and invert):
-                stmts_out.append(st)
-    elif policy == 'all':
-        for st in stmts_in:
-            found = True
-            agent_list = st.agent_list()
-            for agent in agent_list:
-                if agent is not None:
-                    if agent.name not in name_list:
-                        found = False
-                        break
-            if (found and not invert) or (not found and invert):
-                stmts_out.append(st)
-    else:
-        stmts_out = stmts_in
+    positions = _get_index_positions(stmts_in, index) \
+        if policy in ('one', 'all') else None
+    if positions is not None:
+        matching, total = index.count_agents_by_name(name_list)
+        keep = _apply_policy(matching, total, policy, invert)
+        return _filter_by_index(stmts_in, positions, keep, kwargs)
+    keep = _get_concept_names_filter(name_list, policy, invert)
+    stmts_out = [st for st in stmts_in if keep(st)]
 
     logger.info('%d Statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
@@ -1038,9 +1190,47 @@ def filter_concept_names(stmts_in, name_list, policy, invert=False, **kwargs):
     return stmts_out
 
 
+def _get_db_refs_criterion(namespace, values, invert, match_suffix):
+    """Return a criterion on agents for filtering by db_refs."""
+    if not match_suffix:
+        # We use a set for fast membership checks
+        values = set(values)
+
+    def meets_criterion(agent):
+        if namespace not in agent.db_refs:
+            return False
+        entry = agent.db_refs[namespace]
+        if isinstance(entry, list):
+            entry = entry[0][0]
+        ret = False
+        # Match suffix or entire entry
+        if match_suffix:
+            if any([entry.endswith(e) for e in values]):
+                ret = True
+        else:
+            if entry in values:
+                ret = True
+        # Invert if needed
+        if invert:
+            return not ret
+        else:
+            return ret
+    return meets_criterion
+
+
+def _get_db_refs_filter(namespace, values, policy, invert=False,
+                        match_suffix=False, **kwargs):
+    meets_criterion = _get_db_refs_criterion(namespace, values, invert,
+                                             match_suffix)
+    enough = all if policy == 'all' else any
+    return lambda s: enough([meets_criterion(ag) for ag in s.agent_list()
+                             if ag is not None])
+
+
 @register_pipeline
+@streamable(_get_db_refs_filter)
 def filter_by_db_refs(stmts_in, namespace, values, policy, invert=False,
-                      match_suffix=False, **kwargs):
+                      match_suffix=False, index=None, **kwargs):
     """Filter to Statements whose agents are grounded to a matching entry.
 
     Statements are filtered so that the db_refs entry (of the given namespace)
@@ -1068,6 +1258,9 @@ def filter_by_db_refs(stmts_in, namespace, values, policy, invert=False,
     match_suffix : Optional[bool]
         If True, the suffix of the db_refs entry is matches agains the list
         of entries
+    index : Optional[indra.tools.statement_index.StatementIndex]
+        An index of Statements including stmts_in to find matching
+        Statements with (see :py:mod:`indra.tools.statement_index`).
 
     Returns
     -------
@@ -1084,31 +1277,17 @@ def filter_by_db_refs(stmts_in, namespace, values, policy, invert=False,
                      'grounded to: %s in the %s namespace...') %
                         (len(stmts_in), policy, rev_mod, name_str, namespace))
 
-    def meets_criterion(agent):
-        if namespace not in agent.db_refs:
-            return False
-        entry = agent.db_refs[namespace]
-        if isinstance(entry, list):
-            entry = entry[0][0]
-        ret = False
-        # Match suffix or entire entry
-        if match_suffix:
-            if any([entry.endswith(e) for e in values]):
-                ret = True
-        else:
-            if entry in values:
-                ret = True
-        # Invert if needed
-        if invert:
-            return not ret
-        else:
-            return ret
+    positions = _get_index_positions(stmts_in, index)
+    if positions is not None:
+        # Note that the criterion is inverted for each agent
+        matching, total = index.count_agents(
+            _get_db_refs_criterion(namespace, values, invert, match_suffix))
+        keep = _apply_policy(matching, total, policy, False)
+        return _filter_by_index(stmts_in, positions, keep, kwargs)
 
-    enough = all if policy == 'all' else any
-
-    stmts_out = [s for s in stmts_in
-                 if enough([meets_criterion(ag) for ag in s.agent_list()
-                            if ag is not None])]
+    keep = _get_db_refs_filter(namespace, values, policy, invert,
+                               match_suffix)
+    stmts_out = [s for s in stmts_in if keep(s)]
 
     logger.info('%d Statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
@@ -1117,8 +1296,22 @@ def filter_by_db_refs(stmts_in, namespace, values, policy, invert=False,
     return stmts_out
 
 
+def _agent_is_human(agent):
+    from indra.databases import uniprot_client
+    upid = agent.db_refs.get('UP')
+    if upid and not uniprot_client.is_human(upid):
+        return False
+    else:
+        return True
+
+
+def _get_human_filter(remove_bound=False, **kwargs):
+    return _get_all_agents_filter(_agent_is_human, remove_bound)
+
+
 @register_pipeline
-def filter_human_only(stmts_in, remove_bound=False, **kwargs):
+@streamable(_get_human_filter)
+def filter_human_only(stmts_in, remove_bound=False, index=None, **kwargs):
     """Filter out statements that are grounded, but not to a human gene.
 
     Parameters
@@ -1131,46 +1324,62 @@ def filter_human_only(stmts_in, remove_bound=False, **kwargs):
         If true, removes all bound conditions that are grounded but not to human
         genes. If false (default), filters out statements with boundary
         conditions that are grounded to non-human genes.
+    index : Optional[indra.tools.statement_index.StatementIndex]
+        An index of Statements including stmts_in to find matching
+        Statements with, unless remove_bound is True (see
+        :py:mod:`indra.tools.statement_index`).
 
     Returns
     -------
     stmts_out : list[indra.statements.Statement]
         A list of filtered statements.
     """
-    from indra.databases import uniprot_client
     dump_pkl = kwargs.get('save')
     logger.info('Filtering %d statements for human genes only...' %
                 len(stmts_in))
-    stmts_out = []
-
-    def criterion(agent):
-        upid = agent.db_refs.get('UP')
-        if upid and not uniprot_client.is_human(upid):
-            return False
-        else:
-            return True
-
-    for st in stmts_in:
-        human_genes = True
-        for agent in st.agent_list():
-            if agent is not None:
-                if not criterion(agent):
-                    human_genes = False
-                    break
-                if remove_bound:
-                    _remove_bound_conditions(agent, criterion)
-                elif _any_bound_condition_fails_criterion(agent, criterion):
-                    human_genes = False
-                    break
-        if human_genes:
-            stmts_out.append(st)
+    positions = _get_index_positions(stmts_in, index) \
+        if not remove_bound else None
+    if positions is not None:
+        return _filter_by_index(stmts_in, positions,
+                                _all_agents_meet_criterion(index,
+                                                           _agent_is_human),
+                                kwargs)
+    keep = _get_human_filter(remove_bound)
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     if dump_pkl:
         dump_statements(stmts_out, dump_pkl)
     return stmts_out
 
 
+def _stmt_is_direct(stmt):
+    """Returns true if there is evidence that the statement is a direct
+    interaction.
+
+    If any of the evidences associated with the statement
+    indicates a direct interatcion then we assume the interaction
+    is direct. If there is no evidence for the interaction being indirect
+    then we default to direct.
+    """
+    any_indirect = False
+    for ev in stmt.evidence:
+        if ev.epistemics.get('direct') is True:
+            return True
+        elif ev.epistemics.get('direct') is False:
+            # This guarantees that we have seen at least
+            # some evidence that the statement is indirect
+            any_indirect = True
+    if any_indirect:
+        return False
+    return True
+
+
+def _get_direct_filter(**kwargs):
+    return _stmt_is_direct
+
+
 @register_pipeline
+@streamable(_get_direct_filter)
 def filter_direct(stmts_in, **kwargs):
     """Filter to statements that are direct interactions
 
@@ -1186,31 +1395,8 @@ def filter_direct(stmts_in, **kwargs):
     stmts_out : list[indra.statements.Statement]
         A list of filtered statements.
     """
-    def get_is_direct(stmt):
-        """Returns true if there is evidence that the statement is a direct
-        interaction.
-
-        If any of the evidences associated with the statement
-        indicates a direct interatcion then we assume the interaction
-        is direct. If there is no evidence for the interaction being indirect
-        then we default to direct.
-        """
-        any_indirect = False
-        for ev in stmt.evidence:
-            if ev.epistemics.get('direct') is True:
-                return True
-            elif ev.epistemics.get('direct') is False:
-                # This guarantees that we have seen at least
-                # some evidence that the statement is indirect
-                any_indirect = True
-        if any_indirect:
-            return False
-        return True
     logger.info('Filtering %d statements to direct ones...' % len(stmts_in))
-    stmts_out = []
-    for st in stmts_in:
-        if get_is_direct(st):
-            stmts_out.append(st)
+    stmts_out = [st for st in stmts_in if _stmt_is_direct(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -1218,7 +1404,20 @@ def filter_direct(stmts_in, **kwargs):
     return stmts_out
 
 
+def _all_evidence_marked(stmt, epistemics_key):
+    """Return True if a statement has evidence all marked with a key."""
+    if not stmt.evidence:
+        return False
+    return all(ev.epistemics.get(epistemics_key, False)
+               for ev in stmt.evidence)
+
+
+def _get_no_hypothesis_filter(**kwargs):
+    return lambda st: not _all_evidence_marked(st, 'hypothesis')
+
+
 @register_pipeline
+@streamable(_get_no_hypothesis_filter)
 def filter_no_hypothesis(stmts_in, **kwargs):
     """Filter to statements that are not marked as hypothesis in epistemics.
 
@@ -1235,18 +1434,8 @@ def filter_no_hypothesis(stmts_in, **kwargs):
         A list of filtered statements.
     """
     logger.info('Filtering %d statements to no hypothesis...' % len(stmts_in))
-    stmts_out = []
-    for st in stmts_in:
-        all_hypotheses = True
-        ev = None
-        for ev in st.evidence:
-            if not ev.epistemics.get('hypothesis', False):
-                all_hypotheses = False
-                break
-        if ev is None:
-            all_hypotheses = False
-        if not all_hypotheses:
-            stmts_out.append(st)
+    keep = _get_no_hypothesis_filter()
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -1254,7 +1443,12 @@ def filter_no_hypothesis(stmts_in, **kwargs):
     return stmts_out
 
 
+def _get_no_negated_filter(**kwargs):
+    return lambda st: not _all_evidence_marked(st, 'negated')
+
+
 @register_pipeline
+@streamable(_get_no_negated_filter)
 def filter_no_negated(stmts_in, **kwargs):
     """Filter to statements that are not marked as negated in epistemics.
 
@@ -1271,18 +1465,8 @@ def filter_no_negated(stmts_in, **kwargs):
         A list of filtered statements.
     """
     logger.info('Filtering %d statements to not negated...' % len(stmts_in))
-    stmts_out = []
-    for st in stmts_in:
-        all_negated = True
-        ev = None
-        for ev in st.evidence:
-            if not ev.epistemics.get('negated', False):
-                all_negated = False
-                break
-        if ev is None:
-            all_negated = False
-        if not all_negated:
-            stmts_out.append(st)
+    keep = _get_no_negated_filter()
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -1290,7 +1474,23 @@ def filter_no_negated(stmts_in, **kwargs):
     return stmts_out
 
 
+def _get_evidence_source_filter(source_apis, policy='one', **kwargs):
+    source_apis = set(source_apis)
+    if policy == 'one':
+        return lambda st: bool(_get_sources(st) & source_apis)
+    elif policy == 'all':
+        return lambda st: (_get_sources(st) & source_apis) == source_apis
+    elif policy == 'none':
+        return lambda st: not (_get_sources(st) & source_apis)
+    return lambda st: False
+
+
+def _get_sources(stmt):
+    return {ev.source_api for ev in stmt.evidence}
+
+
 @register_pipeline
+@streamable(_get_evidence_source_filter)
 def filter_evidence_source(stmts_in, source_apis, policy='one', **kwargs):
     """Filter to statements that have evidence from a given set of sources.
 
@@ -1316,18 +1516,8 @@ def filter_evidence_source(stmts_in, source_apis, policy='one', **kwargs):
     """
     logger.info('Filtering %d statements to evidence source "%s" of: %s...' %
                 (len(stmts_in), policy, ', '.join(source_apis)))
-    stmts_out = []
-    for st in stmts_in:
-        sources = set([ev.source_api for ev in st.evidence])
-        if policy == 'one':
-            if sources.intersection(source_apis):
-                stmts_out.append(st)
-        if policy == 'all':
-            if sources.intersection(source_apis) == set(source_apis):
-                stmts_out.append(st)
-        if policy == 'none':
-            if not sources.intersection(source_apis):
-                stmts_out.append(st)
+    keep = _get_evidence_source_filter(source_apis, policy)
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -1335,7 +1525,12 @@ def filter_evidence_source(stmts_in, source_apis, policy='one', **kwargs):
     return stmts_out
 
 
+def _get_top_level_filter(**kwargs):
+    return lambda st: not st.supports
+
+
 @register_pipeline
+@streamable(_get_top_level_filter)
 def filter_top_level(stmts_in, **kwargs):
     """Filter to statements that are at the top-level of the hierarchy.
 
@@ -1516,7 +1711,34 @@ def get_unreachable_mods(stmts_in):
     return unreachable_mods
 
 
+def _get_mutation_status_filter(mutations, deletions, **kwargs):
+    remove_bound = bool(kwargs.get('remove_bound'))
+
+    def criterion(agent):
+        if agent is not None and agent.name in deletions:
+            return False
+        if agent is not None and agent.mutations:
+            muts = mutations.get(agent.name, [])
+            for mut in agent.mutations:
+                mut_tup = (mut.residue_from, mut.position, mut.residue_to)
+                if mut_tup not in muts:
+                    return False
+        return True
+
+    def keep(stmt):
+        for agent in stmt.agent_list():
+            if not criterion(agent):
+                return False
+            if remove_bound:
+                _remove_bound_conditions(agent, criterion)
+            elif _any_bound_condition_fails_criterion(agent, criterion):
+                return False
+        return True
+    return keep
+
+
 @register_pipeline
+@streamable(_get_mutation_status_filter)
 def filter_mutation_status(stmts_in, mutations, deletions, **kwargs):
     """Filter statements based on existing mutations/deletions
 
@@ -1544,38 +1766,10 @@ def filter_mutation_status(stmts_in, mutations, deletions, **kwargs):
         A list of filtered statements.
     """
 
-    if 'remove_bound' in kwargs and kwargs['remove_bound']:
-        remove_bound = True
-    else:
-        remove_bound = False
-
-    def criterion(agent):
-        if agent is not None and agent.name in deletions:
-            return False
-        if agent is not None and agent.mutations:
-            muts = mutations.get(agent.name, [])
-            for mut in agent.mutations:
-                mut_tup = (mut.residue_from, mut.position, mut.residue_to)
-                if mut_tup not in muts:
-                    return False
-        return True
-
     logger.info('Filtering %d statements for mutation status...' %
                 len(stmts_in))
-    stmts_out = []
-    for stmt in stmts_in:
-        skip = False
-        for agent in stmt.agent_list():
-            if not criterion(agent):
-                skip = True
-                break
-            if remove_bound:
-                _remove_bound_conditions(agent, criterion)
-            elif _any_bound_condition_fails_criterion(agent, criterion):
-                skip = True
-                break
-        if not skip:
-            stmts_out.append(stmt)
+    keep = _get_mutation_status_filter(mutations, deletions, **kwargs)
+    stmts_out = [stmt for stmt in stmts_in if keep(stmt)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -1695,7 +1889,16 @@ def filter_transcription_factor(stmts_in, **kwargs):
     return stmts_out
 
 
+def _get_uuid_filter(uuids, invert=True, **kwargs):
+    # We use a set for fast membership checks
+    uuids = set(uuids)
+    if not invert:
+        return lambda st: st.uuid in uuids
+    return lambda st: st.uuid not in uuids
+
+
 @register_pipeline
+@streamable(_get_uuid_filter)
 def filter_uuid_list(stmts_in, uuids, invert=True, **kwargs):
     """Filter to Statements corresponding to given UUIDs
 
@@ -1718,15 +1921,8 @@ def filter_uuid_list(stmts_in, uuids, invert=True, **kwargs):
     """
     logger.info('Filtering %d statements for %d UUID%s...' %
                 (len(stmts_in), len(uuids), 's' if len(uuids) > 1 else ''))
-    stmts_out = []
-    for st in stmts_in:
-        if not invert:
-            if st.uuid in uuids:
-                stmts_out.append(st)
-        else:
-            if st.uuid not in uuids:
-                stmts_out.append(st)
-
+    keep = _get_uuid_filter(uuids, invert)
+    stmts_out = [st for st in stmts_in if keep(st)]
     logger.info('%d statements after filter...' % len(stmts_out))
     dump_pkl = kwargs.get('save')
     if dump_pkl:
@@ -1881,7 +2077,7 @@ def reduce_activities(stmts_in, **kwargs):
         A list of reduced activity statements.
     """
     logger.info('Reducing activities on %d statements...' % len(stmts_in))
-    stmts_out = [deepcopy(st) for st in stmts_in]
+    stmts_out = copy_stmts(stmts_in, share_evidence=True)
     ml = MechLinker(stmts_out)
     ml.gather_explicit_activities()
     ml.reduce_activities()
@@ -1892,7 +2088,23 @@ def reduce_activities(stmts_in, **kwargs):
     return stmts_out
 
 
+def _get_agent_context_stripper(**kwargs):
+    def strip(st):
+        new_st = st.copy(share_evidence=True)
+        for agent in new_st.agent_list():
+            if agent is None:
+                continue
+            agent.mods = []
+            agent.mutations = []
+            agent.activity = None
+            agent.location = None
+            agent.bound_conditions = []
+        return new_st
+    return strip
+
+
 @register_pipeline
+@streamable(_get_agent_context_stripper, kind='map')
 def strip_agent_context(stmts_in, **kwargs):
     """Strip any context on agents within each statement.
 
@@ -1909,25 +2121,36 @@ def strip_agent_context(stmts_in, **kwargs):
         A list of stripped statements.
     """
     logger.info('Stripping agent context on %d statements...' % len(stmts_in))
-    stmts_out = []
-    for st in stmts_in:
-        new_st = deepcopy(st)
-        for agent in new_st.agent_list():
-            if agent is None:
-                continue
-            agent.mods = []
-            agent.mutations = []
-            agent.activity = None
-            agent.location = None
-            agent.bound_conditions = []
-        stmts_out.append(new_st)
+    strip = _get_agent_context_stripper()
+    stmts_out = [strip(st) for st in stmts_in]
     dump_pkl = kwargs.get('save')
     if dump_pkl:
         dump_statements(stmts_out, dump_pkl)
     return stmts_out
 
 
+def _standardize_concept_names(stmt):
+    for concept in stmt.agent_list():
+        db_ns, db_id = concept.get_grounding()
+        if db_id is not None:
+            if isinstance(db_id, list):
+                db_id = db_id[0][0].split('/')[-1]
+            else:
+                db_id = db_id.split('/')[-1]
+            db_id = db_id.replace('|', ' ')
+            db_id = db_id.replace('_', ' ')
+            db_id = db_id.replace('ONT::', '')
+            db_id = db_id.capitalize()
+            concept.name = db_id
+    return stmt
+
+
+def _get_name_standardizer(**kwargs):
+    return _standardize_concept_names
+
+
 @register_pipeline
+@streamable(_get_name_standardizer, kind='map')
 def standardize_names_groundings(stmts):
     """Standardize the names of Concepts with respect to an ontology.
 
@@ -1942,18 +2165,7 @@ def standardize_names_groundings(stmts):
     """
     print('Standardize names to groundings')
     for stmt in stmts:
-        for concept in stmt.agent_list():
-            db_ns, db_id = concept.get_grounding()
-            if db_id is not None:
-                if isinstance(db_id, list):
-                    db_id = db_id[0][0].split('/')[-1]
-                else:
-                    db_id = db_id.split('/')[-1]
-                db_id = db_id.replace('|', ' ')
-                db_id = db_id.replace('_', ' ')
-                db_id = db_id.replace('ONT::', '')
-                db_id = db_id.capitalize()
-                concept.name = db_id
+        _standardize_concept_names(stmt)
     return stmts
 
 
@@ -1972,7 +2184,18 @@ def dump_stmt_strings(stmts, fname):
             fh.write(('%s\n' % st).encode('utf-8'))
 
 
+def _get_db_ref_renamer(ns_from, ns_to, **kwargs):
+    def rename(stmt):
+        stmt = stmt.copy(share_evidence=True)
+        for agent in stmt.agent_list():
+            if agent is not None and ns_from in agent.db_refs:
+                agent.db_refs[ns_to] = agent.db_refs.pop(ns_from)
+        return stmt
+    return rename
+
+
 @register_pipeline
+@streamable(_get_db_ref_renamer, kind='map')
 def rename_db_ref(stmts_in, ns_from, ns_to, **kwargs):
     """Rename an entry in the db_refs of each Agent.
 
@@ -1998,7 +2221,7 @@ def rename_db_ref(stmts_in, ns_from, ns_to, **kwargs):
     """
     logger.info('Remapping "%s" to "%s" in db_refs on %d statements...' %
                 (ns_from, ns_to, len(stmts_in)))
-    stmts_out = [deepcopy(st) for st in stmts_in]
+    stmts_out = copy_stmts(stmts_in, share_evidence=True)
     for stmt in stmts_out:
         for agent in stmt.agent_list():
             if agent is not None and ns_from in agent.db_refs:
@@ -2056,7 +2279,13 @@ def align_statements(stmts1, stmts2, keyfun=None):
     return matches
 
 
+def _get_complex_size_filter(members_allowed=5, **kwargs):
+    return lambda stmt: not (isinstance(stmt, Complex) and
+                             len(stmt.members) > members_allowed)
+
+
 @register_pipeline
+@streamable(_get_complex_size_filter)
 def filter_complexes_by_size(stmts_in, members_allowed=5):
     """Filter out Complexes if the number of members exceeds specified allowed
     number.
@@ -2073,13 +2302,9 @@ def filter_complexes_by_size(stmts_in, members_allowed=5):
     stmts_out : list[indra.statements.Statement]
         A list of filtered Statements.
     """
-    stmts_out = []
     logger.info('Filtering out Complexes with more than %d members from %d '
                 'statements...' % (members_allowed, len(stmts_in)))
-    for stmt in stmts_in:
-        if isinstance(stmt, Complex) and len(stmt.members) > members_allowed:
-            continue
-        else:
-            stmts_out.append(stmt)
+    keep = _get_complex_size_filter(members_allowed)
+    stmts_out = [stmt for stmt in stmts_in if keep(stmt)]
     logger.info('%d statements after filter...' % len(stmts_out))
     return stmts_out
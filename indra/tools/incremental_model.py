@@ -2,8 +2,10 @@ import pickle
 import logging
 from indra.statements import Agent
 import indra.tools.assemble_corpus as ac
+from indra.belief import BeliefEngine
 from indra.databases import hgnc_client
 from indra.ontology.bio import bio_ontology
+from indra.preassembler import Preassembler
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,10 @@ class IncrementalModel(object):
         state of the IncrementalModel.
     assembled_stmts : list[indra.statements.Statement]
         A list of INDRA Statements after assembly.
+    preassembler : indra.preassembler.Preassembler or None
+        The Preassembler used for incremental assembly, which keeps the
+        state of the statements assembled so far. It is None until
+        :py:meth:`preassemble` is called with incremental=True.
     """
     def __init__(self, model_fname=None):
         if model_fname is None:
@@ -39,6 +45,9 @@ class IncrementalModel(object):
                 self.stmts = {}
         self.prior_genes = []
         self.assembled_stmts = []
+        self.preassembler = None
+        # Statements that were added since the last incremental assembly
+        self._new_stmts = self.get_statements()
 
     def save(self, model_fname='model.pkl'):
         """Save the state of the IncrementalModel in a pickle file.
@@ -66,6 +75,7 @@ class IncrementalModel(object):
             self.stmts[pmid] = stmts
         else:
             self.stmts[pmid] += stmts
+        self._new_stmts += stmts
 
     def _relevance_filter(self, stmts, filters=None):
         if filters is None:
@@ -79,7 +89,8 @@ class IncrementalModel(object):
         logger.info('%d statements after relevance filter' % len(stmts))
         return stmts
 
-    def preassemble(self, filters=None, grounding_map=None):
+    def preassemble(self, filters=None, grounding_map=None,
+                    incremental=False):
         """Preassemble the Statements collected in the model.
 
         Use INDRA's GroundingMapper, Preassembler and BeliefEngine
@@ -101,9 +112,40 @@ class IncrementalModel(object):
             A user supplied grounding map which maps a string to a
             dictionary of database IDs (in the format used by Agents'
             db_refs).
+        incremental : Optional[bool]
+            If True, only the Statements added since the last incremental
+            preassembly are processed and assembled into the existing
+            set of assembled Statements, and beliefs are only updated for
+            the Statements affected by the new ones. The first incremental
+            preassembly processes all Statements. Default: False
         """
-        stmts = self.get_statements()
+        if incremental and self.preassembler is not None:
+            stmts = self._prepare_stmts(self._new_stmts, filters,
+                                        grounding_map)
+            stmts = self.preassembler.add_and_assemble(
+                stmts, return_toplevel=False, belief_engine=BeliefEngine())
+        else:
+            stmts = self._prepare_stmts(self.get_statements(), filters,
+                                        grounding_map)
+            # Run preassembly
+            if incremental:
+                be = BeliefEngine()
+                self.preassembler = Preassembler(bio_ontology, stmts)
+                ac.run_preassembly_duplicate(self.preassembler, be)
+                stmts = ac.run_preassembly_related(self.preassembler, be,
+                                                   return_toplevel=False)
+            else:
+                stmts = ac.run_preassembly(stmts, return_toplevel=False)
+        if incremental:
+            self._new_stmts = []
+
+        # Run relevance filter
+        stmts = self._relevance_filter(stmts, filters)
 
+        # Save Statements
+        self.assembled_stmts = stmts
+
+    def _prepare_stmts(self, stmts, filters=None, grounding_map=None):
         # Filter out hypotheses
         stmts = ac.filter_no_hypothesis(stmts)
 
@@ -121,15 +163,7 @@ class IncrementalModel(object):
 
         if filters and 'human_only' in filters:
             stmts = ac.filter_human_only(stmts)
-
-        # Run preassembly
-        stmts = ac.run_preassembly(stmts, return_toplevel=False)
-
-        # Run relevance filter
-        stmts = self._relevance_filter(stmts, filters)
-
-        # Save Statements
-        self.assembled_stmts = stmts
+        return stmts
 
     def load_prior(self, prior_fname):
         """Load a set of prior statements from a pickle file.
@@ -143,6 +177,7 @@ class IncrementalModel(object):
             The name of the pickle file containing the prior Statements.
         """
         self.stmts['prior'] = ac.load_statements(prior_fname)
+        self._new_stmts += self.stmts['prior']
 
     def get_model_agents(self):
         """Return a list of all Agents from all Statements.
@@ -0,0 +1,348 @@
+"""An inverted index of the types and Agents of a corpus of Statements.
+
+The index is built once over a list of Statements and can then be used by
+the filter functions in :py:mod:`indra.tools.assemble_corpus` (via their
+`index` argument) to find matching Statements without scanning the Agents
+of every Statement again. Agents with the same name and db_refs are
+represented by a single integer ID, and the occurrences of each Agent in
+Statements are stored in integer arrays. Criteria on Agents are therefore
+evaluated once for each distinct Agent, and the results are aggregated for
+all Statements at once in numpy.
+
+Note that the index reflects the Statements at the time it was built, it
+needs to be rebuilt if their Agents are changed.
+
+An index given to a filter function has to be built over a list of
+Statements that contains all the Statements being filtered, otherwise the
+filter logs a warning and scans the Agents of the Statements as usual.
+Filters also scan the Agents when given options that the index can't
+answer, e.g., when bound conditions are removed from the Statements.
+
+Since the index refers to the Statement objects it was built over, it can't
+be described in the JSON definition of an assembly pipeline. It can be
+passed to the filter functions directly, or to all the steps of a pipeline
+as a kwarg of :py:meth:`indra.pipeline.AssemblyPipeline.run`, e.g.,
+`pipeline.run(stmts, index=StatementIndex(stmts))`. The index is only used
+by steps that receive a list of Statements. It isn't used by the steps that
+are fused in streaming mode or run in parallel, which process each
+Statement on its own.
+"""
+__all__ = ['StatementIndex']
+
+import logging
+from array import array
+from collections import defaultdict
+import numpy
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatementIndex(object):
+    """An index of a list of Statements by their types and Agents.
+
+    Agents are indexed both as direct participants of Statements (as
+    returned by `agent_list`) and as Agents in the bound conditions of
+    these participants. Criteria evaluated using the index should only
+    depend on the name and db_refs of Agents.
+
+    Parameters
+    ----------
+    stmts : list[indra.statements.Statement]
+        A list of Statements to index.
+    ontology : Optional[indra.ontology.IndraOntology]
+        An ontology used to expand groundings to their parents when
+        querying by grounding, e.g., to find Statements about the FamPlex
+        families that a gene is a member of.
+
+    Attributes
+    ----------
+    stmts : list[indra.statements.Statement]
+        The indexed Statements.
+    """
+    def __init__(self, stmts, ontology=None):
+        self.stmts = stmts
+        self.ontology = ontology
+        self._positions = {id(stmt): pos for pos, stmt in enumerate(stmts)}
+        # Distinct Agents and statement types by their integer IDs
+        self._agents = []
+        self._types = []
+        agent_ids = {}
+        type_ids = {}
+        stmt_type_ids = array('q')
+        occurrences = {'main': (array('q'), array('q')),
+                       'bound': (array('q'), array('q'))}
+        for pos, stmt in enumerate(stmts):
+            stmt_type = type(stmt)
+            type_id = type_ids.get(stmt_type)
+            if type_id is None:
+                type_id = len(self._types)
+                type_ids[stmt_type] = type_id
+                self._types.append(stmt_type)
+            stmt_type_ids.append(type_id)
+            for agent in stmt.agent_list():
+                if agent is None:
+                    continue
+                self._add_occurrence(occurrences['main'], pos, agent,
+                                     agent_ids)
+                # Concepts don't have bound conditions
+                for bc in getattr(agent, 'bound_conditions', []):
+                    if bc.agent is not None:
+                        self._add_occurrence(occurrences['bound'], pos,
+                                             bc.agent, agent_ids)
+        self._stmt_type_ids = numpy.frombuffer(stmt_type_ids,
+                                               dtype=numpy.int64)
+        # For each kind of occurrence, we store the statement positions
+        # and Agent IDs of the occurrences, the number of occurrences
+        # in each statement, and the statement positions of each Agent ID
+        # in CSR format
+        self._occurrences = {}
+        for kind, (positions, ids) in occurrences.items():
+            positions = numpy.frombuffer(positions, dtype=numpy.int64)
+            ids = numpy.frombuffer(ids, dtype=numpy.int64)
+            order = numpy.argsort(ids, kind='stable')
+            indptr = numpy.zeros(len(self._agents) + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.bincount(ids, minlength=len(self._agents)),
+                         out=indptr[1:])
+            self._occurrences[kind] = {
+                'positions': positions,
+                'ids': ids,
+                'totals': numpy.bincount(positions, minlength=len(stmts)),
+                'indptr': indptr,
+                'postings': positions[order],
+            }
+        # Inverted maps from names and groundings to Agent IDs
+        self._agent_ids_by_name = defaultdict(list)
+        self._agent_ids_by_grounding = defaultdict(list)
+        for agent_id, agent in enumerate(self._agents):
+            self._agent_ids_by_name[agent.name].append(agent_id)
+            for ns, entry in agent.db_refs.items():
+                entry = _get_grounding_entry(entry)
+                if entry is not None:
+                    self._agent_ids_by_grounding[(ns, entry)].append(
+                        agent_id)
+        logger.info('Indexed %d statements with %d distinct agents' %
+                    (len(stmts), len(self._agents)))
+
+    def __len__(self):
+        return len(self.stmts)
+
+    def _add_occurrence(self, occurrences, pos, agent, agent_ids):
+        key = (agent.name, _freeze(agent.db_refs))
+        agent_id = agent_ids.get(key)
+        if agent_id is None:
+            agent_id = len(self._agents)
+            agent_ids[key] = agent_id
+            self._agents.append(agent)
+        occurrences[0].append(pos)
+        occurrences[1].append(agent_id)
+
+    def get_positions(self, stmts):
+        """Return the positions of Statements in the index.
+
+        Parameters
+        ----------
+        stmts : list[indra.statements.Statement]
+            A list of Statements, typically a subset of the indexed ones.
+
+        Returns
+        -------
+        numpy.ndarray or None
+            The positions of the Statements in the index, or None if any of
+            the Statements is not in the index.
+        """
+        try:
+            return numpy.array([self._positions[id(stmt)] for stmt in stmts],
+                               dtype=numpy.int64)
+        except KeyError:
+            return None
+
+    def get_type_mask(self, stmt_type):
+        """Return a boolean array of Statements of a given type.
+
+        Parameters
+        ----------
+        stmt_type : type
+            A Statement class, Statements of its subclasses also match.
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array indicating for each indexed Statement whether it
+            is of the given type.
+        """
+        type_mask = numpy.array([issubclass(t, stmt_type)
+                                 for t in self._types], dtype=bool)
+        if not len(type_mask):
+            return numpy.zeros(len(self), dtype=bool)
+        return type_mask[self._stmt_type_ids]
+
+    def count_agents(self, criterion, bound=False):
+        """Return the number of Agents meeting a criterion in each Statement.
+
+        Parameters
+        ----------
+        criterion : function
+            A function which takes an Agent and returns True if it meets the
+            criterion. It is called once for each distinct Agent.
+        bound : Optional[bool]
+            If True, Agents in bound conditions are counted, otherwise,
+            the Agents directly participating in Statements are counted.
+            Default: False
+
+        Returns
+        -------
+        matching : numpy.ndarray
+            The number of Agents meeting the criterion in each Statement.
+        total : numpy.ndarray
+            The total number of Agents in each Statement.
+        """
+        agent_mask = numpy.fromiter((bool(criterion(agent))
+                                     for agent in self._agents),
+                                    dtype=bool, count=len(self._agents))
+        occ = self._occurrences['bound' if bound else 'main']
+        matching = numpy.bincount(occ['positions'][agent_mask[occ['ids']]],
+                                  minlength=len(self))
+        return matching, occ['totals']
+
+    def count_agents_by_name(self, names, bound=False):
+        """Return the number of Agents with given names in each Statement.
+
+        Parameters
+        ----------
+        names : iterable[str]
+            The Agent names to count.
+        bound : Optional[bool]
+            If True, Agents in bound conditions are counted, otherwise,
+            the Agents directly participating in Statements are counted.
+            Default: False
+
+        Returns
+        -------
+        matching : numpy.ndarray
+            The number of Agents with one of the names in each Statement.
+        total : numpy.ndarray
+            The total number of Agents in each Statement.
+        """
+        agent_ids = {agent_id for name in set(names)
+                     for agent_id in self._agent_ids_by_name.get(name, [])}
+        return self._count_agent_ids(agent_ids, bound)
+
+    def count_agents_by_grounding(self, groundings, include_parents=False,
+                                  bound=False):
+        """Return the number of Agents with given groundings in each Statement.
+
+        Parameters
+        ----------
+        groundings : iterable[tuple]
+            The (namespace, ID) groundings to count.
+        include_parents : Optional[bool]
+            If True, Agents grounded to any of the ontology parents of the
+            groundings are also counted. Requires the index to have an
+            ontology. Default: False
+        bound : Optional[bool]
+            If True, Agents in bound conditions are counted, otherwise,
+            the Agents directly participating in Statements are counted.
+            Default: False
+
+        Returns
+        -------
+        matching : numpy.ndarray
+            The number of Agents with one of the groundings in each
+            Statement.
+        total : numpy.ndarray
+            The total number of Agents in each Statement.
+        """
+        groundings = set(groundings)
+        if include_parents:
+            if self.ontology is None:
+                raise ValueError('Parent groundings can only be included '
+                                 'if the index has an ontology.')
+            groundings |= {parent for db_ns, db_id in groundings
+                           for parent in self.ontology.get_parents(db_ns,
+                                                                   db_id)}
+        agent_ids = {agent_id for grounding in groundings
+                     for agent_id in
+                     self._agent_ids_by_grounding.get(grounding, [])}
+        return self._count_agent_ids(agent_ids, bound)
+
+    def _count_agent_ids(self, agent_ids, bound):
+        occ = self._occurrences['bound' if bound else 'main']
+        postings = [occ['postings'][occ['indptr'][agent_id]:
+                                    occ['indptr'][agent_id + 1]]
+                    for agent_id in agent_ids]
+        if postings:
+            postings = numpy.concatenate(postings)
+        else:
+            postings = numpy.array([], dtype=numpy.int64)
+        return numpy.bincount(postings, minlength=len(self)), occ['totals']
+
+    def get_positions_by_name(self, name):
+        """Return the sorted positions of Statements with an Agent name.
+
+        Parameters
+        ----------
+        name : str
+            The name of an Agent directly participating in Statements.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted positions of the Statements.
+        """
+        return numpy.flatnonzero(self.count_agents_by_name([name])[0])
+
+    def get_positions_by_grounding(self, db_ns, db_id, include_parents=False):
+        """Return the sorted positions of Statements with an Agent grounding.
+
+        Parameters
+        ----------
+        db_ns : str
+            The namespace of the grounding.
+        db_id : str
+            The ID of the grounding.
+        include_parents : Optional[bool]
+            If True, Statements with Agents grounded to any of the ontology
+            parents of the grounding are also returned. Requires the index
+            to have an ontology. Default: False
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted positions of the Statements.
+        """
+        return numpy.flatnonzero(self.count_agents_by_grounding(
+            [(db_ns, db_id)], include_parents=include_parents)[0])
+
+    def get_positions_by_type(self, stmt_type):
+        """Return the sorted positions of Statements of a given type.
+
+        Parameters
+        ----------
+        stmt_type : type
+            A Statement class, Statements of its subclasses also match.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sorted positions of the Statements.
+        """
+        return numpy.flatnonzero(self.get_type_mask(stmt_type))
+
+
+def _freeze(value):
+    """Return a hashable version of a db_refs dict or one of its values."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _get_grounding_entry(entry):
+    """Return the ID in a db_refs entry, the top one for scored entries."""
+    if isinstance(entry, list):
+        if not entry or not isinstance(entry[0], (list, tuple)):
+            return None
+        entry = entry[0][0]
+    return entry if isinstance(entry, str) else None
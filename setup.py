@@ -34,6 +34,7 @@ def main():
                       # AWS interface and database
                       'aws': ['boto3', 'reportlab'],
                       # Utilities
+                      'fast_json': ['orjson'],
                       'graph': ['pygraphviz'],
                       'plot': ['matplotlib'],
                       'isi': ['nltk', 'unidecode'],
@@ -67,6 +68,7 @@ def main():
                     'indra.literature', 'indra.mechlinker',
                     'indra.ontology', 'indra.ontology.bio',
                     'indra.ontology.world', 'indra.ontology.virtual',
+                    'indra.ontology.compact',
                     'indra.ontology.app', 'indra.pipeline',
                     'indra.preassembler',
                     'indra.preassembler.grounding_mapper', 'indra.sources',